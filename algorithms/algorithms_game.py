@@ -3,6 +3,8 @@ import time
 import threading
 import queue
 import copy
+import signal
+import sys
 from multiprocessing import Process, Queue as multiQueue
 
 # Importy modułów
@@ -11,12 +13,18 @@ from engine.engine import *
 from engine.figures import *
 from interface.graphics import *
 from algorithms.minimax import *
+from algorithms.parallel_search import parallel_best_move
+from algorithms.time_manager import TimeManager
+from algorithms.pondering import PonderingSearch
 from algorithms.monte_carlo_tree_search import *
+from algorithms.parallel_mcts import parallel_mcts_move
 from algorithms.evaluation import get_evaluation
+import engine.moves as moves
 from interface.nerd_view import *
 
 
-def calculate_minimax(board, depth, color, time_limit, min_time, result_queue):
+def calculate_minimax(board, depth, color, time_limit, min_time, result_queue, tt_size_mb=16, pruning=None, workers=1,
+                      remaining_time=None, move_number=1):
     """
     Funkcja obliczająca najlepszy ruch za pomocą algorytmu Minimax.
 
@@ -25,17 +33,35 @@ def calculate_minimax(board, depth, color, time_limit, min_time, result_queue):
         depth (int): Głębokość przeszukiwania.
         color (str): Kolor gracza ('w' lub 'b').
         time_limit (float): Maksymalny czas na obliczenia.
-        min_time (float): Minimalny czas oczekiwania przed zwróceniem wyniku.
+        min_time (float): Minimalny czas oczekiwania przed zwróceniem wyniku (najwyżej miękki limit
+            przydziału czasu, żeby oczekiwanie nie zużywało zegara).
         result_queue (Queue): Kolejka do przechowywania wyniku.
+        tt_size_mb (float): Rozmiar tablicy transpozycji w megabajtach.
+        pruning (dict): Włączone techniki przycinania (null_move, late_move_reductions, futility).
+        workers (int): Liczba procesów wyszukiwania; przy więcej niż jednym ruchy w korzeniu
+            są dzielone między procesy (algorithms.parallel_search).
+        remaining_time (float): Czas pozostały na zegarze komputera (s); jeśli podany, czas na ruch
+            przydziela TimeManager, a time_limit jest jego górną granicą.
+        move_number (int): Numer ruchu w partii, dla przydziału czasu.
 
     Returns:
         None: Wynik jest umieszczany w kolejce `result_queue`.
     """
     minimax_start_time = time.time()
     board_copy = copy.deepcopy(board)
-    minimax_obj = Minimax(board_copy, depth, color, time_limit)
-    best_move, additional_info, moves_from_list = minimax_obj.get_best_move()
-    all_info = (best_move, additional_info, moves_from_list)
+    time_manager = None
+    if remaining_time is not None:
+        time_manager = TimeManager(remaining_time, move_number, max_time=time_limit)
+        min_time = min(min_time, time_manager.soft_limit)
+    if workers > 1:
+        # Gra kończy obliczenia przez terminate(); SystemExit pozwala zatrzymać procesy robocze
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        best_move, additional_info, moves_from_list, stats = parallel_best_move(
+            board_copy, depth, color, time_limit, workers, tt_size_mb, pruning, time_manager=time_manager)
+    else:
+        minimax_obj = Minimax(board_copy, depth, color, time_limit, tt_size_mb, pruning=pruning, time_manager=time_manager)
+        best_move, additional_info, moves_from_list, stats = minimax_obj.get_best_move()
+    all_info = (best_move, additional_info, moves_from_list, stats)
 
     # Upewnij się, że obliczenia trwają co najmniej `min_time`
     elapsed_time = time.time() - minimax_start_time
@@ -50,21 +76,31 @@ class MonteCarloThread(threading.Thread):
     Wątek do wykonywania obliczeń za pomocą algorytmu Monte Carlo Tree Search (MCTS).
     """
 
-    def __init__(self, board, max_depth, turn, result_queue):
+    def __init__(self, board, max_depth, turn, result_queue, mcts, time_limit, workers=1, tree_parallel=False):
         """
         Inicjalizuje wątek Monte Carlo.
 
         Args:
             board (Board): Obiekt planszy szachowej.
-            max_depth (int): Maksymalna głębokość przeszukiwania.
+            max_depth (int): Maksymalna liczba ruchów symulacji.
             turn (str): Tura gracza ('w' lub 'b').
             result_queue (Queue): Kolejka do przechowywania wyniku.
+            mcts (Mcts): Drzewo gry komputera, zachowywane między ruchami.
+            time_limit (float): Czas na wyszukiwanie w sekundach.
+            workers (int): Liczba procesów; przy więcej niż jednym wyszukiwanie jest równoległe
+                (algorithms.parallel_mcts), a drzewo `mcts` nie jest używane.
+            tree_parallel (bool): Wspólne drzewo procesów zamiast osobnych drzew.
         """
         super().__init__()
         self.board = copy.deepcopy(board)
         self.max_depth = max_depth
         self.turn = turn
         self.result_queue = result_queue
+        self.mcts = mcts
+        self.time_limit = time_limit
+        self.workers = workers
+        self.tree_parallel = tree_parallel
+        self.message = ""
         self._stop_event = threading.Event()
 
     def stop(self):
@@ -80,9 +116,13 @@ class MonteCarloThread(threading.Thread):
         Wykonuje algorytm Monte Carlo Tree Search i umieszcza wynik w kolejce `result_queue`.
         """
         try:
-            mc_obj = Mcts(self.turn)
             if not self.stopped():
-                move = mc_obj.pick_best_move(self.board, MAX_TIME, self.max_depth)
+                if self.workers > 1:
+                    move, self.message = parallel_mcts_move(self.board, self.turn, self.time_limit, self.max_depth,
+                                                            self.workers, self.tree_parallel, self._stop_event)
+                else:
+                    move = self.mcts.pick_best_move(self.board, self.time_limit, self.max_depth, self._stop_event)
+                    self.message = self.mcts.message
                 if not self.stopped():
                     self.result_queue.put(move)
         except Exception as e:
@@ -170,6 +210,8 @@ def main(player_turn, algorithm, game_time):
     clock = pygame.time.Clock()
     minimax_process = None
     monte_carlo_thread = None
+    # Drzewo MCTS komputera, zachowywane między ruchami
+    mcts = Mcts('b' if player_turn == 'w' else 'w')
     is_reversed = player_turn != 'w'
     running = True
 
@@ -189,16 +231,20 @@ def main(player_turn, algorithm, game_time):
     global MIN_TIME
     min_depth = 1 if algorithm == "minimax" else 5
     max_depth = 4 if algorithm == "minimax" else 30
-    ai_settings = choose_ai_settings_dialog(screen, SQUARE_SIZE, min_depth, max_depth)
+    ai_settings = choose_ai_settings_dialog(screen, SQUARE_SIZE, min_depth, max_depth, algorithm == "minimax")
     if ai_settings == None:
         return
-    depth, MIN_TIME, MAX_TIME = ai_settings
+    depth, MIN_TIME, MAX_TIME, tt_size_mb, pruning, workers = ai_settings
 
     # Dodaj zmienne do obsługi wątku
     minimax_process = None
     result_queue = queue.Queue()
     minimax_queue = multiQueue()
     calculating = False
+    # Myślenie w czasie przeciwnika wymaga jednego stałego procesu wyszukiwania
+    ponder_search = None
+    if algorithm == "minimax" and workers == 1 and config.get("ponder", False):
+        ponder_search = PonderingSearch(depth, MAX_TIME, MIN_TIME, tt_size_mb, pruning)
 
 
     nerd_view = config["nerd_view"]
@@ -212,10 +258,10 @@ def main(player_turn, algorithm, game_time):
         moves_number = sum(len(value) for value in main_board.get_all_moves(turn))
 
         algo_root = tk.Toplevel()
-        moves = []
+        opening_moves = []
         info_window = AlgorithmInfoWindow(
             algo_root,
-            moves_list = moves,
+            moves_list = opening_moves,
             algorithm_name = algorithm,
             search_depth=depth,
             additional_info="...",
@@ -238,6 +284,8 @@ def main(player_turn, algorithm, game_time):
                 except: pass
                 try: minimax_process.terminate()  # Natychmiastowe zabicie procesu
                 except: pass
+                if ponder_search:
+                    ponder_search.close()
                 # W obsłudze wyjścia
                 if monte_carlo_thread and monte_carlo_thread.is_alive():
                     monte_carlo_thread.stop()
@@ -259,6 +307,8 @@ def main(player_turn, algorithm, game_time):
                         running = False
                         try: minimax_process.terminate()
                         except: pass
+                        if ponder_search:
+                            ponder_search.close()
                         try: root.destroy()
                         except: pass
                         if monte_carlo_thread and monte_carlo_thread.is_alive():
@@ -270,6 +320,8 @@ def main(player_turn, algorithm, game_time):
                         calculating = False
                         try: minimax_process.terminate()  # Natychmiastowe zabicie procesu
                         except: pass
+                        if ponder_search:
+                            ponder_search.cancel()
                         if monte_carlo_thread and monte_carlo_thread.is_alive():
                             monte_carlo_thread.stop()
                             monte_carlo_thread.join(timeout=0.1)
@@ -346,20 +398,33 @@ def main(player_turn, algorithm, game_time):
             if algorithm == "minimax":
                 if not calculating:
                     calculating = True
-                    minimax_process = Process(
-                        target=calculate_minimax,
-                        args=(main_board,depth,turn,MAX_TIME,MIN_TIME,minimax_queue),
-                        daemon=True
-                    )
-                    minimax_process.start()
-                if calculating and not minimax_queue.empty():
-                    all_info = minimax_queue.get(timeout=0.01)
-                    move, additional_info, moves_from_list = all_info
+                    remaining_time = (white_time if turn == 'w' else black_time) - (time.time() - start_time)
+                    move_number = len(main_board.moves_algebraic) // 2 + 1
+                    if ponder_search:
+                        ponder_search.search(main_board, turn, remaining_time, move_number)
+                    else:
+                        minimax_process = Process(
+                            target=calculate_minimax,
+                            args=(main_board,depth,turn,MAX_TIME,MIN_TIME,minimax_queue,tt_size_mb,pruning,workers,
+                                  remaining_time,move_number),
+                            # Proces demona nie może uruchamiać własnych procesów roboczych
+                            daemon=workers == 1
+                        )
+                        minimax_process.start()
+                all_info = None
+                if calculating:
+                    if ponder_search:
+                        all_info = ponder_search.poll()
+                    elif not minimax_queue.empty():
+                        all_info = minimax_queue.get(timeout=0.01)
+                if all_info:
+                    move, additional_info, moves_from_list, stats = all_info
                     if nerd_view:
                         info_window.update_moves(moves_from_list)
                         info_window.update_additional_info(additional_info)
                         info_window.update_best_move(move)
-                    y1, x1, y2, x2 = move
+                        info_window.update_stats(stats)
+                    y1, x1, y2, x2 = moves.to_cords(move)
                     if tryMove(turn, main_board, y1, x1, y2, x2):
                         # Handle successful move
                         move_time = time.time() - start_time
@@ -372,7 +437,7 @@ def main(player_turn, algorithm, game_time):
                         # Handle promotion and game state
                         whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, y1, x1, y2, x2)
                         if whatAfter == "promotion":
-                            promotion(yForPromotion, xForPromotion, main_board, '4')  # Always queen
+                            promotion(yForPromotion, xForPromotion, main_board, moves.promotion_choice(move))
                             whatAfter, _, _ = afterMove(turn, main_board, y1, x1, y2, x2)
                         
                         # Update game state
@@ -394,20 +459,36 @@ def main(player_turn, algorithm, game_time):
                             moves_queue.put(move_time)
                         start_time = time.time()
                         calculating = False
-                        minimax_process.terminate()  # Natychmiastowe zabicie procesu
+                        if ponder_search:
+                            if running:
+                                # Myślenie nad pozycją po przewidywanej odpowiedzi gracza
+                                ai_turn = 'b' if player_turn == 'w' else 'w'
+                                ponder_search.ponder(main_board, ai_turn, white_time if ai_turn == 'w' else black_time,
+                                                     (len(main_board.moves_algebraic) + 1) // 2 + 1)
+                        else:
+                            minimax_process.terminate()  # Natychmiastowe zabicie procesu
 
             elif algorithm == "monte_carlo":
                 if not calculating:
                     calculating = True
                     result_queue = queue.Queue()
-                    monte_carlo_thread = MonteCarloThread(main_board, depth, turn, result_queue)
+                    if monte_carlo_thread and monte_carlo_thread.is_alive():
+                        monte_carlo_thread.join()  # Przerwany wątek musi oddać drzewo
+                    remaining_time = (white_time if turn == 'w' else black_time) - (time.time() - start_time)
+                    move_number = len(main_board.moves_algebraic) // 2 + 1
+                    time_limit = TimeManager(remaining_time, move_number, max_time=MAX_TIME).soft_limit
+                    monte_carlo_thread = MonteCarloThread(main_board, depth, turn, result_queue, mcts, time_limit,
+                                                          workers, config.get("mcts_tree_parallel", False))
                     monte_carlo_thread.start()
                 
                 try:
                     move = result_queue.get_nowait()
                     calculating = False
                     if move:
-                        from_row, from_col, to_row, to_col = move
+                        if nerd_view:
+                            info_window.update_additional_info(monte_carlo_thread.message)
+                            info_window.update_best_move(move)
+                        from_row, from_col, to_row, to_col = moves.to_cords(move)
                         if tryMove(turn, main_board, from_row, from_col, to_row, to_col):
                             move_time = time.time() - start_time
                             if turn == 'w':
@@ -417,8 +498,7 @@ def main(player_turn, algorithm, game_time):
                             turn = 'w' if turn == 'b' else 'b'
                             whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, from_row, from_col, to_row, to_col)
                             if whatAfter == "promotion":
-                                promotion_choice = '10'  # Zawsze promuj do królowej
-                                promotion(yForPromotion, xForPromotion, main_board, promotion_choice)
+                                promotion(yForPromotion, xForPromotion, main_board, moves.promotion_choice(move))
                                 whatAfter, _, _ = afterMove(turn, main_board, from_row, from_col, to_row, to_col)
                             if whatAfter == "checkmate":
                                 result = global_translations.get("checkmate")  # "Szach Mat!"
@@ -498,6 +578,8 @@ def main(player_turn, algorithm, game_time):
     
     try: minimax_process.terminate()  # Natychmiastowe zabicie procesu
     except: pass
+    if ponder_search:
+        ponder_search.close()
     # W obsłudze wyjścia
     if monte_carlo_thread and monte_carlo_thread.is_alive():
         monte_carlo_thread.stop()
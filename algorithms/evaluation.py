@@ -201,17 +201,9 @@ def king_to_edge(board):
     evaluation_white = 0
     evaluation_black = 0
     
-    # Znajdź pozycje królów
-    white_king = None
-    black_king = None
-    for i in range(8):
-        for j in range(8):
-            piece = board.board_state[i][j].figure
-            if piece and piece.type == 'K':
-                if piece.color == 'w':
-                    white_king = (i, j)
-                else:
-                    black_king = (i, j)
+    # Pozycje królów
+    white_king = board.king_cords['w']
+    black_king = board.king_cords['b']
 
     # Analiza dla białego króla
     if white_king:
@@ -320,18 +312,9 @@ def mating(board):
     """
     evaluation_white = 0
     evaluation_black = 0
-    white_king_position = None
-    black_king_position = None
+    white_king_position = board.king_cords['w']
+    black_king_position = board.king_cords['b']
 
-    for i in range(8):
-        for j in range(8):
-            field = board.board_state[i][j]
-            if field.figure is not None and field.figure.type == 'K':
-                if field.figure.color == 'w':
-                    white_king_position = (i, j)
-                else:
-                    black_king_position = (i, j)
-                    
     if white_king_position is not None:
         rank, file = white_king_position
         # Obliczamy dystans króla białego do najbliższej krawędzi
@@ -690,18 +673,9 @@ def checks_and_threats(board):
     # board.is_in_check(color)
     
     # Uproszczone sprawdzenie kontrolowanych pól wokół króla przeciwnika
-    white_king_pos = None
-    black_king_pos = None
-    
-    # Znajdź pozycje królów
-    for i in range(8):
-        for j in range(8):
-            field = board.board_state[i][j]
-            if field.figure is not None and field.figure.type == 'K':
-                if field.figure.color == 'w':
-                    white_king_pos = (i, j)
-                else:
-                    black_king_pos = (i, j)
+    # Pozycje królów
+    white_king_pos = board.king_cords['w']
+    black_king_pos = board.king_cords['b']
     
     # Sprawdź pola wokół króla przeciwnika
     if white_king_pos:
@@ -828,11 +802,9 @@ def get_evaluation(board, current_color=None):
         list: Lista zawierająca ocenę dla białych i czarnych [white_eval, black_eval].
     """
     if current_color:
-        # Sprawdź warunki końca gry
-        legal_moves = board.get_all_moves(current_color)
-        
-        if not legal_moves:
-            if board.is_in_check(current_color):
+        # Sprawdź warunki końca gry (wystarczy jeden legalny ruch, bez generowania wszystkich)
+        if not board.has_any_legal_move(current_color):
+            if board.is_in_check_minimax(current_color):
                 # Mat - zwróć ogromną wartość z perspektywy przeciwnika
                 return (float('-inf'), float('inf')) if current_color == 'w' else (float('inf'), float('-inf'))
             else:
@@ -0,0 +1,323 @@
+"""
+Moduł zawiera drzewo Monte Carlo Tree Search zapisane kolumnami (struct-of-arrays) w tablicach numpy.
+
+Węzeł to indeks we wszystkich kolumnach:
+    visits      liczba symulacji w poddrzewie węzła
+    wins        suma wyników tych symulacji z perspektywy strony, która wykonała ruch węzła
+    priors      wstępna ocena ruchu (0-1), używana przy wyborze dziecka
+    parents     indeks rodzica (NO_NODE dla korzenia)
+    first_child indeks pierwszego dziecka (NO_NODE - węzeł nierozwinięty)
+    child_count liczba dzieci (0 w rozwiniętym węźle oznacza pozycję końcową)
+    moves       ruch węzła, spakowany (engine.moves)
+    hashes      odcisk Zobrista pozycji po ruchu (0 - jeszcze nieznany)
+
+Węzeł zajmuje kilkadziesiąt bajtów zamiast kilkuset bajtów obiektu Pythona z listą dzieci.
+Dzieci węzła są dopisywane naraz przy rozwinięciu, więc zajmują ciągły blok indeksów, a wybór
+dziecka liczy wzór UCT jednym wyrażeniem na wycinkach kolumn tego bloku. Kolumny mają zapas
+miejsca podwajany przy zapełnieniu; po przesunięciu korzenia compact() przepisuje poddrzewo
+nowego korzenia do nowych tablic, a pamięć reszty drzewa jest zwalniana.
+
+SharedMctsTree trzyma te same kolumny w pamięci współdzielonej przez procesy, z pulą węzłów
+o stałej pojemności (algorithms.parallel_mcts).
+"""
+import math
+from multiprocessing.sharedctypes import RawArray, RawValue
+
+import numpy as np
+
+NO_NODE = -1
+
+# Wartość wyboru dziecka bez symulacji (przed nim nie zostanie wybrane żadne odwiedzone dziecko)
+UNVISITED = 1e9
+# Waga wstępnej oceny ruchu we wzorze wyboru (maleje z liczbą symulacji dziecka)
+PRIOR_WEIGHT = 1.0
+# Początkowa pojemność kolumn drzewa (w węzłach)
+INITIAL_CAPACITY = 1024
+
+# Kolumny drzewa i ich typy
+COLUMNS = (
+    ('visits', np.int64),
+    ('wins', np.float64),
+    ('priors', np.float32),
+    ('parents', np.int64),
+    ('first_child', np.int64),
+    ('child_count', np.uint16),
+    ('moves', np.uint16),
+    ('hashes', np.uint64),
+)
+
+
+class MctsTree:
+    """
+    Drzewo MCTS w kolumnach numpy; korzeń ma zawsze indeks 0.
+    """
+
+    def __init__(self, root_hash: int = 0):
+        """
+        Tworzy drzewo z samym korzeniem.
+
+        Args:
+            root_hash (int, opcjonalnie): Odcisk Zobrista pozycji w korzeniu.
+        """
+        self.clear(root_hash)
+
+    def clear(self, root_hash: int = 0) -> None:
+        """
+        Usuwa wszystkie węzły i tworzy nowy korzeń.
+
+        Args:
+            root_hash (int, opcjonalnie): Odcisk Zobrista pozycji w korzeniu.
+        """
+        for name, dtype in COLUMNS:
+            setattr(self, name, np.zeros(INITIAL_CAPACITY, dtype))
+        self.size = 1
+        self.parents[0] = NO_NODE
+        self.first_child[0] = NO_NODE
+        self.hashes[0] = root_hash
+
+    def __len__(self) -> int:
+        """
+        Zwraca liczbę węzłów drzewa.
+        """
+        return self.size
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Powiększa kolumny (co najmniej dwukrotnie), jeśli mają mniej niż capacity miejsc.
+        """
+        old_capacity = len(self.visits)
+        if capacity <= old_capacity:
+            return
+        new_capacity = max(capacity, 2 * old_capacity)
+        for name, dtype in COLUMNS:
+            column = np.zeros(new_capacity, dtype)
+            column[:old_capacity] = getattr(self, name)
+            setattr(self, name, column)
+
+    def is_expanded(self, node: int) -> bool:
+        """
+        Sprawdza, czy węzeł został rozwinięty (ma dzieci albo jest pozycją końcową).
+        """
+        return self.first_child[node] != NO_NODE
+
+    def children(self, node: int) -> range:
+        """
+        Zwraca indeksy dzieci węzła.
+        """
+        first = int(self.first_child[node])
+        return range(first, first + int(self.child_count[node])) if first != NO_NODE else range(0)
+
+    def expand(self, node: int, move_list: list[int], priors: list[float]) -> None:
+        """
+        Dopisuje dzieci węzła w jednym ciągłym bloku.
+
+        Args:
+            node (int): Rozwijany węzeł.
+            move_list (list[int]): Legalne ruchy z pozycji węzła (pusta lista - pozycja końcowa).
+            priors (list[float]): Wstępne oceny ruchów, w tej samej kolejności.
+        """
+        first = self.size
+        end = first + len(move_list)
+        self._reserve(end)
+        self.visits[first:end] = 0
+        self.wins[first:end] = 0.0
+        self.priors[first:end] = priors
+        self.parents[first:end] = node
+        self.first_child[first:end] = NO_NODE
+        self.child_count[first:end] = 0
+        self.moves[first:end] = move_list
+        self.hashes[first:end] = 0
+        self.size = end
+        self.first_child[node] = first
+        self.child_count[node] = end - first
+
+    def select_child(self, node: int, exploration: float) -> int:
+        """
+        Wybiera dziecko węzła z największą wartością wzoru UCT z premią za wstępną ocenę ruchu
+        (progressive bias). Dzieci bez symulacji są wybierane najpierw, od najwyższej oceny wstępnej.
+
+        Args:
+            node (int): Rozwinięty węzeł z dziećmi.
+            exploration (float): Stała eksploracji we wzorze UCT.
+
+        Returns:
+            int: Indeks wybranego dziecka.
+        """
+        first = int(self.first_child[node])
+        end = first + int(self.child_count[node])
+        log_games = math.log(self.visits[node] or 1)
+        games = self.visits[first:end]
+        inverse_played = 1.0 / np.maximum(games, 1)
+        choice_factors = self.wins[first:end] * inverse_played
+        choice_factors += np.sqrt(inverse_played * (exploration * exploration * log_games))
+        choice_factors += self.priors[first:end] * (PRIOR_WEIGHT / (games + 1))
+        # Dzieci bez symulacji: wyraz eksploracji jest u nich jednakowy, więc kolejność wyznacza ocena wstępna
+        choice_factors[games == 0] += UNVISITED
+        return first + int(np.argmax(choice_factors))
+
+    def add_virtual_loss(self, path: list[int], virtual_loss: int) -> None:
+        """
+        Dolicza węzłom ścieżki przegrane symulacje, które jeszcze trwają (wirtualna strata),
+        żeby inne procesy wybierały inne ścieżki.
+
+        Args:
+            path (list[int]): Węzły od korzenia do liścia.
+            virtual_loss (int): Liczba wirtualnych przegranych.
+        """
+        self.visits[path] += virtual_loss
+
+    def backpropagate(self, path: list[int], result: float, virtual_loss: int = 0) -> None:
+        """
+        Dodaje wynik symulacji do węzłów ścieżki; perspektywa zmienia się z każdym poziomem.
+
+        Args:
+            path (list[int]): Węzły od korzenia do liścia.
+            result (float): Wynik z perspektywy strony, która wykonała ruch liścia.
+            virtual_loss (int, opcjonalnie): Wirtualna strata dodana tej ścieżce przez add_virtual_loss, do usunięcia.
+        """
+        self.visits[path] += 1 - virtual_loss
+        # Liść dostaje result, jego rodzic 1 - result, i tak na przemian aż do korzenia
+        from_leaf = np.arange(len(path) - 1, -1, -1)
+        self.wins[path] += np.where(from_leaf % 2 == 0, result, 1.0 - result)
+
+    def best_child(self, node: int) -> int:
+        """
+        Zwraca dziecko węzła z największą liczbą symulacji (NO_NODE, jeśli węzeł nie ma dzieci).
+        """
+        children = self.children(node)
+        if not children:
+            return NO_NODE
+        return children.start + int(np.argmax(self.visits[children.start:children.stop]))
+
+    def find(self, position_hash: int, depth: int) -> int:
+        """
+        Szuka węzła z danym odciskiem pozycji na danej głębokości pod korzeniem.
+
+        Returns:
+            int: Indeks węzła albo NO_NODE.
+        """
+        level = [0]
+        for _ in range(depth):
+            level = [child for node in level for child in self.children(node)]
+        for node in level:
+            if self.hashes[node] == position_hash:
+                return node
+        return NO_NODE
+
+    def compact(self, new_root: int) -> None:
+        """
+        Przepisuje poddrzewo węzła new_root do nowych kolumn (new_root staje się korzeniem 0).
+        Węzły spoza poddrzewa są usuwane, a pamięć starych kolumn zwalniana.
+
+        Args:
+            new_root (int): Węzeł, który zostaje nowym korzeniem.
+        """
+        # Kolejność wszerz zachowuje ciągłe bloki dzieci
+        order = [new_root]
+        parents = [NO_NODE]
+        first_child = []
+        index = 0
+        while index < len(order):
+            node = order[index]
+            if self.first_child[node] == NO_NODE:
+                first_child.append(NO_NODE)
+            else:
+                children = self.children(node)
+                first_child.append(len(order))
+                order.extend(children)
+                parents.extend([index] * len(children))
+            index += 1
+        order = np.array(order, np.int64)
+        for name, _ in COLUMNS:
+            setattr(self, name, getattr(self, name)[order])
+        self.parents = np.array(parents, np.int64)
+        self.first_child = np.array(first_child, np.int64)
+        self.size = len(order)
+
+
+class SharedMctsTree(MctsTree):
+    """
+    Drzewo MCTS w pamięci współdzielonej przez procesy, z pulą węzłów o stałej pojemności.
+
+    Kolumny są widokami numpy na tablice RawArray bez własnej synchronizacji, więc zmiany drzewa
+    (rozwinięcie, wirtualna strata, propagacja wsteczna) trzeba wykonywać pod wspólną blokadą. Po
+    zapełnieniu puli węzły nie są już rozwijane, a symulacje zaczynają się w liściach. Pula jest
+    budowana od nowa przy każdym ruchu (parallel_mcts.parallel_mcts_move), więc compact() nie jest
+    dla niej używane.
+
+    Args:
+        capacity (int): Największa liczba węzłów.
+        shared_size (RawValue): Liczba zajętych węzłów.
+    """
+
+    def __init__(self, capacity: int, root_hash: int = 0):
+        """
+        Rezerwuje kolumny w pamięci współdzielonej i tworzy korzeń.
+
+        Args:
+            capacity (int): Największa liczba węzłów.
+            root_hash (int, opcjonalnie): Odcisk Zobrista pozycji w korzeniu.
+        """
+        self.capacity = capacity
+        self.shared_size = RawValue('l', 1)
+        self.raw_columns = {name: RawArray(np.dtype(dtype).char, capacity) for name, dtype in COLUMNS}
+        self._bind_columns()
+        self.clear(root_hash)
+
+    def _bind_columns(self) -> None:
+        """
+        Tworzy widoki numpy na kolumny w pamięci współdzielonej.
+        """
+        for name, dtype in COLUMNS:
+            setattr(self, name, np.frombuffer(self.raw_columns[name], dtype))
+
+    def __getstate__(self) -> dict:
+        """
+        Przy przekazaniu do procesu przenoszone są tablice RawArray, a nie kopie widoków numpy.
+        """
+        return {'capacity': self.capacity, 'shared_size': self.shared_size, 'raw_columns': self.raw_columns}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Odtwarza widoki numpy na tablice RawArray w procesie potomnym.
+        """
+        self.__dict__.update(state)
+        self._bind_columns()
+
+    @property
+    def size(self) -> int:
+        """
+        Liczba zajętych węzłów puli.
+        """
+        return self.shared_size.value
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self.shared_size.value = value
+
+    def clear(self, root_hash: int = 0) -> None:
+        """
+        Zwalnia pulę węzłów i zapisuje nowy korzeń.
+        """
+        self.size = 1
+        self.visits[0] = 0
+        self.wins[0] = 0.0
+        self.priors[0] = 0.0
+        self.parents[0] = NO_NODE
+        self.first_child[0] = NO_NODE
+        self.child_count[0] = 0
+        self.moves[0] = 0
+        self.hashes[0] = root_hash
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Pula ma stałą pojemność; przepełnienie obsługuje expand().
+        """
+
+    def expand(self, node: int, move_list: list[int], priors: list[float]) -> None:
+        """
+        Zapisuje dzieci węzła w kolejnym wolnym bloku puli; przy pełnej puli węzeł zostaje liściem.
+        """
+        if self.size + len(move_list) > self.capacity:
+            return
+        super().expand(node, move_list, priors)
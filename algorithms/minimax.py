@@ -6,9 +6,126 @@ from pathlib import Path
 from random import randint
 
 import algorithms.evaluation as evaluation
-import engine.engine as engine
+import engine.zobrist as zobrist
+import engine.moves as moves
+from algorithms.transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from algorithms.static_exchange import capture_gain, see
+from algorithms.time_manager import TimeManager
+from algorithms.search_stats import SearchStats
 from engine.fen_operations import *
 
+# Książka debiutów indeksowana odciskiem Zobrista, wczytywana raz na proces
+_opening_book = None
+
+
+def load_opening_book(json_path: Path) -> dict:
+    """
+    Wczytuje książkę debiutów i zamienia jej klucze FEN na odciski Zobrista.
+
+    Args:
+        json_path (Path): Ścieżka do pliku z książką debiutów.
+
+    Returns:
+        dict: Słownik {odcisk pozycji: lista ruchów}.
+    """
+    global _opening_book
+    if _opening_book is None:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            _opening_book = {zobrist.hash_from_fen(position, include_state=False): book_moves
+                             for position, book_moves in json.load(f).items()}
+    return _opening_book
+
+
+# Wynik matu w korzeniu; mat o ply półruchów dalej jest wart MATE_SCORE - ply
+MATE_SCORE = 1000000
+# Największa odległość od korzenia w półruchach; wyniki od MATE_THRESHOLD wzwyż są matami
+# (okna aspiracji i przycinanie nie są używane wokół takich wyników)
+MAX_PLY = 128
+MATE_THRESHOLD = MATE_SCORE - MAX_PLY
+# Początkowa połowa szerokości okna aspiracji i szerokość, od której okno staje się nieskończone
+ASPIRATION_WINDOW = 50
+MAX_ASPIRATION_WINDOW = 3200
+
+# Priorytety sortowania ruchów: ruch z tablicy transpozycji, bicia (MVV-LVA), ruchy zabójcze, historia
+HASH_MOVE_SCORE = 10 ** 9
+CAPTURE_SCORE = 10 ** 8
+KILLER_SCORE = 10 ** 7
+
+# Zapas przycinania delta w przeszukiwaniu stabilizującym: bicie, które nawet z tym zapasem
+# nie podnosi oceny do alfy, nie jest sprawdzane
+DELTA_MARGIN = 200
+
+# Przycinanie ruchem zerowym: minimalna głębokość i redukcja głębokości po ruchu zerowym
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+# Redukcje późnych ruchów: minimalna głębokość i numer ruchu w kolejności, od którego ruchy są redukowane
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVE_INDEX = 3
+# Zapasy futility (głębokość 1) i razoringu (głębokość 1 i 2)
+FUTILITY_MARGIN = 300
+RAZOR_MARGINS = (0, 350, 550)
+
+# Domyślne ustawienia technik przycinania (klucze jak w choose_ai_settings_dialog)
+DEFAULT_PRUNING = {'null_move': True, 'late_move_reductions': True, 'futility': True}
+
+# Tablica transpozycji zachowywana między ruchami, jeśli Minimax jest tworzony z keep_tt=True
+_shared_table = None
+
+
+def score_to_tt(score: float, ply: int) -> float:
+    """
+    Zamienia wynik matowy liczony od korzenia na liczony od węzła, do zapisu w tablicy transpozycji
+    (ta sama pozycja może wystąpić na innej głębokości).
+
+    Args:
+        score (float): Wynik z punktu widzenia strony na ruchu.
+        ply (int): Odległość węzła od korzenia w półruchach.
+
+    Returns:
+        float: Wynik do zapisu.
+    """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: float, ply: int) -> float:
+    """
+    Odwrotność score_to_tt: zamienia wynik matowy z tablicy transpozycji na liczony od korzenia.
+
+    Args:
+        score (float): Wynik odczytany z tablicy.
+        ply (int): Odległość węzła od korzenia w półruchach.
+
+    Returns:
+        float: Wynik z punktu widzenia strony na ruchu.
+    """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def get_shared_table(size_mb: float) -> TranspositionTable:
+    """
+    Zwraca tablicę transpozycji współdzieloną przez kolejne wyszukiwania w tym procesie.
+
+    Tablica jest tworzona od nowa tylko wtedy, gdy zmieni się jej rozmiar.
+
+    Args:
+        size_mb (float): Rozmiar tablicy w megabajtach.
+
+    Returns:
+        TranspositionTable: Współdzielona tablica transpozycji.
+    """
+    global _shared_table
+    if _shared_table is None or _shared_table.size_mb != size_mb:
+        _shared_table = TranspositionTable(size_mb)
+    return _shared_table
+
 
 class Minimax:
     """
@@ -16,12 +133,21 @@ class Minimax:
 
     Args:
         main_board (Board): Obiekt planszy szachowej.
-        depth (int): Maksymalna głębokość przeszukiwania. Zalecane: 2, dla najlepszych efektów. Przy 3 jest głupi, a 4 liczy za długo.
+        depth (int): Maksymalna głębokość przeszukiwania. Głębokość jest zwiększana iteracyjnie, więc po
+            przekroczeniu limitu czasu zwracany jest ruch z ostatniej w pełni przeszukanej głębokości.
         color (str): Kolor gracza ('w' lub 'b').
         time_limit (float): Limit czasu na obliczenia w sekundach.
+        time_manager (TimeManager): Przydział czasu (miękki i twardy limit) sprawdzany przez wyszukiwanie.
+        tt_size_mb (float): Rozmiar tablicy transpozycji w megabajtach.
+        keep_tt (bool): Czy zachować tablicę transpozycji między ruchami (w obrębie procesu).
+        pruning (dict): Włączone techniki przycinania, klucze jak w DEFAULT_PRUNING.
+        root_moves (list[int]): Ruchy przeszukiwane w korzeniu (None - wszystkie legalne).
+        use_book (bool): Czy najpierw szukać ruchu w książce debiutów.
+        stop_event (Event): Zdarzenie (threading lub multiprocessing), którego ustawienie przerywa wyszukiwanie.
     """
 
-    def __init__(self, main_board, depth, color, time_limit=50):
+    def __init__(self, main_board, depth, color, time_limit=50, tt_size_mb=16, keep_tt=False, pruning=None,
+                 root_moves=None, use_book=True, stop_event=None, time_manager=None):
         """
         Inicjalizuje obiekt klasy Minimax.
 
@@ -30,6 +156,16 @@ class Minimax:
             depth (int): Maksymalna głębokość przeszukiwania.
             color (str): Kolor gracza ('w' lub 'b').
             time_limit (float): Limit czasu na obliczenia w sekundach.
+            tt_size_mb (float): Rozmiar tablicy transpozycji w megabajtach.
+            keep_tt (bool): Czy użyć tablicy transpozycji współdzielonej między ruchami.
+            pruning (dict, opcjonalnie): Włączone techniki przycinania ('null_move', 'late_move_reductions',
+                'futility'); brakujące klucze przyjmują wartości z DEFAULT_PRUNING.
+            root_moves (list[int], opcjonalnie): Ruchy przeszukiwane w korzeniu, np. część ruchów
+                przydzielona jednemu procesowi w algorithms.parallel_search (domyślnie wszystkie legalne).
+            use_book (bool, opcjonalnie): Czy najpierw szukać ruchu w książce debiutów.
+            stop_event (Event, opcjonalnie): Zdarzenie przerywające wyszukiwanie przed limitem czasu.
+            time_manager (TimeManager, opcjonalnie): Przydział czasu liczony z zegara partii
+                (algorithms.time_manager); domyślnie stały limit time_limit.
         """
         self.main_board = copy.deepcopy(main_board)
         self.depth = depth
@@ -41,13 +177,37 @@ class Minimax:
         self.best_move = None
         self.message = " "
         self.available_moves_from_json = []
+        # Przerwanie wyszukiwania przez limit czasu i główny wariant z ostatniej pełnej iteracji
+        self.stopped = False
+        self.pv = []
+        # Najlepszy ruch w korzeniu spośród w pełni przeszukanych w bieżącej iteracji
+        self.root_best_move = None
+        # Ruchy zabójcze (dwa na półruch) i tablica historii [kolor * 4096 + skąd * 64 + dokąd]
+        self.killers = []
+        self.history = [0] * 8192
+        pruning = {**DEFAULT_PRUNING, **(pruning or {})}
+        self.null_move_pruning = pruning['null_move']
+        self.late_move_reductions = pruning['late_move_reductions']
+        self.futility_pruning = pruning['futility']
+        self.root_moves = root_moves
+        self.use_book = use_book
+        self.stop_event = stop_event
+        if time_manager is None:
+            time_manager = TimeManager.fixed(time_limit)
+        if stop_event is not None:
+            time_manager.stop_event = stop_event
+        self.time_manager = time_manager
+        # Statystyki bieżącego przeszukiwania (węzły, odcięcia, tablica transpozycji)
+        self.stats = SearchStats()
+        # Tablica transpozycji jest wspólna dla wszystkich iteracji pogłębiania
+        self.transposition_table = get_shared_table(tt_size_mb) if keep_tt else TranspositionTable(tt_size_mb)
 
     def get_opening_move(self):
         """
         Pobiera ruch z książki debiutów, jeśli jest dostępny.
 
         Returns:
-            tuple or None: Ruch w formacie (y1, x1, y2, x2) lub None, jeśli ruch nie został znaleziony.
+            int or None: Ruch spakowany (engine.moves) lub None, jeśli ruch nie został znaleziony.
         """
         try:
             # Ścieżka do pliku z książką debiutów
@@ -60,35 +220,29 @@ class Minimax:
                 return None
 
             # Wczytanie książki debiutów
-            with open(json_path, 'r', encoding='utf-8') as f:
-                opening_book = json.load(f)
-                self.message += f"\n📚 Loaded opening book with {len(opening_book)} positions"
+            opening_book = load_opening_book(json_path)
+            self.message += f"\n📚 Loaded opening book with {len(opening_book)} positions"
 
-            # Generowanie klucza pozycji na podstawie FEN
-            current_fen = board_to_fen_inverted(self.main_board, self.color)
-            fen_parts = current_fen.split(' ')
-            position_key = f"{fen_parts[0]} {fen_parts[1]}"
+            # Klucz pozycji to odcisk Zobrista bez praw do roszady i bicia w przelocie
+            position_key = zobrist.book_key(self.main_board, self.color)
 
-            self.message += f"\n🔍 Searching for position: {position_key}"
+            self.message += f"\n🔍 Searching for position: {position_key:016x}"
 
             # Sprawdzenie, czy pozycja istnieje w książce debiutów
             if position_key in opening_book:
-                moves = opening_book[position_key]
-                if not moves:
+                book_moves = opening_book[position_key]
+                if not book_moves:
                     self.message += "\n❌ No moves found in opening book"
                     return None
 
                 # Wybór losowego ruchu z książki debiutów
-                self.available_moves_from_json = moves
-                move_notation = random.choice(moves)
-                self.message += f"\n✅ Found {len(moves)} moves in opening book"
+                self.available_moves_from_json = book_moves
+                move_notation = random.choice(book_moves)
+                self.message += f"\n✅ Found {len(book_moves)} moves in opening book"
                 self.message += f"\n📌 Selected move: {move_notation}"
 
-                return engine.notation_to_cords(
-                    self.main_board,
-                    move_notation,
-                    self.color
-                )
+                move = moves.from_san(self.main_board, move_notation, self.color)
+                return move if move != moves.NULL_MOVE else None
 
             self.message += "\n❌ Position not found in opening book"
             return None
@@ -100,74 +254,150 @@ class Minimax:
 
     def get_best_move(self):
         """
-        Główna funkcja wyszukiwania najlepszego ruchu.
+        Główna funkcja wyszukiwania najlepszego ruchu (iteracyjne pogłębianie).
+
+        Każda iteracja przeszukuje najpierw główny wariant z poprzedniej iteracji, a od drugiej
+        głębokości używa okna aspiracji wokół poprzedniego wyniku (poszerzanego, gdy wynik
+        z niego wypadnie). Po przekroczeniu limitu czasu zwracany jest ruch z ostatniej
+        w pełni przeszukanej głębokości.
 
         Returns:
-            tuple: Najlepszy ruch, wiadomość debugowa i lista ruchów z książki debiutów.
+            tuple: Najlepszy ruch (spakowany, engine.moves), wiadomość debugowa, lista ruchów z książki debiutów
+                i statystyki przeszukiwania (SearchStats).
         """
         self.start_time = time.time()
+        self.time_manager.start()
+        self.stats = SearchStats()
+        self.stats.start()
+        self.stopped = False
+        self.pv = []
+        self.root_best_move = None
+        self.killers = []
+        self.history = [0] * 8192
+        self.transposition_table.new_search()
         self.message += "\n=== Move Search Started ==="
 
         # Próba znalezienia ruchu w książce debiutów
-        self.message += "\n📖 Checking opening book..."
-        book_move = self.get_opening_move()
+        book_move = None
+        if self.use_book:
+            self.message += "\n📖 Checking opening book..."
+            book_move = self.get_opening_move()
         if book_move:
-            self.message += f"\n✨ Using book move: {book_move}"
-            return book_move, self.message, self.available_moves_from_json
+            self.message += f"\n✨ Using book move: {moves.to_uci(book_move)}"
+            return book_move, self.message, self.available_moves_from_json, self.stats
+
+        # Jedyny legalny ruch nie wymaga przeszukiwania
+        legal_moves = self.root_moves or self.main_board.get_move_list(self.color)
+        if len(legal_moves) == 1:
+            self.message += f"\n⚡ Forced move: {moves.to_uci(legal_moves[0])}"
+            return legal_moves[0], self.message, self.available_moves_from_json, self.stats
 
         # Rozpoczęcie wyszukiwania za pomocą Minimax
         self.message += "\n🔄 Starting minimax search..."
-        moves_by_depth = {}
         best_move = None
         best_eval = -float('inf')
+        completed_depth = 0
 
         # Mapowanie typów figur na ich nazwy
         piece_types = {
-            'p': 'Pawn', 'r': 'Rook', 'n': 'Knight',
-            'b': 'Bishop', 'q': 'Queen', 'k': 'King'
+            'p': 'Pawn', 'R': 'Rook', 'N': 'Knight',
+            'B': 'Bishop', 'Q': 'Queen', 'K': 'King'
         }
 
         try:
             # Iteracyjne przeszukiwanie na różnych głębokościach
             for current_depth in range(1, self.depth + 1):
-                if self.is_time_exceeded():
-                    self.message += f"\n⚠️ Time limit reached at depth {current_depth-1}"
+                # Pierwsza iteracja zawsze; kolejne tylko w miękkim limicie czasu
+                if current_depth > 1 and not self.time_manager.can_start_iteration():
+                    self.message += f"\n⏱️ Time budget used after depth {completed_depth}"
                     break
 
                 depth_start = time.time()
-                eval_score, move = self.minimax(self.main_board, current_depth, -float('inf'), float('inf'), True)
-
-                if move and not self.is_time_exceeded():
-                    moves_by_depth[current_depth] = (move, eval_score)
-                    y1, x1, y2, x2 = move
-                    piece = self.main_board.board_state[y1][x1].figure
-                    piece_name = piece_types.get(piece.type, piece.type)
-                    self.message += f"\n📊 Depth {current_depth}:"
-                    self.message += f"\n   Piece: {piece_name}"
-                    self.message += f"\n   Move: {chr(97+x1)}{8-y1} → {chr(97+x2)}{8-y2}"
-                    self.message += f"\n   Score: {eval_score:.2f}"
-                    self.message += f"\n   Time: {time.time() - depth_start:.3f}s"
-
-                    if eval_score > best_eval:
-                        best_move = move
-                        best_eval = eval_score
-                        self.message += f"\n   ⭐ New best move!"
+                eval_score, move, pv = self.aspiration_search(current_depth, best_eval if completed_depth else None)
+
+                if self.stopped or move is None:
+                    # Niedokończona iteracja: zostaje ruch z poprzedniej głębokości, a bez niej
+                    # najlepszy z ruchów, które pierwsza iteracja zdążyła przeszukać
+                    if best_move is None:
+                        best_move = self.root_best_move
+                    break
+
+                best_move = move
+                best_eval = eval_score
+                completed_depth = current_depth
+                self.time_manager.update(move, eval_score)
+                self.stats.end_iteration(current_depth)
+                # Główny wariant zgłoszony przez przeszukanie; na jego początku zawsze jest najlepszy ruch
+                self.pv = pv if pv and pv[0][1] == move else [(self.main_board.hash, move)]
+                y1, x1, y2, x2 = moves.to_cords(move)
+                piece = self.main_board.board_state[y1][x1].figure
+                piece_name = piece_types.get(piece.type, piece.type)
+                self.message += f"\n📊 Depth {current_depth}:"
+                self.message += f"\n   Piece: {piece_name}"
+                self.message += f"\n   Move: {moves.to_uci(move)}"
+                self.message += f"\n   PV: {' '.join(moves.to_uci(pv_move) for _, pv_move in self.pv)}"
+                self.message += f"\n   Score: {eval_score:.2f}"
+                self.message += f"\n   Time: {time.time() - depth_start:.3f}s"
+
+            if self.stopped:
+                self.message += f"\n⚠️ Time limit reached at depth {completed_depth + 1}"
+            if best_move is None:
+                # Pierwsza iteracja nie przeszukała w pełni nawet jednego ruchu
+                best_move = legal_moves[0] if legal_moves else None
 
             # Podsumowanie wyszukiwania
             total_time = time.time() - self.start_time
             self.message += f"\n=== Search Complete ==="
             self.message += f"\n🕒 Total time: {total_time:.3f}s"
-            self.message += f"\n📈 Max depth reached: {len(moves_by_depth)}"
-            self.message += f"\n💫 Final best move: {best_move}"
+            self.message += f"\n📈 Max depth reached: {completed_depth}"
+            self.message += f"\n💫 Final best move: {moves.to_uci(best_move) if best_move else None}"
             self.message += f"\n📋 Final score: {best_eval:.2f}"
+            self.stats.finish()
+            self.message += "\n" + self.stats.summary()
 
-            return best_move, self.message, self.available_moves_from_json
+            return best_move, self.message, self.available_moves_from_json, self.stats
 
         except Exception as e:
             # Obsługa błędów podczas wyszukiwania
             self.message += f"\n❌ Error in search: {e}"
             return None
 
+    def aspiration_search(self, depth, previous_score):
+        """
+        Przeszukuje korzeń w oknie aspiracji wokół wyniku poprzedniej iteracji.
+
+        Jeśli wynik wypadnie poza okno, okno jest poszerzane po tej stronie i przeszukanie
+        jest powtarzane, aż wynik zmieści się w oknie.
+
+        Argumenty:
+            depth (int): Głębokość iteracji.
+            previous_score (float): Wynik poprzedniej iteracji albo None (pełne okno).
+
+        Zwraca:
+            tuple: Wynik, najlepszy ruch (spakowany) i główny wariant (lista par (odcisk pozycji, ruch)).
+        """
+        pv = []
+        if previous_score is None or abs(previous_score) >= MATE_THRESHOLD:
+            score, move = self.negamax(self.main_board, depth, -float('inf'), float('inf'), self.color, 0, pv)
+            return score, move, pv
+        delta = ASPIRATION_WINDOW
+        alpha = previous_score - delta
+        beta = previous_score + delta
+        while True:
+            pv.clear()
+            score, move = self.negamax(self.main_board, depth, alpha, beta, self.color, 0, pv)
+            if self.stopped or score is None:
+                return score, move, pv
+            if alpha < score < beta:
+                return score, move, pv
+            delta *= 4
+            if score <= alpha:
+                alpha = previous_score - delta if delta < MAX_ASPIRATION_WINDOW else -float('inf')
+                self.message += f"\n   ↘ Fail low at depth {depth}, re-search"
+            else:
+                beta = previous_score + delta if delta < MAX_ASPIRATION_WINDOW else float('inf')
+                self.message += f"\n   ↗ Fail high at depth {depth}, re-search"
+
     def get_mate_pattern_bonus(self, board, color, move):
         """
         Oblicza bonus za potencjalne wzorce matowe na podstawie ruchu.
@@ -186,16 +416,9 @@ class Minimax:
             return 0
             
         opponent_color = 'b' if color == 'w' else 'w'
-        opponent_king_pos = None
+        opponent_king_pos = board.king_cords[opponent_color]
         bonus = 0
         
-        # Find opponent's king
-        for y in range(8):
-            for x in range(8):
-                fig = board.board_state[y][x].figure
-                if fig and fig.type == 'k' and fig.color == opponent_color:
-                    opponent_king_pos = (y, x)
-                    break
         if not opponent_king_pos:
             return 0
             
@@ -281,122 +504,385 @@ class Minimax:
                                 
         return bonus
 
-    def get_evaluation_score(self, board, is_maximizing):
+    def get_static_score(self, board, color):
         """
-        Oblicza ocenę pozycji na planszy, uwzględniając wzorce matowe i inne czynniki.
+        Oblicza ocenę pozycji bez sprawdzania matu i pata.
 
         Argumenty:
             board (Board): Obecny stan planszy.
-            is_maximizing (bool): Czy obecny gracz maksymalizuje wynik.
+            color (str): Strona na ruchu ('w' lub 'b').
 
         Zwraca:
-            int: Wynik oceny pozycji.
+            int: Wynik oceny pozycji z punktu widzenia strony na ruchu.
         """
         eval_result = evaluation.get_evaluation(board)
-        color = self.color if is_maximizing else ('w' if self.color == 'b' else 'b')
-        
-        # Check for mate and stalemate
-        if not board.get_all_moves(color):
-            if board.is_in_check_minimax(color):
-                return -1000000 if is_maximizing else 1000000
-            return 0  # Stalemate
-            
         score = eval_result[0] - eval_result[1] if color == 'w' else eval_result[1] - eval_result[0]
         
         # Add checkmate pattern detection for the last move
         if hasattr(board, 'last_move') and board.last_move:
-            mate_bonus = self.get_mate_pattern_bonus(board, color, board.last_move)
-            score += mate_bonus if is_maximizing else -mate_bonus
+            score += self.get_mate_pattern_bonus(board, color, board.last_move)
         
         return score
 
     def is_time_exceeded(self):
         """
-        Sprawdza, czy limit czasu na obliczenia został przekroczony.
+        Sprawdza, czy twardy limit czasu został przekroczony albo ustawiono stop_event.
+        Zegar jest odczytywany tylko co kilkaset wywołań (TimeManager.hard_limit_reached).
 
         Zwraca:
             bool: True, jeśli czas został przekroczony, w przeciwnym razie False.
         """
-        if not self.start_time:
-            return False
-        return time.time() - self.start_time >= self.time_limit - 0.1  # 100ms buffer
+        return self.time_manager.hard_limit_reached()
 
-    def minimax(self, board, depth, alpha, beta, is_maximizing):
+    def negamax(self, board, depth, alpha, beta, color, ply=0, pv=None, allow_null=True):
         """
-        Implementacja algorytmu minimax z przycinaniem alfa-beta.
+        Przeszukiwanie negamax z przycinaniem alfa-beta, tablicą transpozycji i przeszukiwaniem
+        głównego wariantu (PVS).
+
+        Wyniki są liczone z punktu widzenia strony na ruchu, więc wynik dziecka jest negowany.
+        Pierwszy ruch jest przeszukiwany z pełnym oknem, kolejne z zerowym oknem przy alfie;
+        tylko ruch, który je przekroczy, jest przeszukiwany ponownie z pełnym oknem.
+
+        Poza przycinaniem alfa-beta (każde można wyłączyć w ustawieniach):
+        ruch zerowy - jeśli nawet po oddaniu ruchu przeciwnikowi wynik przekracza betę, węzeł
+        jest odcinany po płytszym przeszukaniu (nie w końcówkach samych pionków, gdzie
+        częsty jest przymus ruchu); redukcje późnych ruchów - ciche ruchy daleko w kolejności
+        są najpierw sprawdzane płycej; futility i razoring - przy głębokości 1-2 pozycja
+        z oceną statyczną daleko pod alfą nie jest rozwijana cichymi ruchami.
 
         Argumenty:
             board (Board): Obecny stan planszy.
             depth (int): Głębokość rekursji.
             alpha (float): Wartość alfa dla przycinania.
             beta (float): Wartość beta dla przycinania.
-            is_maximizing (bool): Czy obecny gracz maksymalizuje wynik.
+            color (str): Strona na ruchu ('w' lub 'b').
+            ply (int): Odległość od korzenia w półruchach.
+            pv (list, opcjonalnie): Lista, do której zostanie wpisany główny wariant węzła
+                jako pary (odcisk pozycji, ruch spakowany).
+            allow_null (bool): Czy wolno wykonać ruch zerowy (nie dwa razy z rzędu).
 
         Zwraca:
-            tuple: Najlepszy wynik i ruch w formacie (wynik, ruch).
+            tuple: (wynik z punktu widzenia strony na ruchu, najlepszy ruch spakowany) albo
+                (None, None), jeśli przeszukanie przerwał limit czasu (w korzeniu najlepszy
+                z przeszukanych do tego czasu ruchów zostaje w root_best_move).
         """
         # Immediate time check
-        if self.is_time_exceeded():
+        if self.stopped or self.is_time_exceeded():
+            self.stopped = True
             return None, None
-
-        current_color = self.color if is_maximizing else ('w' if self.color == 'b' else 'b')
-        legal_moves = board.get_all_moves(current_color)
+        if pv is None:
+            pv = []
+
+        original_alpha, original_beta = alpha, beta
+        stats = self.stats
+        entry = self.transposition_table.probe(board.hash)
+        stats.tt_probes += 1
+        if entry:
+            stats.tt_hits += 1
+        if entry and ply > 0 and entry[0] >= depth:
+            tt_score, tt_move = score_from_tt(entry[1], ply), entry[3] or None
+            if entry[2] == EXACT:
+                return tt_score, tt_move
+            if entry[2] == LOWER_BOUND:
+                alpha = max(alpha, tt_score)
+            else:
+                beta = min(beta, tt_score)
+            if alpha >= beta:
+                return tt_score, tt_move
+
+        if depth == 0:
+            # Liść: dokończenie wymian zamiast oceny w połowie sekwencji bić (mat wykrywa quiescence)
+            return self.quiescence(board, alpha, beta, color, ply), None
+
+        opponent_color = 'w' if color == 'b' else 'b'
+        legal_moves = board.get_move_list(color)
+        if ply == 0 and self.root_moves is not None:
+            legal_moves = [move for move in legal_moves if move in self.root_moves]
+        in_check = board.is_in_check_minimax(color)
 
         # Base cases
-        if depth == 0 or not legal_moves:
-            return self.get_evaluation_score(board, is_maximizing), None
+        if not legal_moves:
+            score = -(MATE_SCORE - ply) if in_check else 0  # Mat albo pat
+            self.transposition_table.store(board.hash, depth, score_to_tt(score, ply), EXACT, 0)
+            return score, None
+
+        selective = ply > 0 and not in_check and abs(alpha) < MATE_THRESHOLD and abs(beta) < MATE_THRESHOLD
+        static_score = None
+        if selective and (depth <= 2 or (self.null_move_pruning and allow_null and depth >= NULL_MOVE_MIN_DEPTH)):
+            static_score = self.get_static_score(board, color)
+
+        # Razoring: ocena statyczna tak daleko pod alfą, że tylko bicia mogą coś zmienić
+        if self.futility_pruning and static_score is not None and depth <= 2 \
+                and static_score + RAZOR_MARGINS[depth] <= alpha:
+            score = self.quiescence(board, alpha, beta, color, ply)
+            if score is None or score <= alpha:
+                return score, None
+
+        # Ruch zerowy: przeciwnik gra dwa razy z rzędu, a wynik i tak przekracza betę
+        if (self.null_move_pruning and allow_null and static_score is not None and depth >= NULL_MOVE_MIN_DEPTH
+                and static_score >= beta
+                and any(board.piece_lists[color][piece_type] for piece_type in 'NBRQ')):
+            reduction = NULL_MOVE_REDUCTION + (1 if depth >= 6 else 0)
+            board.push_null(color)
+            stats.nodes += 1
+            score, _ = self.negamax(board, max(depth - 1 - reduction, 0), -beta, -beta + 1, opponent_color,
+                                    ply + 1, None, False)
+            board.pop_null()
+            if score is None:
+                return None, None
+            if -score >= beta:
+                # Wynik matowy po ruchu zerowym nie jest wiarygodny, zwracamy samą granicę
+                return (beta if -score >= MATE_THRESHOLD else -score), None
+
+        # Futility: przy głębokości 1 ciche ruchy nie podniosą oceny statycznej do alfy
+        futile = (self.futility_pruning and static_score is not None and depth == 1
+                  and static_score + FUTILITY_MARGIN <= alpha)
+
+        # Na głównym wariancie poprzedniej iteracji pierwszy idzie jego ruch, poza nim ruch z tablicy
+        if ply < len(self.pv) and self.pv[ply][0] == board.hash:
+            hash_move = self.pv[ply][1]
+        else:
+            hash_move = entry[3] if entry else 0
+        legal_moves = self.order_moves(board, legal_moves, ply, color, hash_move)
+        killers = self.killers[ply] if ply < len(self.killers) else ()
 
         best_move = None
-        if is_maximizing:
-            max_eval = -float('inf')
-            for (y1, x1), moves in legal_moves.items():
-                for y2, x2 in moves:
-                    if self.is_time_exceeded():
-                        return max_eval, best_move
-
-                    # Save board state
-                    new_board = copy.deepcopy(board)
-                    
-                    # Make move
-                    if not engine.tryMove(current_color, new_board, y1, x1, y2, x2):
-                        continue
-
-                    # Store last move for pattern detection
-                    new_board.last_move = (y1, x1, y2, x2)
-                    
-                    eval_value, _ = self.minimax(new_board, depth - 1, alpha, beta, False)
-                    if eval_value is None:
-                        continue
-
-                    if eval_value > max_eval:
-                        max_eval = eval_value
-                        best_move = (y1, x1, y2, x2)
-                    alpha = max(alpha, eval_value)
-                    if beta <= alpha:
-                        break
-            return max_eval, best_move
+        # Przy futility wszystkie ciche ruchy mogą zostać pominięte
+        best_score = static_score + FUTILITY_MARGIN if futile else -float('inf')
+        child_pv = []
+        for index, move in enumerate(legal_moves):
+            quiet = move != hash_move and not capture_gain(board, move) and move not in killers
+
+            # Make move (push/pop zamiast kopiowania planszy)
+            previous_last_move = getattr(board, 'last_move', None)
+            board.push(move)
+            stats.nodes += 1
+
+            # Store last move for pattern detection
+            board.last_move = moves.to_cords(move)
+
+            gives_check = quiet and (futile or index >= LMR_MIN_MOVE_INDEX) and board.is_in_check_minimax(opponent_color)
+            if futile and quiet and not gives_check:
+                board.pop()
+                board.last_move = previous_last_move
+                continue
+
+            child_pv.clear()
+            if index == 0:
+                score, _ = self.negamax(board, depth - 1, -beta, -alpha, opponent_color, ply + 1, child_pv)
+            else:
+                score = None
+                if (self.late_move_reductions and quiet and not gives_check and not in_check
+                        and depth >= LMR_MIN_DEPTH and index >= LMR_MIN_MOVE_INDEX):
+                    # Redukcja późnego ruchu: płytsze przeszukanie z zerowym oknem
+                    reduction = 2 if index >= 2 * LMR_MIN_MOVE_INDEX and depth >= 2 * LMR_MIN_DEPTH else 1
+                    score, _ = self.negamax(board, depth - 1 - reduction, -alpha - 1, -alpha, opponent_color,
+                                            ply + 1, child_pv)
+                    if score is not None and -score > alpha:
+                        score = None  # Ruch okazał się lepszy, sprawdzamy go na pełnej głębokości
+                if score is None and not self.stopped:
+                    score, _ = self.negamax(board, depth - 1, -alpha - 1, -alpha, opponent_color, ply + 1, child_pv)
+                    # Zerowe okno przekroczone w węźle z szerszym oknem: ponowne przeszukanie z pełnym oknem
+                    if score is not None and alpha < -score < beta:
+                        child_pv.clear()
+                        score, _ = self.negamax(board, depth - 1, -beta, -alpha, opponent_color, ply + 1, child_pv)
+            board.pop()
+            board.last_move = previous_last_move
+            if score is None:
+                return None, None
+            score = -score
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self.root_best_move = move
+            if score > alpha:
+                alpha = score
+                pv[:] = [(board.hash, move)] + child_pv
+            if alpha >= beta:
+                stats.beta_cutoffs += 1
+                if index == 0:
+                    stats.first_move_cutoffs += 1
+                self.record_cutoff(board, move, ply, depth, color)
+                break
+        self.store_result(board, depth, ply, best_score, best_move, original_alpha, original_beta)
+        return best_score, best_move
+
+    def quiescence(self, board, alpha, beta, color, ply):
+        """
+        Przeszukiwanie stabilizujące: w liściach drzewa sprawdzane są tylko bicia i promocje
+        na hetmana, aż pozycja się uspokoi.
+
+        Strona na ruchu może poprzestać na ocenie statycznej (stand-pat), bo zwykle ma też
+        jakiś cichy ruch. Bicia przegrywające materiał według SEE i bicia, które nawet
+        z zapasem DELTA_MARGIN nie podnoszą oceny do alfy (przycinanie delta), są pomijane.
+        Przy szachu sprawdzane są wszystkie ucieczki, bez oceny statycznej.
+
+        Bez szachu generowane są tylko bicia i promocje (Board.get_capture_list), i to dopiero
+        wtedy, gdy ocena statyczna nie wystarcza do odcięcia. Pat nie jest tu wykrywany.
+
+        Argumenty:
+            board (Board): Obecny stan planszy.
+            alpha (float): Wartość alfa dla przycinania.
+            beta (float): Wartość beta dla przycinania.
+            color (str): Strona na ruchu ('w' lub 'b').
+            ply (int): Odległość od korzenia w półruchach.
+
+        Zwraca:
+            float | None: Ocena pozycji z punktu widzenia strony na ruchu albo None, jeśli
+                wyszukiwanie zostało przerwane.
+        """
+        if self.stopped or self.is_time_exceeded():
+            self.stopped = True
+            return None
+
+        in_check = board.is_in_check_minimax(color)
+        if in_check:
+            legal_moves = board.get_move_list(color)
+            if not legal_moves:
+                return -(MATE_SCORE - ply)  # Mat
+            best_score = -float('inf')
+            candidates = self.order_moves(board, legal_moves, ply, color, 0)
+        else:
+            best_score = self.get_static_score(board, color)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            state = board.board_state
+            scored = []
+            for move in board.get_capture_list(color):
+                flag = move >> 12
+                if flag >= moves.PROMOTION and flag != moves.PROMOTION + 3:
+                    continue  # Słabsze promocje nie zmieniają oceny na tyle, by je sprawdzać
+                gain = capture_gain(board, move)
+                # Przycinanie delta
+                if not gain or best_score + gain + DELTA_MARGIN <= alpha:
+                    continue
+                if see(board, move) < 0:
+                    continue
+                attacker = state[(move & 63) >> 3][move & 7].figure
+                scored.append((10 * gain - evaluation.PIECE_VALUES[attacker.type], move))
+            scored.sort(reverse=True)
+            candidates = [move for _, move in scored]
+
+        opponent_color = 'w' if color == 'b' else 'b'
+        for move in candidates:
+            previous_last_move = getattr(board, 'last_move', None)
+            board.push(move)
+            self.stats.qnodes += 1
+            board.last_move = moves.to_cords(move)
+            score = self.quiescence(board, -beta, -alpha, opponent_color, ply + 1)
+            board.pop()
+            board.last_move = previous_last_move
+            if score is None:
+                return None
+            score = -score
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return best_score
+
+    def order_moves(self, board, legal_moves, ply, color, hash_move):
+        """
+        Sortuje ruchy tak, żeby przycięcia alfa-beta następowały jak najwcześniej.
+
+        Kolejność: ruch z głównego wariantu lub tablicy transpozycji, bicia i promocje na
+        hetmana według MVV-LVA (najcenniejsza ofiara, najtańszy napastnik), dwa ruchy zabójcze
+        z tego samego półruchu, a na końcu ciche ruchy według tablicy historii.
+
+        Argumenty:
+            board (Board): Obecny stan planszy.
+            legal_moves (list[int]): Legalne ruchy (spakowane).
+            ply (int): Odległość od korzenia w półruchach.
+            color (str): Strona na ruchu ('w' lub 'b').
+            hash_move (int): Ruch z głównego wariantu lub tablicy transpozycji albo 0.
+
+        Zwraca:
+            list[int]: Posortowane ruchy.
+        """
+        state = board.board_state
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+        history_offset = 0 if color == 'w' else 4096
+        scored = []
+        for move in legal_moves:
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            else:
+                flag = move >> 12
+                to_sq = (move >> 6) & 63
+                victim = state[to_sq >> 3][to_sq & 7].figure
+                if flag == moves.EN_PASSANT:
+                    victim_value = evaluation.PIECE_VALUES['p']
+                elif victim and flag != moves.CASTLING:
+                    victim_value = evaluation.PIECE_VALUES[victim.type]
+                else:
+                    victim_value = 0
+                if flag == moves.PROMOTION + 3:
+                    victim_value += evaluation.PIECE_VALUES['Q']
+                if victim_value:
+                    from_sq = move & 63
+                    attacker = state[from_sq >> 3][from_sq & 7].figure
+                    score = CAPTURE_SCORE + 10 * victim_value - evaluation.PIECE_VALUES[attacker.type]
+                elif move in killers:
+                    score = KILLER_SCORE - killers.index(move)
+                else:
+                    score = min(history[history_offset + (move & 0xFFF)], KILLER_SCORE - 2)
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def record_cutoff(self, board, move, ply, depth, color):
+        """
+        Zapamiętuje cichy ruch, który spowodował przycięcie: jako ruch zabójczy dla tego
+        półruchu i w tablicy historii (z wagą rosnącą z kwadratem pozostałej głębokości).
+
+        Argumenty:
+            board (Board): Obecny stan planszy (przed ruchem).
+            move (int): Ruch, który spowodował przycięcie.
+            ply (int): Odległość od korzenia w półruchach.
+            depth (int): Pozostała głębokość.
+            color (str): Strona wykonująca ruch ('w' lub 'b').
+        """
+        flag = move >> 12
+        to_sq = (move >> 6) & 63
+        if flag == moves.EN_PASSANT or flag >= moves.PROMOTION:
+            return
+        if flag != moves.CASTLING and board.board_state[to_sq >> 3][to_sq & 7].figure:
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([0, 0])
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[(0 if color == 'w' else 4096) + (move & 0xFFF)] += depth * depth
+
+    def store_result(self, board, depth, ply, score, best_move, alpha, beta):
+        """
+        Zapisuje wynik przeszukania węzła w tablicy transpozycji.
+
+        Wynik nie jest zapisywany, jeśli przeszukanie przerwał limit czasu.
+
+        Argumenty:
+            board (Board): Przeszukana pozycja.
+            depth (int): Głębokość przeszukania.
+            ply (int): Odległość węzła od korzenia w półruchach.
+            score (float): Wynik węzła z punktu widzenia strony na ruchu.
+            best_move (int): Najlepszy znaleziony ruch (spakowany) albo None.
+            alpha (float): Wartość alfa na początku przeszukania węzła.
+            beta (float): Wartość beta na początku przeszukania węzła.
+        """
+        if self.stopped or best_move is None:
+            return
+        if score <= alpha:
+            flag = UPPER_BOUND
+        elif score >= beta:
+            flag = LOWER_BOUND
         else:
-            min_eval = float('inf')
-            for (y1, x1), moves in legal_moves.items():
-                for y2, x2 in moves:
-                    if self.is_time_exceeded():
-                        return min_eval, best_move
-
-                    new_board = copy.deepcopy(board)
-                    if not engine.tryMove(current_color, new_board, y1, x1, y2, x2):
-                        continue
-
-                    # Store last move for pattern detection
-                    new_board.last_move = (y1, x1, y2, x2)
-                    
-                    eval_value, _ = self.minimax(new_board, depth - 1, alpha, beta, True)
-                    if eval_value is None:
-                        continue
-
-                    if eval_value < min_eval:
-                        min_eval = eval_value
-                        best_move = (y1, x1, y2, x2)
-                    beta = min(beta, eval_value)
-                    if beta <= alpha:
-                        break
-            return min_eval, best_move
\ No newline at end of file
+            flag = EXACT
+        self.transposition_table.store(board.hash, depth, score_to_tt(score, ply), flag, best_move)
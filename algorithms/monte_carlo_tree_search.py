@@ -1,178 +1,185 @@
-import copy
 import math
-import algorithms.evaluation as evaluation
-import engine.engine as engine
-import random
-import engine.fen_operations as fen_operations
+import time
+import engine.moves as moves
+from engine.bitboard import BitBoard, WHITE, BLACK, CASTLING, EN_PASSANT
+from algorithms.playout import playout, terminal_result, is_draw, VALUES
+from algorithms.mcts_tree import MctsTree, NO_NODE
 
-class Mcts_optimized: #Niedokończone
+# Stała eksploracji we wzorze UCT
+EXPLORATION = math.sqrt(2)
+
+
+def move_priors(position, move_list):
+    """
+    Wstępne oceny ruchów (0-1): bicia według wartości bitej figury, promocje najwyżej, pozostałe ruchy 0.
+
+    Args:
+        position (BitBoard): Pozycja przed ruchami.
+        move_list (list[int]): Ruchy spakowane (engine.moves).
+
+    Returns:
+        list[float]: Oceny w kolejności ruchów.
+    """
+    squares = position.squares
+    priors = []
+    for move in move_list:
+        flag = move >> 12
+        victim = squares[(move >> 6) & 63]
+        if flag >= moves.PROMOTION:
+            priors.append(1.0)
+        elif flag == EN_PASSANT:
+            priors.append(VALUES[0] / VALUES[4])
+        elif victim >= 0 and flag != CASTLING:
+            priors.append(VALUES[victim % 6] / VALUES[4])
+        else:
+            priors.append(0.0)
+    return priors
+
+
+class Mcts:
     def __init__(self, color):
         """
-        Klasa odpowiadająca za AI posługujące się algorytmem Monte Carlo Tree Search, wariant zmodyfikowany:
-        w fazie symulacji zamiast rozgrywać pełną symulację, ruch jest ewaluowany, a następnie porównywany z wynikiem dla poprzedniego węzła, jeśli jest większy daje to zwycięstwo, jeśli nie, przegraną
+        Klasa odpowiadająca za AI posługujące się algorytmem Monte Carlo Tree Search (UCT).
+
+        Jeden obiekt gra całą partię: drzewo (algorithms.mcts_tree) zostaje między ruchami, a przed
+        każdym wyszukiwaniem korzeniem staje się węzeł pozycji po ruchu komputera i odpowiedzi
+        przeciwnika (jeśli był już w drzewie), razem z symulacjami rozegranymi wcześniej w jego poddrzewie.
 
         color - kolor, którym będzie grało AI
         """
-        self.root = Node(0, 0, "root",(0,0,0,0), color) #Korzeń drzewa
-    def expand_tree(self, board):
-        new_board = copy(board)
-        # Wybór (selection) 
-        current_node = self.root
-        while len(current_node.children) > 0:
-            max_choice_factor = 0
-            chosen_node = self.root
-            for child in current_node.children:
-                choice_factor = (child.wins / child.games) + math.sqrt(2) * math.sqrt(math.log(child.parent.games) / child.games)
-                if choice_factor > max_choice_factor:
-                   choice_factor = max_choice_factor
-                   chosen_node = child
-                   new_board.make_move(*child.move)
-                   new_board.piece_cords.remove(child.move[0],child.move[1])
-                   new_board.piece_cords.append(child.move[2],child.move[3])
-            if current_node == chosen_node:
-                break
-            current_node = chosen_node
-        if current_node.parent != "root":
-            new_board.make_move(*current_node.move)
-            new_board.piece_cords.remove(child.move[0],child.move[1])
-            new_board.piece_cords.append(child.move[2],child.move[3])
-        # Rozrost (expansion)
-        moves=new_board.get_all_moves('b' if current_node.color == "w" else "w")
-        key = random.sample(moves)
-        new_node = Node(0,0,current_node, *key,*moves[key],)
-        current_node.children += new_node
-        # Symulacja (playout)
-        old_score = evaluation.Evaluation(new_board) 
-        fen = fen_operations.board_to_fen_inverted(new_board,current_node.color)
-        new_board.make_move(new_node.move)
-        new_score = evaluation.Evaluation(new_board) 
-        new_board.board_state = fen_operations.fen_to_board_state(fen)
-        new_node.games +=1
-        if new_score > old_score:
-            new_node.wins += 1
-        # Propagacja wsteczna (backpropagation)
-        node = new_node
-        while node.parent != "root":
-            node.parent.games += node.parent.games - node.games
-            node.parent.wins += node.parent.wins - node.wins
-            node = node.parent
+        self.color = color
+        self.tree = MctsTree() #Korzeń drzewa to zawsze pozycja z komputerem na ruchu
+        self.message = ""
+        self.iterations = 0 #Liczba iteracji ostatniego wyszukiwania
 
-class Mcts:
-    def __init__(self, color):
+    def set_root(self, board) -> bool:
         """
-        Klasa odpowiadająca za AI posługujące się algorytmem Monte Carlo Tree Search
+        Ustawia korzeń drzewa na pozycję z planszy, zachowując jej poddrzewo, jeśli pozycja
+        jest w korzeniu albo dwa ruchy pod nim (ruch komputera i odpowiedź przeciwnika).
 
-        color - kolor, którym będzie grało AI
+        Args:
+            board (Board): Pozycja, w której komputer ma ruch.
+
+        Returns:
+            bool: True, jeśli poddrzewo zostało zachowane.
         """
-        self.root = Node(0, 0, "root", (0,0,0,0), "w" if color == "b" else "b") #Korzeń drzewa (kolor korzenia musi być odwrotny, ponieważ zmienia sie on co ruch)
-    def expand_tree(self, board, max_depth):
-        new_board = copy.deepcopy(board)
-        # Wybór (selection) 
-        current_node = self.root
-        while len(current_node.children) > 0:
-            max_choice_factor = -1
-            chosen_node = self.root
-            depth = 0
-            for child in current_node.children:
-                # Liczymy wzór UCT 
-                if child.games > 0 and child.parent.games > 0: 
-                    choice_factor = ((child.wins) / (child.games)) + math.sqrt(2) * math.sqrt(math.log(child.parent.games) / (child.games))
-                else:
-                    choice_factor = float("inf")
-                if choice_factor > max_choice_factor:
-                    choice_factor = max_choice_factor
-                    chosen_node = child
-            engine.tryMove(chosen_node.color, new_board, *chosen_node.move)
-            current_node = chosen_node
-            depth += 1
-            if depth >= max_depth:
-                current_node = self.root
-        # Rozrost (expansion)
-        if current_node.games == 0:
-            self.random_expand(new_board,current_node)
-            current_node = current_node.children[random.randint(0, len(current_node.children))]
-            engine.tryMove(current_node.color, new_board, *current_node.move)
-        # Symulacja (playout)
-        result = (1,1,1)
-        move_color = "w" if current_node.color == "b" else "b"
-        counter = 0
-        while result[0] not in  ["checkmate","stalemate"]:
-            moves = new_board.get_all_moves(move_color)
-            if moves == {}:
-                new_board.is_in_check(move_color)
-                if new_board.incheck:
-                    result = ["checkmate"]
-                    break
-                else:
-                    result = ["stalemate"]
-            key = random.sample(sorted(moves),1)[0]
-            move = random.sample(moves[key],1)[0]
-            cords = (*key, move[0],move[1])
-            engine.tryMove(move_color, new_board, *cords)
-            move_color = 'b' if move_color == "w" else "w"
-            result = engine.afterMove(move_color, new_board, *cords)
-            if result[0] == "promotion":
-                engine.promotion(result[1],result[2],new_board,str(random.randint(1,4)))
-            counter += 1
-        current_node.games +=1
-        if result == "checkmate" and move_color == self.root.color:
-            current_node.wins +=1  
-        # Propagacja wsteczna (backpropagation)
-        while current_node.parent != "root":
-            current_node.parent.games += current_node.games - current_node.parent.games 
-            current_node.parent.wins += current_node.wins - current_node.parent.wins
-            current_node = current_node.parent
-    def pick_best_move(self,board,limit, max_depth):
-        counter = 0
-        while limit > counter:
-            self.expand_tree(board, max_depth)
-            counter += 1
-        max_played_games = 0
-        for child in self.root.children:
-            if child.games > max_played_games:
-                chosen_child = child
-        return chosen_child.move
-    def random_expand(self, board, node):
+        if self.tree.hashes[0] == board.hash:
+            return True
+        node = self.tree.find(board.hash, 2)
+        if node == NO_NODE:
+            self.tree.clear(board.hash)
+            return False
+        self.tree.compact(node)
+        return True
+
+    def select_leaf(self, position):
         """
-        Funkcja powiększająca drzewo, wariant losujący 8 z możliwych dzieci, dzięki czemu znacznie szybszy
+        Wybór i rozrost: schodzi od korzenia do liścia, wykonując ruchy ścieżki na pozycji.
+
+        Args:
+            position (BitBoard): Pozycja w korzeniu drzewa.
+
+        Returns:
+            tuple: (węzły od korzenia do liścia, strona na ruchu w liściu, czy liść jest pozycją końcową)
         """
-        moves = board.get_all_moves('b' if node.color == "w" else "w")
-        for i in range (15):
-            key = random.sample(sorted(moves), 1)[0]
-            move = random.sample(moves[key], 1)[0]
-            new_node = Node(0,0,node, (*key,*move),'b' if node.color == "w" else "w")
-            moves[key].remove(move)
-            if moves[key] == []:
-                moves.pop(key)
-            node.children += [new_node]
-            if moves == {}:
+        tree = self.tree
+        node = 0
+        path = [0]
+        turn = self.color
+        while True:
+            if not tree.is_expanded(node):
+                # Liść bez symulacji - symulacja zaczyna się w nim
+                if node and tree.visits[node] == 0:
+                    break
+                # Rozrost (expansion) - wszystkie dzieci naraz; pozycja remisowa jest węzłem końcowym
+                move_list = [] if is_draw(position) else position.get_move_list(turn)
+                tree.expand(node, move_list, move_priors(position, move_list))
+            if not tree.child_count[node]:
+                # Węzeł końcowy (mat, pat albo remis) albo pełna pula węzłów drzewa współdzielonego
                 break
-    def whole_expand(self, board, node):
+            # Wybór (selection)
+            node = tree.select_child(node, EXPLORATION)
+            position.push(int(tree.moves[node]))
+            if not tree.hashes[node]:
+                tree.hashes[node] = position.hash
+            path.append(node)
+            turn = "w" if turn == "b" else "b"
+        return path, turn, tree.is_expanded(node)
+
+    def evaluate_leaf(self, position, path, turn, terminal, max_depth):
         """
-        Funkcja powiększająca drzewo, wariant uwzględniający wszystkie możliwości UWAGA: Obciąża komputer
+        Symulacja w liściu ze ścieżki select_leaf; cofa ruchy ścieżki na pozycji.
+
+        Args:
+            position (BitBoard): Pozycja w liściu.
+            path (list[int]): Węzły od korzenia do liścia.
+            turn (str): Strona na ruchu w liściu.
+            terminal (bool): Czy liść jest pozycją końcową (mat, pat albo remis).
+            max_depth (int): Maksymalna liczba ruchów symulacji.
+
+        Returns:
+            float: Wynik z perspektywy strony, która wykonała ruch liścia (przeciwnej do turn).
         """
-        moves = board.get_all_moves('b' if node.color == "w" else "w")
-        for key in moves:
-            for move in moves[key]:
-                new_node = Node(0,0,node, (*key,*move),'b' if node.color == "w" else "w")
-                node.children += [new_node]
-                
-class Node:
-    def __init__(self, games:int, wins:int, parent, move:tuple, color:str, ):
+        if terminal:
+            result = terminal_result(position, WHITE if turn == "w" else BLACK)
+        else:
+            # Symulacja (playout)
+            result = playout(position, max_depth)
+        for _ in range(len(path) - 1):
+            position.pop()
+        return result if turn == "b" else 1 - result
+
+    def expand_tree(self, position, max_depth):
         """
-            Klasa reprezentująca węzły drzewa \n
-            Args:
-                games(int) - zmienna przechowująca ilość rozegranych symulacji w poddrzewie danego węzła.
-                wins(int) - zmienna przechowująca ilość wygranych symulacji w poddrzewie danego węzła.
-                parent - rodzic danego węzła.
-                move(tuple) - ruch, który dany węzeł przechowuje.
-                children - lista dzieci danego węzła.
-                color - kolor ruchu, który przechowuje węzęł
+        Jedna iteracja MCTS: wybór, rozrost, symulacja i propagacja wsteczna.
+        Pozycja jest zmieniana przez push i przywracana przez pop.
+
+        Args:
+            position (BitBoard): Pozycja w korzeniu drzewa.
+            max_depth (int): Maksymalna liczba ruchów symulacji.
         """
-        self.games = games
-        self.wins = wins
-        self.parent = parent
-        self.move = move
-        self.children = []
-        self.color = color
+        path, turn, terminal = self.select_leaf(position)
+        # Propagacja wsteczna (backpropagation)
+        self.tree.backpropagate(path, self.evaluate_leaf(position, path, turn, terminal, max_depth))
 
+    def root_statistics(self):
+        """
+        Zwraca statystyki ruchów w korzeniu jako listę (ruch, liczba symulacji, suma wyników).
+        """
+        tree = self.tree
+        return [(int(tree.moves[child]), int(tree.visits[child]), float(tree.wins[child])) for child in tree.children(0)]
+
+    def pick_best_move(self, board, time_limit, max_depth, stop_event=None):
+        """
+        Przeszukuje drzewo przez time_limit sekund i wybiera ruch.
+
+        Args:
+            board (Board): Pozycja, w której komputer ma ruch (nie jest zmieniana).
+            time_limit (float): Czas na wyszukiwanie w sekundach.
+            max_depth (int): Maksymalna liczba ruchów symulacji (algorithms.playout).
+            stop_event (Event, opcjonalnie): Zdarzenie przerywające wyszukiwanie.
+
+        Returns:
+            int: Ruch z największą liczbą symulacji (spakowany, engine.moves) albo None, jeśli nie ma legalnych ruchów.
+        """
+        start_time = time.time()
+        reused = self.set_root(board)
+        reused_games = self.tree.visits[0]
+        position = BitBoard.from_board(board, self.color)
+        deadline = start_time + time_limit
+        iterations = 0
+        while (iterations == 0 or time.time() < deadline) and not (stop_event and stop_event.is_set()):
+            self.expand_tree(position, max_depth)
+            iterations += 1
+            if not self.tree.child_count[0]:
+                break
+        self.iterations = iterations
+        best = self.tree.best_child(0)
+        if best == NO_NODE:
+            return None
+        games = self.tree.visits[best]
+        self.message = (f"Simulations: {iterations} (+{reused_games} reused)" if reused else f"Simulations: {iterations}")
+        self.message += f"\nTree nodes: {len(self.tree)}"
+        self.message += f"\nTime: {time.time() - start_time:.3f}s"
+        self.message += f"\nBest move: {moves.to_uci(self.tree.moves[best])} ({games} games, {self.tree.wins[best] / max(games, 1):.1%})"
+        return int(self.tree.moves[best])
@@ -0,0 +1,159 @@
+"""
+Moduł zawiera równoległe Monte Carlo Tree Search w kilku procesach.
+
+Zrównoleglenie w korzeniu: każdy proces buduje własne drzewo od tej samej pozycji (z innym
+ziarnem losowania), a proces główny sumuje liczby symulacji i wyniki ruchów w korzeniu ze
+wszystkich drzew. Wybierany jest ruch z największą sumą symulacji. Procesy nie wymieniają
+danych w trakcie wyszukiwania.
+
+Zrównoleglenie drzewa: procesy rozwijają jedno drzewo w pamięci współdzielonej
+(mcts_tree.SharedMctsTree). Wybór ścieżki z rozwinięciem oraz propagacja wsteczna odbywają się
+pod wspólną blokadą, a symulacja poza nią. Węzły ścieżki dostają na czas symulacji wirtualną
+stratę (VIRTUAL_LOSS przegranych), więc pozostałe procesy wybierają w tym czasie inne ścieżki.
+
+W obu wariantach wyszukiwanie przerywa stop_event (jak MonteCarloThread.stop), a drzewa nie są
+zachowywane między ruchami.
+"""
+import random
+import time
+from multiprocessing import Process, Queue, Event, Lock
+from queue import Empty
+
+import engine.moves as moves
+from engine.bitboard import BitBoard
+from algorithms.monte_carlo_tree_search import Mcts
+from algorithms.mcts_tree import SharedMctsTree
+
+# Liczba wirtualnych przegranych dodawanych ścieżce na czas symulacji
+VIRTUAL_LOSS = 1
+# Pojemność puli węzłów drzewa współdzielonego (ok. 50 MB)
+NODE_POOL_SIZE = 1 << 20
+# Dodatkowy czas (s) na odpowiedź procesów po upływie limitu, zanim zostaną zatrzymane
+STOP_GRACE = 1.0
+
+
+def _root_worker(board, color, time_limit, max_depth, seed, stop_event, result_queue):
+    """
+    Funkcja procesu zrównoleglenia w korzeniu: buduje własne drzewo i odsyła
+    (statystyki ruchów w korzeniu, liczba iteracji).
+    """
+    random.seed(seed)
+    mcts = Mcts(color)
+    mcts.pick_best_move(board, time_limit, max_depth, stop_event)
+    result_queue.put((mcts.root_statistics(), mcts.iterations))
+
+
+def _tree_worker(board, color, time_limit, max_depth, seed, tree, lock, stop_event, result_queue):
+    """
+    Funkcja procesu zrównoleglenia drzewa: rozwija drzewo współdzielone i odsyła
+    (None, liczba iteracji).
+    """
+    random.seed(seed)
+    mcts = Mcts(color)
+    mcts.tree = tree
+    position = BitBoard.from_board(board, color)
+    deadline = time.time() + time_limit
+    iterations = 0
+    while time.time() < deadline and not stop_event.is_set():
+        with lock:
+            path, turn, terminal = mcts.select_leaf(position)
+            tree.add_virtual_loss(path, VIRTUAL_LOSS)
+        result = mcts.evaluate_leaf(position, path, turn, terminal, max_depth)
+        with lock:
+            tree.backpropagate(path, result, VIRTUAL_LOSS)
+        iterations += 1
+        if tree.is_expanded(0) and not tree.child_count[0]:
+            break
+    result_queue.put((None, iterations))
+
+
+def merge_root_statistics(parts: list[list[tuple]]) -> list[tuple]:
+    """
+    Sumuje statystyki ruchów w korzeniu z kilku drzew.
+
+    Args:
+        parts (list): Listy (ruch, liczba symulacji, suma wyników) z kolejnych drzew.
+
+    Returns:
+        list: (ruch, suma symulacji, suma wyników) w kolejności pierwszego wystąpienia ruchu.
+    """
+    merged = {}
+    for statistics in parts:
+        for move, games, wins in statistics:
+            total = merged.setdefault(move, [0, 0.0])
+            total[0] += games
+            total[1] += wins
+    return [(move, games, wins) for move, (games, wins) in merged.items()]
+
+
+def parallel_mcts_move(board, color, time_limit, max_depth, workers, tree_parallel=False, stop_event=None):
+    """
+    Wyszukuje ruch algorytmem MCTS w kilku procesach.
+
+    Args:
+        board (Board): Pozycja, w której komputer ma ruch.
+        color (str): Kolor komputera ('w' lub 'b').
+        time_limit (float): Czas na wyszukiwanie w sekundach.
+        max_depth (int): Maksymalna liczba ruchów symulacji.
+        workers (int): Liczba procesów.
+        tree_parallel (bool, opcjonalnie): Jedno drzewo we wspólnej pamięci zamiast osobnych drzew.
+        stop_event (Event, opcjonalnie): Zdarzenie (także threading.Event) przerywające wyszukiwanie.
+
+    Returns:
+        tuple: (ruch z największą liczbą symulacji albo None, wiadomość debugowa)
+    """
+    start_time = time.time()
+    worker_stop = Event()
+    result_queue = Queue()
+    if tree_parallel:
+        tree = SharedMctsTree(NODE_POOL_SIZE, board.hash)
+        lock = Lock()
+        processes = [Process(target=_tree_worker,
+                             args=(board, color, time_limit, max_depth, random.getrandbits(32), tree, lock,
+                                   worker_stop, result_queue),
+                             daemon=True)
+                     for _ in range(workers)]
+    else:
+        processes = [Process(target=_root_worker,
+                             args=(board, color, time_limit, max_depth, random.getrandbits(32),
+                                   worker_stop, result_queue),
+                             daemon=True)
+                     for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    replies = []
+    try:
+        while len(replies) < len(processes):
+            if stop_event is not None and stop_event.is_set():
+                worker_stop.set()
+            try:
+                replies.append(result_queue.get(timeout=0.05))
+            except Empty:
+                if time.time() > start_time + time_limit + STOP_GRACE:
+                    worker_stop.set()
+                if not any(process.is_alive() for process in processes) and result_queue.empty():
+                    break  # Proces zakończył się bez odpowiedzi
+    finally:
+        worker_stop.set()
+        for process in processes:
+            process.join(timeout=STOP_GRACE)
+            if process.is_alive():
+                process.terminate()
+
+    mode = "tree" if tree_parallel else "root"
+    message = f"🧵 Parallel MCTS ({mode}): {len(processes)} workers"
+    if stop_event is not None and stop_event.is_set():
+        return None, message
+    if tree_parallel:
+        statistics = [(int(tree.moves[child]), int(tree.visits[child]), float(tree.wins[child])) for child in tree.children(0)]
+        message += f"\nTree nodes: {len(tree)}"
+    else:
+        statistics = merge_root_statistics([reply[0] for reply in replies])
+    if not statistics:
+        return None, message
+    move, games, wins = max(statistics, key=lambda entry: entry[1])
+    message += f"\nSimulations: {sum(reply[1] for reply in replies)}"
+    message += f"\nTime: {time.time() - start_time:.3f}s"
+    message += f"\nBest move: {moves.to_uci(move)} ({games} games, {wins / max(games, 1):.1%})"
+    return move, message
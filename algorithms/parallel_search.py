@@ -0,0 +1,271 @@
+"""
+Moduł zawiera równoległe przeszukiwanie drzewa gry w kilku procesach (podział ruchów w korzeniu).
+
+Legalne ruchy w korzeniu są porządkowane (bicia od najcenniejszej ofiary, potem kolejność
+generatora) i rozdzielane po kolei między procesy, więc każdy proces dostaje podobną
+mieszankę ruchów. Każdy proces ma własny obiekt Minimax z root_moves, a więc własną tablicę
+transpozycji, ruchy zabójcze i historię, które przechodzą między iteracjami.
+
+Iteracje są prowadzone przez proces główny. Najpierw proces, do którego należy najlepszy ruch
+poprzedniej iteracji, liczy jego dokładny wynik (w oknie aspiracji). Potem wszystkie procesy
+równolegle sprawdzają pozostałe ruchy z tym wynikiem jako alfą: ruchy gorsze są odrzucane
+tanio, a dokładny wynik liczą tylko te, które go przekraczają. Najlepszy jest ruch z najwyższą
+oceną, a przy remisie wcześniejszy w kolejności ruchów w korzeniu. Procesy nie wymieniają się
+granicą alfa w trakcie iteracji, więc wynik nie zależy od tego, który proces skończy szybciej.
+"""
+import os
+import time
+from multiprocessing import Process, Queue, Event
+from queue import Empty
+
+import engine.moves as moves
+from algorithms.minimax import Minimax, MATE_THRESHOLD, ASPIRATION_WINDOW, MAX_ASPIRATION_WINDOW
+from algorithms.static_exchange import capture_gain
+from algorithms.time_manager import TimeManager
+from algorithms.search_stats import SearchStats
+
+# Dodatkowy czas (s) na odpowiedź procesów po upływie limitu, zanim zostaną zatrzymane
+STOP_GRACE = 1.0
+
+
+def default_workers() -> int:
+    """
+    Zwraca domyślną liczbę procesów: liczbę rdzeni procesora.
+    """
+    return os.cpu_count() or 1
+
+
+def split_root_moves(board, color: str, workers: int) -> tuple[list[int], list[list[int]]]:
+    """
+    Porządkuje ruchy w korzeniu i rozdziela je między procesy.
+
+    Args:
+        board (Board): Pozycja w korzeniu.
+        color (str): Strona na ruchu ('w' lub 'b').
+        workers (int): Liczba procesów.
+
+    Returns:
+        tuple: (ruchy w ustalonej kolejności, lista niepustych grup ruchów - po jednej na proces)
+    """
+    legal_moves = board.get_move_list(color)
+    # Sortowanie stabilne, więc kolejność nie zależy od niczego poza pozycją
+    root_order = sorted(legal_moves, key=lambda move: -capture_gain(board, move))
+    groups = [root_order[index::workers] for index in range(workers)]
+    return root_order, [group for group in groups if group]
+
+
+def merge_results(results: list[tuple], root_order: list[int]) -> tuple:
+    """
+    Wybiera najlepszy z dokładnych wyników iteracji.
+
+    Args:
+        results (list): Dokładne wyniki (wynik, ruch, główny wariant, ...).
+        root_order (list[int]): Ruchy w korzeniu w ustalonej kolejności.
+
+    Returns:
+        tuple: Wynik z najwyższą oceną; przy remisie ten z ruchem wcześniejszym w root_order.
+    """
+    return max(results, key=lambda result: (result[0], -root_order.index(result[1])))
+
+
+def _search_worker(index, board, color, time_limit, tt_size_mb, pruning, stop_event, task_queue, result_queue):
+    """
+    Funkcja procesu roboczego: przeszukuje ruchy w korzeniu na zlecenie procesu głównego.
+
+    Zadania (głębokość, alfa, beta, ruchy w korzeniu) przychodzą przez `task_queue`, None kończy
+    pracę. Odpowiedzi trafiają do `result_queue` jako (indeks procesu, (wynik, ruch, główny wariant,
+    statystyki procesu od jego startu)) albo (indeks procesu, None), jeśli przeszukanie zostało przerwane.
+    """
+    searcher = Minimax(board, 0, color, time_limit, tt_size_mb, pruning=pruning, use_book=False, stop_event=stop_event)
+    searcher.time_manager.start()
+    searcher.transposition_table.new_search()
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        depth, alpha, beta, searcher.root_moves = task
+        pv = []
+        score, move = searcher.negamax(searcher.main_board, depth, alpha, beta, color, 0, pv)
+        if searcher.stopped or score is None:
+            result_queue.put((index, None))
+            break
+        if pv and pv[0][1] == move:
+            # Główny wariant procesu porządkuje ruchy w kolejnym zadaniu
+            searcher.pv = pv
+        result_queue.put((index, (score, move, pv, searcher.stats)))
+
+
+def _run_tasks(tasks: dict, task_queues: list, result_queue, processes: list, deadline: float, stop_event) -> dict:
+    """
+    Wysyła zadania do procesów i odbiera odpowiedzi.
+
+    Args:
+        tasks (dict): {indeks procesu: (głębokość, alfa, beta, ruchy w korzeniu)}.
+
+    Returns:
+        dict | None: {indeks procesu: (wynik, ruch, główny wariant, statystyki)} albo None, jeśli
+            przeszukanie zostało przerwane.
+    """
+    for index, task in tasks.items():
+        task_queues[index].put(task)
+    replies = {}
+    while len(replies) < len(tasks):
+        try:
+            index, reply = result_queue.get(timeout=0.1)
+        except Empty:
+            if time.time() > deadline + STOP_GRACE:
+                stop_event.set()
+            if not any(process.is_alive() for process in processes) and result_queue.empty():
+                return None  # Proces zakończył się bez odpowiedzi
+            continue
+        if reply is None:
+            return None
+        replies[index] = reply
+    return replies
+
+
+def parallel_best_move(board, depth, color, time_limit, workers, tt_size_mb=16, pruning=None, stop_event=None,
+                       time_manager=None):
+    """
+    Wyszukuje najlepszy ruch, dzieląc ruchy w korzeniu między kilka procesów.
+
+    Args:
+        board (Board): Obiekt planszy szachowej.
+        depth (int): Maksymalna głębokość przeszukiwania.
+        color (str): Kolor gracza ('w' lub 'b').
+        time_limit (float): Limit czasu na obliczenia w sekundach.
+        workers (int): Liczba procesów roboczych.
+        tt_size_mb (float): Rozmiar tablicy transpozycji każdego procesu w megabajtach.
+        pruning (dict, opcjonalnie): Włączone techniki przycinania (jak w Minimax).
+        stop_event (Event, opcjonalnie): Zdarzenie multiprocessing przerywające wyszukiwanie.
+        time_manager (TimeManager, opcjonalnie): Przydział czasu z zegara partii; procesy robocze
+            dostają jego twardy limit, a miękki decyduje o kolejnych iteracjach.
+
+    Returns:
+        tuple: Najlepszy ruch (spakowany, engine.moves), wiadomość debugowa, lista ruchów z książki
+            debiutów i statystyki (suma liczników procesów) - tak jak Minimax.get_best_move.
+    """
+    start_time = time.time()
+    stats = SearchStats()
+    stats.start()
+    time_manager = time_manager or TimeManager.fixed(time_limit)
+    time_manager.start()
+    # Procesy robocze przerywają przeszukiwanie po twardym limicie
+    time_limit = time_manager.hard_limit
+    deadline = start_time + time_limit
+    # Książka debiutów jest sprawdzana raz, w procesie głównym
+    book = Minimax(board, depth, color, time_limit, tt_size_mb=1)
+    book_move = book.get_opening_move()
+    if book_move:
+        book.message += f"\n✨ Using book move: {moves.to_uci(book_move)}"
+        return book_move, book.message, book.available_moves_from_json, stats
+
+    root_order, groups = split_root_moves(board, color, max(1, workers))
+    message = book.message + f"\n🧵 Parallel search: {len(groups)} workers, {len(root_order)} root moves"
+    if not root_order:
+        return None, message, [], stats
+    if len(root_order) == 1:
+        message += f"\n⚡ Forced move: {moves.to_uci(root_order[0])}"
+        return root_order[0], message, [], stats
+    owner = {move: index for index, group in enumerate(groups) for move in group}
+
+    stop_event = stop_event or Event()
+    result_queue = Queue()
+    task_queues = [Queue() for _ in groups]
+    processes = [
+        Process(target=_search_worker,
+                args=(index, board, color, time_limit, tt_size_mb, pruning, stop_event, task_queues[index], result_queue),
+                daemon=True)
+        for index in range(len(groups))
+    ]
+    for process in processes:
+        process.start()
+
+    worker_stats = {}  # Ostatnie statystyki każdego procesu
+
+    def run(tasks):
+        replies = _run_tasks(tasks, task_queues, result_queue, processes, deadline, stop_event)
+        for index, reply in (replies or {}).items():
+            worker_stats[index] = reply[3]
+        return replies
+
+    best = None  # (głębokość, wynik, ruch, główny wariant) z ostatniej ukończonej iteracji
+    try:
+        for current_depth in range(1, depth + 1):
+            if best is not None and not time_manager.can_start_iteration():
+                message += f"\n⏱️ Time budget used after depth {best[0]}"
+                break
+            depth_start = time.time()
+            if best is None:
+                # Pierwsza iteracja: każdy proces przeszukuje swoje ruchy z pełnym oknem
+                replies = run({index: (current_depth, -float('inf'), float('inf'), group)
+                               for index, group in enumerate(groups)})
+                if replies is None:
+                    message += f"\n⚠️ Time limit reached at depth {current_depth}"
+                    break
+                merged = merge_results(list(replies.values()), root_order)
+            else:
+                # Faza 1: ruch z głównego wariantu, w oknie aspiracji wokół poprzedniego wyniku
+                previous_score, pv_move = best[1], best[2]
+                delta = ASPIRATION_WINDOW
+                if abs(previous_score) >= MATE_THRESHOLD:
+                    alpha, beta = -float('inf'), float('inf')
+                else:
+                    alpha, beta = previous_score - delta, previous_score + delta
+                while True:
+                    replies = run({owner[pv_move]: (current_depth, alpha, beta, [pv_move])})
+                    if replies is None:
+                        break
+                    pv_result = replies[owner[pv_move]]
+                    if alpha < pv_result[0] < beta:
+                        break
+                    delta *= 4
+                    if pv_result[0] <= alpha:
+                        alpha = previous_score - delta if delta < MAX_ASPIRATION_WINDOW else -float('inf')
+                    else:
+                        beta = previous_score + delta if delta < MAX_ASPIRATION_WINDOW else float('inf')
+                if replies is None:
+                    message += f"\n⚠️ Time limit reached at depth {current_depth}"
+                    break
+                # Faza 2: pozostałe ruchy muszą tylko pokonać dokładny wynik ruchu z głównego wariantu
+                tasks = {}
+                for index, group in enumerate(groups):
+                    rest = [move for move in group if move != pv_move]
+                    if rest:
+                        tasks[index] = (current_depth, pv_result[0], float('inf'), rest)
+                replies = run(tasks) if tasks else {}
+                if replies is None:
+                    message += f"\n⚠️ Time limit reached at depth {current_depth}"
+                    break
+                merged = merge_results([pv_result] + [reply for reply in replies.values() if reply[0] > pv_result[0]],
+                                       root_order)
+            score, move, pv = merged[:3]
+            best = (current_depth, score, move, pv)
+            time_manager.update(move, score)
+            stats.absorb(list(worker_stats.values()))
+            stats.end_iteration(current_depth)
+            message += f"\n📊 Depth {current_depth}:"
+            message += f"\n   Move: {moves.to_uci(move)}"
+            message += f"\n   PV: {' '.join(moves.to_uci(pv_move) for _, pv_move in pv)}"
+            message += f"\n   Score: {score:.2f}"
+            message += f"\n   Time: {time.time() - depth_start:.3f}s"
+    finally:
+        stop_event.set()
+        for task_queue in task_queues:
+            task_queue.put(None)
+        for process in processes:
+            process.join(timeout=STOP_GRACE)
+            if process.is_alive():
+                process.terminate()
+
+    best_move = best[2] if best else root_order[0]
+    message += f"\n=== Search Complete ==="
+    message += f"\n🕒 Total time: {time.time() - start_time:.3f}s"
+    message += f"\n📈 Max depth reached: {best[0] if best else 0}"
+    message += f"\n💫 Final best move: {moves.to_uci(best_move)}"
+    if best:
+        message += f"\n📋 Final score: {best[1]:.2f}"
+    stats.absorb(list(worker_stats.values()))
+    stats.finish()
+    message += "\n" + stats.summary()
+    return best_move, message, [], stats
@@ -0,0 +1,139 @@
+"""
+Moduł zawiera szybkie symulacje (playout) dla Monte Carlo Tree Search na pozycji BitBoard.
+
+Symulacja nie korzysta z engine.tryMove ani engine.afterMove: nie buduje notacji, nie zapisuje
+historii FEN i nie generuje wszystkich legalnych ruchów. W każdym ruchu generowane są ruchy
+pseudolegalne, a legalność jest sprawdzana dopiero dla wylosowanego ruchu (po wykonaniu król
+nie może stać pod biciem). Z prawdopodobieństwem CAPTURE_BIAS ruch jest losowany najpierw
+spośród bić, co przybliża sensowną grę przy znikomym koszcie.
+
+Symulacja kończy się matem, patem, remisem z braku materiału albo z reguły 50 ruchów, a po
+limicie ruchów wynik jest liczony z przewagi materiału. Pozycja jest na koniec przywracana.
+"""
+import math
+import random
+
+from engine.bitboard import COLORS, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, CASTLING, EN_PASSANT
+from algorithms.evaluation import PIECE_VALUES
+
+# Wyniki symulacji z perspektywy białych
+WIN, DRAW, LOSS = 1.0, 0.5, 0.0
+
+# Prawdopodobieństwo, że ruch jest losowany najpierw spośród bić
+CAPTURE_BIAS = 0.75
+# Liczba półruchów bez bicia i ruchu pionkiem, po której partia kończy się remisem
+FIFTY_MOVE_LIMIT = 100
+# Przewaga materiału (w jednostkach evaluation.PIECE_VALUES), przy której symulacja przerwana po limicie ruchów
+# liczy się jako wygrana w około 73% (funkcja logistyczna)
+MATERIAL_SCALE = 400
+
+# Wartości figur według typu z engine.bitboard (król się nie liczy)
+VALUES = tuple(PIECE_VALUES[piece_type] for piece_type in ('p', 'N', 'B', 'R', 'Q')) + (0,)
+
+
+def is_draw(position) -> bool:
+    """
+    Sprawdza remis z reguły 50 ruchów albo z braku materiału (same króle i najwyżej jedna lekka figura).
+
+    Args:
+        position (BitBoard): Pozycja.
+    """
+    if position.halfmove_clock >= FIFTY_MOVE_LIMIT:
+        return True
+    pieces = position.pieces
+    if pieces[PAWN] | pieces[ROOK] | pieces[QUEEN] | pieces[6 + PAWN] | pieces[6 + ROOK] | pieces[6 + QUEEN]:
+        return False
+    return (pieces[KNIGHT] | pieces[BISHOP] | pieces[6 + KNIGHT] | pieces[6 + BISHOP]).bit_count() <= 1
+
+
+def terminal_result(position, side: int) -> float:
+    """
+    Zwraca wynik pozycji końcowej (bez legalnych ruchów albo remisowej) z perspektywy białych.
+
+    Args:
+        position (BitBoard): Pozycja.
+        side (int): Strona na ruchu (WHITE lub BLACK).
+
+    Returns:
+        float: LOSS albo WIN przy macie, DRAW przy pacie i remisie.
+    """
+    if not is_draw(position) and position.is_in_check_minimax(COLORS[side]):
+        return LOSS if side == WHITE else WIN
+    return DRAW
+
+
+def material_result(position) -> float:
+    """
+    Zamienia przewagę materiału białych na wynik 0-1 (funkcja logistyczna).
+
+    Args:
+        position (BitBoard): Pozycja.
+    """
+    pieces = position.pieces
+    balance = 0
+    for piece_type in range(KING):
+        balance += VALUES[piece_type] * (pieces[piece_type].bit_count() - pieces[6 + piece_type].bit_count())
+    return 1 / (1 + math.exp(-balance / MATERIAL_SCALE))
+
+
+def _play_legal(position, side: int, candidates: list) -> bool:
+    """
+    Wykonuje losowy legalny ruch z listy ruchów pseudolegalnych; sprawdzone ruchy są z niej usuwane.
+
+    Returns:
+        bool: True, jeśli ruch został wykonany.
+    """
+    while candidates:
+        index = random.randrange(len(candidates))
+        move = candidates[index]
+        candidates[index] = candidates[-1]
+        candidates.pop()
+        position._make(move)
+        king_sq = position.king_square(side)
+        if king_sq < 0 or not position.square_attacked(king_sq, side ^ 1):
+            return True
+        position._unmake()
+    return False
+
+
+def playout(position, max_plies: int) -> float:
+    """
+    Rozgrywa losową partię od pozycji, najwyżej max_plies półruchów, i przywraca pozycję.
+
+    Args:
+        position (BitBoard): Pozycja początkowa symulacji.
+        max_plies (int): Limit półruchów.
+
+    Returns:
+        float: Wynik z perspektywy białych (0-1).
+    """
+    side = WHITE if position.turn == 'w' else BLACK
+    played = 0
+    result = None
+    squares = position.squares
+    while played < max_plies:
+        if is_draw(position):
+            result = DRAW
+            break
+        pseudo_legal = position.generate_pseudo_legal(side)
+        if random.random() < CAPTURE_BIAS:
+            captures = []
+            quiet = []
+            for move in pseudo_legal:
+                if (squares[move[1]] >= 0 and move[3] != CASTLING) or move[3] == EN_PASSANT:
+                    captures.append(move)
+                else:
+                    quiet.append(move)
+            moved = _play_legal(position, side, captures) or _play_legal(position, side, quiet)
+        else:
+            moved = _play_legal(position, side, pseudo_legal)
+        if not moved:
+            result = terminal_result(position, side)
+            break
+        played += 1
+        side ^= 1
+    if result is None:
+        result = material_result(position)
+    for _ in range(played):
+        position._unmake()
+    return result
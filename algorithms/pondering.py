@@ -0,0 +1,177 @@
+"""
+Moduł zawiera stały proces wyszukiwania Minimax z myśleniem w czasie przeciwnika (ponder).
+
+Proces żyje przez całą partię i używa tablicy transpozycji zachowywanej między ruchami
+(Minimax z keep_tt), więc każde kolejne przeszukanie zaczyna z wynikami poprzednich. Po ruchu
+komputera proces od razu przeszukuje pozycję po przewidywanej odpowiedzi przeciwnika (drugi
+ruch głównego wariantu). Jeśli przeciwnik zagra ten ruch, przeszukanie trwa dalej już w limicie
+czasu komputera (a zwykle jest gotowe od razu). W przeciwnym razie jest przerywane, a proces
+przeszukuje właściwą pozycję - z tablicą transpozycji wypełnioną podczas myślenia.
+
+Każde zadanie ma numer; wyniki zadań przerwanych albo anulowanych są pomijane.
+"""
+import copy
+import time
+from multiprocessing import Process, Queue, Event
+from queue import Empty
+
+import engine.moves as moves
+from algorithms.minimax import Minimax
+from algorithms.time_manager import TimeManager
+
+
+def _search_loop(depth, max_time, min_time, tt_size_mb, pruning, commands, results, stop_event, ponderhit_event):
+    """
+    Funkcja procesu: wykonuje kolejne zadania z `commands` do otrzymania None.
+
+    Zadanie to (numer, plansza, kolor, czas na zegarze, numer ruchu, czy myślenie w czasie przeciwnika).
+    Wynik trafia do `results` jako (numer, (ruch, wiadomość debugowa, ruchy z książki, statystyki),
+    przewidywana odpowiedź przeciwnika albo None).
+    """
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+        job, board, color, remaining_time, move_number, pondering = command
+        # Zdarzenia ustawione dla poprzednich zadań
+        stop_event.clear()
+        ponderhit_event.clear()
+        search_start = time.time()
+        time_manager = TimeManager(remaining_time, move_number, max_time=max_time)
+        if pondering:
+            time_manager.ponder(ponderhit_event)
+        searcher = Minimax(board, depth, color, max_time, tt_size_mb, keep_tt=True, pruning=pruning,
+                           stop_event=stop_event, time_manager=time_manager)
+        all_info = searcher.get_best_move()
+        if all_info is None:
+            all_info = (None, searcher.message, [], searcher.stats)
+        prediction = searcher.pv[1][1] if len(searcher.pv) > 1 and searcher.pv[0][1] == all_info[0] else None
+        if not pondering:
+            # Minimalny czas ruchu, najwyżej do miękkiego limitu przydziału
+            wait = min(min_time, time_manager.soft_limit) - (time.time() - search_start)
+            if wait > 0:
+                time.sleep(wait)
+        results.put((job, all_info, prediction))
+
+
+class PonderingSearch:
+    """
+    Stały proces wyszukiwania Minimax dla jednej partii, myślący w czasie przeciwnika.
+
+    Args:
+        job (int): Numer bieżącego zadania; wyniki innych zadań są pomijane.
+        ponder_hash (int): Odcisk Zobrista pozycji, nad którą proces myśli (None - nie myśli).
+        prediction (int): Przewidywana odpowiedź przeciwnika z ostatniego wyniku.
+    """
+
+    def __init__(self, depth, max_time, min_time, tt_size_mb=16, pruning=None):
+        """
+        Uruchamia proces wyszukiwania.
+
+        Args:
+            depth (int): Maksymalna głębokość przeszukiwania.
+            max_time (float): Górna granica czasu na ruch (s).
+            min_time (float): Minimalny czas ruchu (s), jak w ustawieniach AI.
+            tt_size_mb (float): Rozmiar tablicy transpozycji w megabajtach.
+            pruning (dict, opcjonalnie): Włączone techniki przycinania (jak w Minimax).
+        """
+        self.commands = Queue()
+        self.results = Queue()
+        self.stop_event = Event()
+        self.ponderhit_event = Event()
+        self.job = 0
+        self.ponder_hash = None
+        self.prediction = None
+        self.process = Process(
+            target=_search_loop,
+            args=(depth, max_time, min_time, tt_size_mb, pruning, self.commands, self.results,
+                  self.stop_event, self.ponderhit_event),
+            daemon=True
+        )
+        self.process.start()
+
+    def search(self, board, color, remaining_time, move_number) -> bool:
+        """
+        Zaczyna wyszukiwanie ruchu albo, jeśli przeciwnik zagrał przewidywany ruch, przejmuje
+        trwające myślenie w czasie przeciwnika.
+
+        Args:
+            board (Board): Pozycja, w której komputer ma ruch.
+            color (str): Kolor komputera ('w' lub 'b').
+            remaining_time (float): Czas pozostały na zegarze komputera (s).
+            move_number (int): Numer ruchu w partii.
+
+        Returns:
+            bool: True, jeśli wynik pochodzi z myślenia w czasie przeciwnika (ponderhit).
+        """
+        if self.ponder_hash is not None:
+            hit = board.hash == self.ponder_hash
+            self.ponder_hash = None
+            if hit:
+                self.ponderhit_event.set()
+                return True
+            self.stop_event.set()
+        self.job += 1
+        self.commands.put((self.job, copy.deepcopy(board), color, remaining_time, move_number, False))
+        return False
+
+    def ponder(self, board, color, remaining_time, move_number) -> bool:
+        """
+        Zaczyna myślenie nad pozycją po przewidywanej odpowiedzi przeciwnika.
+
+        Args:
+            board (Board): Pozycja po ruchu komputera.
+            color (str): Kolor komputera ('w' lub 'b').
+            remaining_time (float): Czas pozostały na zegarze komputera (s).
+            move_number (int): Numer ruchu komputera w pozycji po odpowiedzi przeciwnika.
+
+        Returns:
+            bool: True, jeśli myślenie się zaczęło (znana jest przewidywana odpowiedź).
+        """
+        if not self.prediction:
+            return False
+        expected = copy.deepcopy(board)
+        expected.push(moves.to_tuple(self.prediction))
+        self.ponder_hash = expected.hash
+        self.prediction = None
+        self.job += 1
+        self.commands.put((self.job, expected, color, remaining_time, move_number, True))
+        return True
+
+    def poll(self) -> tuple:
+        """
+        Odbiera wynik bieżącego zadania bez czekania.
+
+        Returns:
+            tuple | None: (ruch, wiadomość debugowa, ruchy z książki, statystyki) albo None, jeśli wynik
+                nie jest jeszcze gotowy (albo proces myśli w czasie przeciwnika).
+        """
+        if self.ponder_hash is not None:
+            return None
+        while True:
+            try:
+                job, all_info, prediction = self.results.get_nowait()
+            except Empty:
+                return None
+            if job == self.job:
+                self.prediction = prediction
+                return all_info
+
+    def cancel(self) -> None:
+        """
+        Przerywa bieżące wyszukiwanie albo myślenie (np. przy cofnięciu ruchu); jego wynik zostanie pominięty.
+        """
+        self.stop_event.set()
+        self.ponder_hash = None
+        self.prediction = None
+        self.job += 1
+
+    def close(self) -> None:
+        """
+        Kończy proces wyszukiwania.
+        """
+        self.cancel()
+        self.commands.put(None)
+        self.process.join(timeout=0.5)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -0,0 +1,140 @@
+"""
+Moduł zawiera statystyki przeszukiwania drzewa gry.
+
+Liczniki są zwykłymi atrybutami zwiększanymi przez Minimax w trakcie przeszukiwania:
+węzły głównego przeszukiwania (pozycje po ruchu w negamax, także ruchu zerowym), węzły
+przeszukiwania stabilizującego (pozycje po ruchu w quiescence), odcięcia beta (w tym
+odcięcia na pierwszym ruchu, które mierzą jakość porządkowania ruchów) oraz zapytania
+i trafienia w tablicy transpozycji. Po każdej ukończonej iteracji pogłębiania zapisywana
+jest liczba węzłów, więc efektywny współczynnik rozgałęzienia (EBF) to stosunek węzłów
+kolejnych iteracji.
+
+Obiekt da się przesłać między procesami (multiprocessing), więc procesy robocze
+przeszukiwania równoległego odsyłają swoje liczniki do procesu głównego.
+"""
+import time
+
+
+class SearchStats:
+    """
+    Statystyki jednego przeszukiwania.
+
+    Args:
+        nodes (int): Węzły głównego przeszukiwania.
+        qnodes (int): Węzły przeszukiwania stabilizującego.
+        beta_cutoffs (int): Odcięcia beta w głównym przeszukiwaniu.
+        first_move_cutoffs (int): Odcięcia beta na pierwszym ruchu z listy.
+        tt_probes (int): Zapytania do tablicy transpozycji.
+        tt_hits (int): Zapytania, dla których pozycja była w tablicy.
+        iterations (list): Ukończone iteracje jako (głębokość, węzły w iteracji, czas iteracji w s).
+        elapsed (float): Czas przeszukiwania w sekundach (po finish()).
+    """
+
+    def __init__(self):
+        """
+        Tworzy wyzerowane statystyki.
+        """
+        self.nodes = 0
+        self.qnodes = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.iterations = []
+        self.start_time = None
+        self.elapsed = 0.0
+        self._iteration_nodes = 0
+        self._iteration_start = None
+
+    def start(self) -> None:
+        """
+        Zaczyna pomiar czasu przeszukiwania.
+        """
+        self.start_time = self._iteration_start = time.time()
+
+    def total_nodes(self) -> int:
+        """
+        Zwraca liczbę wszystkich węzłów (główne przeszukiwanie i stabilizujące).
+        """
+        return self.nodes + self.qnodes
+
+    def end_iteration(self, depth: int) -> None:
+        """
+        Zapisuje ukończoną iterację pogłębiania.
+
+        Args:
+            depth (int): Głębokość iteracji.
+        """
+        now = time.time()
+        total = self.total_nodes()
+        self.iterations.append((depth, total - self._iteration_nodes, now - (self._iteration_start or now)))
+        self._iteration_nodes = total
+        self._iteration_start = now
+
+    def finish(self) -> None:
+        """
+        Kończy pomiar czasu przeszukiwania.
+        """
+        if self.start_time:
+            self.elapsed = time.time() - self.start_time
+
+    def absorb(self, parts: list) -> None:
+        """
+        Ustawia liczniki na sumę liczników z kilku procesów (przeszukiwanie równoległe).
+
+        Args:
+            parts (list[SearchStats]): Statystyki procesów roboczych od początku przeszukiwania.
+        """
+        self.nodes = sum(part.nodes for part in parts)
+        self.qnodes = sum(part.qnodes for part in parts)
+        self.beta_cutoffs = sum(part.beta_cutoffs for part in parts)
+        self.first_move_cutoffs = sum(part.first_move_cutoffs for part in parts)
+        self.tt_probes = sum(part.tt_probes for part in parts)
+        self.tt_hits = sum(part.tt_hits for part in parts)
+
+    @property
+    def nps(self) -> float:
+        """
+        Węzły na sekundę (wszystkie węzły przez czas przeszukiwania).
+        """
+        elapsed = self.elapsed or (time.time() - self.start_time if self.start_time else 0.0)
+        return self.total_nodes() / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Część odcięć beta, które nastąpiły na pierwszym ruchu (0-1).
+        """
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """
+        Część zapytań do tablicy transpozycji zakończonych trafieniem (0-1).
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def branching_factors(self) -> list[tuple[int, float]]:
+        """
+        Zwraca efektywny współczynnik rozgałęzienia dla kolejnych iteracji.
+
+        Returns:
+            list: (głębokość, węzły iteracji / węzły poprzedniej iteracji) od drugiej iteracji.
+        """
+        return [(depth, nodes / previous)
+                for (_, previous, _), (depth, nodes, _) in zip(self.iterations, self.iterations[1:]) if previous]
+
+    def summary(self) -> str:
+        """
+        Zwraca statystyki jako kilka linii tekstu (do wiadomości debugowej i widoku dla nerdów).
+        """
+        lines = [
+            f"Nodes: {self.nodes} (+{self.qnodes} quiescence)",
+            f"NPS: {self.nps:.0f}",
+            f"Beta cutoffs: {self.beta_cutoffs}, first move: {self.first_move_cutoff_rate:.1%}",
+            f"TT: {self.tt_hits}/{self.tt_probes} hits ({self.tt_hit_rate:.1%})",
+        ]
+        factors = self.branching_factors()
+        if factors:
+            lines.append("EBF: " + ", ".join(f"d{depth} {factor:.2f}" for depth, factor in factors))
+        return "\n".join(lines)
@@ -0,0 +1,115 @@
+"""
+Moduł zawiera statyczną ocenę wymiany (SEE) dla planszy Board.
+
+SEE szacuje bilans materiału sekwencji bić na jednym polu: po każdym biciu kolejna strona
+bije najtańszą figurą, która atakuje pole, albo rezygnuje, jeśli bicie by jej się nie opłaciło.
+Figury, które już wzięły udział w wymianie, są traktowane jak zdjęte z planszy, więc ataki
+przez nie (np. wieża za wieżą) są uwzględniane. Związania i szachy są pomijane.
+"""
+import engine.moves as moves
+from engine.attack_tables import KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACKER_SQUARES, DIAGONAL_RAYS, STRAIGHT_RAYS
+from algorithms.evaluation import PIECE_VALUES
+
+
+def capture_gain(board, move: int) -> int:
+    """
+    Zwraca materiał zdobyty bezpośrednio przez ruch: wartość zbitej figury i zysk z promocji.
+
+    Args:
+        board (Board): Pozycja przed ruchem.
+        move (int): Spakowany ruch (engine.moves).
+
+    Returns:
+        int: Zysk materiału; 0 dla cichych ruchów (także roszady).
+    """
+    flag = move >> 12
+    if flag == moves.CASTLING:
+        return 0
+    if flag == moves.EN_PASSANT:
+        return PIECE_VALUES['p']
+    to_sq = (move >> 6) & 63
+    victim = board.board_state[to_sq >> 3][to_sq & 7].figure
+    gain = PIECE_VALUES[victim.type] if victim else 0
+    if flag >= moves.PROMOTION:
+        gain += PIECE_VALUES[moves.PROMOTION_PIECES[flag - moves.PROMOTION]] - PIECE_VALUES['p']
+    return gain
+
+
+def _least_valuable_attacker(state, y: int, x: int, color: str, removed: set) -> tuple:
+    """
+    Wyszukuje najtańszą figurę koloru color atakującą pole (y, x).
+
+    Args:
+        state (list): board_state planszy.
+        y (int): Wiersz pola.
+        x (int): Kolumna pola.
+        color (str): Kolor atakującego ('w' lub 'b').
+        removed (set): Pola (y, x) figur, które już zbiły w tej wymianie.
+
+    Returns:
+        tuple | None: (pole (y, x), typ figury) albo None, jeśli pole nie jest atakowane.
+    """
+    defender = 'b' if color == 'w' else 'w'
+    for cord in PAWN_ATTACKER_SQUARES[defender][y][x]:
+        figure = state[cord[0]][cord[1]].figure
+        if figure and figure.type == 'p' and figure.color == color and cord not in removed:
+            return cord, 'p'
+    for cord in KNIGHT_SQUARES[y][x]:
+        figure = state[cord[0]][cord[1]].figure
+        if figure and figure.type == 'N' and figure.color == color and cord not in removed:
+            return cord, 'N'
+    # Figury dalekobieżne: pierwsza figura na każdym promieniu, z pominięciem zdjętych
+    best = None
+    for rays, attackers in ((DIAGONAL_RAYS[y][x], 'BQ'), (STRAIGHT_RAYS[y][x], 'RQ')):
+        for ray in rays:
+            for cord in ray:
+                figure = state[cord[0]][cord[1]].figure
+                if not figure or cord in removed:
+                    continue
+                if figure.color == color and figure.type in attackers:
+                    if best is None or PIECE_VALUES[figure.type] < PIECE_VALUES[best[1]]:
+                        best = cord, figure.type
+                break
+    if best and best[1] != 'Q':
+        return best
+    for cord in KING_SQUARES[y][x]:
+        figure = state[cord[0]][cord[1]].figure
+        if figure and figure.type == 'K' and figure.color == color and cord not in removed:
+            # Król bije ostatni, hetman przed nim
+            return best or (cord, 'K')
+    return best
+
+
+def see(board, move: int) -> int:
+    """
+    Statyczna ocena wymiany rozpoczętej ruchem.
+
+    Args:
+        board (Board): Pozycja przed ruchem.
+        move (int): Spakowany ruch (engine.moves), zwykle bicie.
+
+    Returns:
+        int: Przewidywany bilans materiału dla strony wykonującej ruch (ujemny dla bić przegrywających materiał).
+    """
+    state = board.board_state
+    y1, x1, y2, x2, flag = moves.decode(move)
+    attacker = state[y1][x1].figure
+    color = 'b' if attacker.color == 'w' else 'w'
+    gains = [capture_gain(board, move)]
+    # Figura stojąca na polu po ostatnim biciu (po promocji - nowa figura)
+    on_square = moves.PROMOTION_PIECES[flag - moves.PROMOTION] if flag >= moves.PROMOTION else attacker.type
+    removed = {(y1, x1)}
+    while True:
+        found = _least_valuable_attacker(state, y2, x2, color, removed)
+        if found is None:
+            break
+        cord, piece_type = found
+        # Bilans strony bijącej, jeśli po jej biciu wymiana się skończy
+        gains.append(PIECE_VALUES[on_square] - gains[-1])
+        removed.add(cord)
+        on_square = piece_type
+        color = 'b' if color == 'w' else 'w'
+    # Każda strona może przerwać wymianę, jeśli dalsze bicie jest dla niej gorsze
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
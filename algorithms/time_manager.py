@@ -0,0 +1,188 @@
+"""
+Moduł zawiera zarządzanie czasem na ruch komputera.
+
+Czas na ruch jest liczony z czasu pozostałego na zegarze, numeru ruchu i dodatku za ruch.
+Miękki limit decyduje, czy zaczynać kolejną iterację pogłębiania, i zmienia się z jej
+wynikami: gdy najlepszy ruch się nie zmienia, limit maleje, a gdy zmienia się albo ocena
+spada, rośnie (najwyżej do twardego limitu). Twardy limit przerywa przeszukiwanie w trakcie
+iteracji. Zegar jest odczytywany tylko co CHECK_INTERVAL wywołań hard_limit_reached, więc
+przeszukiwanie może sprawdzać limit w każdym węźle.
+
+Przy myśleniu w czasie przeciwnika (ponder) limity nie obowiązują, dopóki przeciwnik nie
+zagra przewidywanego ruchu (ponderhit_event). Od tej chwili liczy się twardy limit, a miękki
+jest pomniejszany o czas już poświęcony na tę pozycję.
+"""
+import time
+
+# Liczba sprawdzeń twardego limitu między odczytami zegara
+CHECK_INTERVAL = 256
+
+# Zakładana długość partii (w ruchach) i najmniejsza liczba ruchów, na które dzielimy zegar
+EXPECTED_GAME_LENGTH = 50
+MIN_MOVES_TO_GO = 20
+
+# Część dodatku za ruch, którą można wydać od razu
+INCREMENT_SHARE = 0.75
+# Twardy limit: najwyżej tyle razy miękki limit i najwyżej taka część pozostałego czasu
+HARD_LIMIT_RATIO = 4.0
+HARD_LIMIT_SHARE = 0.25
+# Zapas czasu (s) na komunikację z procesem i wykonanie ruchu
+MOVE_OVERHEAD = 0.1
+
+# Skalowanie miękkiego limitu: za każdą iterację z tym samym ruchem i przy spadku oceny
+STABILITY_STEP = 0.1
+MAX_STABILITY = 4
+SCORE_DROP_MARGIN = 50
+SCORE_DROP_FACTOR = 1.5
+
+
+class TimeManager:
+    """
+    Przydział czasu na jeden ruch: miękki i twardy limit liczone od start().
+
+    Args:
+        soft_limit (float): Czas (s), po którym nie zaczyna się kolejnej iteracji.
+        hard_limit (float): Czas (s), po którym przeszukiwanie jest przerywane.
+        stop_event (Event): Zdarzenie, którego ustawienie działa jak przekroczenie twardego limitu.
+    """
+
+    def __init__(self, remaining_time: float, move_number: int = 1, increment: float = 0.0,
+                 max_time: float = None, stop_event=None):
+        """
+        Liczy limity z czasu na zegarze.
+
+        Args:
+            remaining_time (float): Czas pozostały na zegarze strony na ruchu (s).
+            move_number (int, opcjonalnie): Numer ruchu w partii (od 1).
+            increment (float, opcjonalnie): Dodatek czasu za ruch (s).
+            max_time (float, opcjonalnie): Górna granica czasu na ruch, np. z ustawień AI.
+            stop_event (Event, opcjonalnie): Zdarzenie przerywające przeszukiwanie.
+        """
+        available = max(0.0, remaining_time - MOVE_OVERHEAD)
+        moves_to_go = max(MIN_MOVES_TO_GO, EXPECTED_GAME_LENGTH - move_number)
+        soft = min(available / moves_to_go + increment * INCREMENT_SHARE, available * HARD_LIMIT_SHARE)
+        hard = max(soft, min(soft * HARD_LIMIT_RATIO, available * HARD_LIMIT_SHARE + increment * INCREMENT_SHARE))
+        if max_time is not None:
+            soft = min(soft, max_time)
+            hard = min(hard, max_time)
+        self.soft_limit = soft
+        self.hard_limit = hard
+        self.stop_event = stop_event
+        self.start_time = None
+        self.ponderhit_event = None
+        self.pondering = False
+        self._reset()
+
+    @classmethod
+    def fixed(cls, time_limit: float, stop_event=None) -> "TimeManager":
+        """
+        Tworzy przydział ze stałym limitem (miękki równy twardemu), jak przy time_limit w Minimax.
+
+        Args:
+            time_limit (float): Limit czasu na ruch (s); 100 ms zapasu jest odejmowane.
+            stop_event (Event, opcjonalnie): Zdarzenie przerywające przeszukiwanie.
+        """
+        manager = cls(time_limit, stop_event=stop_event)
+        manager.soft_limit = manager.hard_limit = max(0.0, time_limit - MOVE_OVERHEAD)
+        return manager
+
+    def _reset(self) -> None:
+        """
+        Zeruje stan przydziału: przekroczenie limitu i historię wyników iteracji.
+        """
+        self.expired = False
+        self.countdown = CHECK_INTERVAL
+        self.best_move = None
+        self.best_score = None
+        self.stability = 0
+        self.scale = 1.0
+
+    def start(self) -> None:
+        """
+        Zaczyna odliczanie (na początku przeszukiwania).
+        """
+        self.start_time = time.time()
+        self._reset()
+
+    def ponder(self, ponderhit_event) -> None:
+        """
+        Przełącza przydział w tryb myślenia w czasie przeciwnika: limity obowiązują dopiero
+        po ustawieniu ponderhit_event.
+
+        Args:
+            ponderhit_event (Event): Zdarzenie ustawiane, gdy przeciwnik zagrał przewidywany ruch.
+        """
+        self.ponderhit_event = ponderhit_event
+        self.pondering = True
+
+    def _check_ponderhit(self) -> bool:
+        """
+        Kończy myślenie w czasie przeciwnika po ustawieniu ponderhit_event.
+
+        Returns:
+            bool: True, jeśli przydział nadal czeka na ruch przeciwnika.
+        """
+        if not self.ponderhit_event.is_set():
+            return True
+        now = time.time()
+        # Czas myślenia w czasie przeciwnika zastępuje część miękkiego limitu
+        self.soft_limit = max(0.0, self.soft_limit - (now - self.start_time if self.start_time else 0.0))
+        self.start_time = now
+        self.pondering = False
+        return False
+
+    def elapsed(self) -> float:
+        """
+        Zwraca czas (s) od start() albo 0, jeśli odliczanie się nie zaczęło.
+        """
+        return time.time() - self.start_time if self.start_time else 0.0
+
+    def hard_limit_reached(self) -> bool:
+        """
+        Sprawdza twardy limit i stop_event; zegar jest odczytywany co CHECK_INTERVAL wywołań.
+
+        Returns:
+            bool: True po przekroczeniu limitu (także w każdym kolejnym wywołaniu).
+        """
+        if self.expired:
+            return True
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = CHECK_INTERVAL
+        if self.stop_event is not None and self.stop_event.is_set():
+            self.expired = True
+        elif self.pondering and self._check_ponderhit():
+            return False
+        else:
+            self.expired = self.start_time is not None and time.time() - self.start_time >= self.hard_limit
+        return self.expired
+
+    def can_start_iteration(self) -> bool:
+        """
+        Sprawdza, czy zacząć kolejną iterację: czas nie przekroczył miękkiego limitu
+        (przeskalowanego stabilnością wyników) i nie ustawiono stop_event.
+        """
+        if self.expired or (self.stop_event is not None and self.stop_event.is_set()):
+            return False
+        if self.pondering and self._check_ponderhit():
+            return True
+        return self.elapsed() < min(self.hard_limit, self.soft_limit * self.scale)
+
+    def update(self, move: int, score: float) -> None:
+        """
+        Uwzględnia wynik ukończonej iteracji w miękkim limicie.
+
+        Args:
+            move (int): Najlepszy ruch iteracji.
+            score (float): Ocena najlepszego ruchu (z perspektywy strony na ruchu).
+        """
+        if move == self.best_move:
+            self.stability = min(self.stability + 1, MAX_STABILITY)
+        else:
+            self.stability = 0
+        self.scale = 1.0 - STABILITY_STEP * self.stability
+        if self.best_score is not None and score < self.best_score - SCORE_DROP_MARGIN:
+            self.scale *= SCORE_DROP_FACTOR
+        self.best_move = move
+        self.best_score = score
@@ -0,0 +1,119 @@
+"""
+Moduł zawiera tablicę transpozycji dla przeszukiwania drzewa gry.
+
+Tablica zapamiętuje wyniki przeszukania pozycji (głębokość, ocenę, rodzaj ograniczenia
+i najlepszy ruch) pod odciskiem Zobrista, więc pozycja osiągnięta inną kolejnością ruchów
+albo w kolejnej iteracji pogłębiania nie jest liczona od nowa.
+
+Pamięć jest przydzielana raz, w tablicach modułu array, więc rozmiar w MB jest stały
+niezależnie od liczby zapisów. Każdy indeks ma dwa kubełki: pierwszy zachowuje wynik
+z największej głębokości (zastępowany przez głębsze wyniki albo wpisy z poprzednich
+wyszukiwań), drugi jest zastępowany zawsze.
+"""
+from array import array
+
+# Rodzaje ograniczenia oceny
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Bajty na wpis: klucz (8), ocena (8) i spakowane dane (8)
+ENTRY_BYTES = 24
+
+# Układ spakowanych danych: ruch (16 bitów), ograniczenie (2), głębokość (8), generacja (8)
+_FLAG_SHIFT = 16
+_DEPTH_SHIFT = 18
+_GENERATION_SHIFT = 26
+
+
+class TranspositionTable:
+    """
+    Tablica transpozycji o stałym rozmiarze, indeksowana odciskiem Zobrista.
+
+    Args:
+        size_mb (float): Rozmiar tablicy w megabajtach.
+    """
+
+    def __init__(self, size_mb: float = 16):
+        """
+        Przydziela pamięć na tablicę.
+
+        Args:
+            size_mb (float): Rozmiar tablicy w megabajtach (górny limit; liczba wpisów jest
+                zaokrąglana w dół do potęgi dwójki).
+        """
+        self.size_mb = size_mb
+        buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        # Liczba indeksów jest potęgą dwójki, żeby indeks liczyć maską
+        self.size = 1 << (buckets.bit_length() - 1)
+        self.mask = self.size - 1
+        self.keys = array('Q', [0]) * (2 * self.size)
+        self.scores = array('d', [0.0]) * (2 * self.size)
+        self.data = array('Q', [0]) * (2 * self.size)
+        self.generation = 0
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy.
+        """
+        self.keys = array('Q', [0]) * (2 * self.size)
+        self.scores = array('d', [0.0]) * (2 * self.size)
+        self.data = array('Q', [0]) * (2 * self.size)
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """
+        Rozpoczyna nowe wyszukiwanie. Wpisy z poprzednich wyszukiwań mogą być nadpisane
+        w kubełku głębokości niezależnie od ich głębokości.
+        """
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key: int) -> tuple:
+        """
+        Wyszukuje wpis dla pozycji.
+
+        Args:
+            key (int): Odcisk Zobrista pozycji.
+
+        Returns:
+            tuple | None: (głębokość, ocena, ograniczenie, ruch) albo None, jeśli pozycji nie ma w tablicy.
+        """
+        index = (key & self.mask) << 1
+        keys = self.keys
+        if keys[index] != key:
+            index += 1
+            if keys[index] != key:
+                return None
+        data = self.data[index]
+        return (data >> _DEPTH_SHIFT) & 0xFF, self.scores[index], (data >> _FLAG_SHIFT) & 3, data & 0xFFFF
+
+    def store(self, key: int, depth: int, score: float, flag: int, move: int) -> None:
+        """
+        Zapisuje wynik przeszukania pozycji.
+
+        Args:
+            key (int): Odcisk Zobrista pozycji.
+            depth (int): Głębokość przeszukania.
+            score (float): Ocena pozycji.
+            flag (int): Rodzaj ograniczenia (EXACT, LOWER_BOUND lub UPPER_BOUND).
+            move (int): Najlepszy ruch (spakowany, engine.moves) albo 0, jeśli nie jest znany.
+        """
+        base = (key & self.mask) << 1
+        keys = self.keys
+        data = self.data
+        if not move:
+            # Bez nowego ruchu zostawiamy poprzednio zapisany (z któregokolwiek kubełka)
+            if keys[base] == key:
+                move = data[base] & 0xFFFF
+            elif keys[base + 1] == key:
+                move = data[base + 1] & 0xFFFF
+        stored = data[base]
+        index = base
+        if not (keys[base] == key or depth >= (stored >> _DEPTH_SHIFT) & 0xFF
+                or stored >> _GENERATION_SHIFT != self.generation):
+            # Kubełek głębokości zatrzymuje głębszy wynik z bieżącego wyszukiwania
+            index += 1
+        keys[index] = key
+        self.scores[index] = score
+        data[index] = (move | (flag << _FLAG_SHIFT) | (min(depth, 0xFF) << _DEPTH_SHIFT)
+                       | (self.generation << _GENERATION_SHIFT))
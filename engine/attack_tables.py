@@ -0,0 +1,95 @@
+"""
+Moduł zawiera tablice ataków liczone raz, przy imporcie.
+
+Dla każdego pola przechowywane są pola atakowane przez skoczka i króla, pola, z których
+pionek danego koloru może bić to pole, oraz promienie dla figur dalekobieżnych uporządkowane
+od najbliższego pola. Tablice występują w dwóch postaciach: jako listy współrzędnych (y, x)
+dla Board oraz jako maski bitowe dla BitBoard. Pole o współrzędnych (y, x) ma numer y*8 + x.
+"""
+
+WHITE = 0
+BLACK = 1
+
+# Kierunki (dy, dx), pierwsze cztery są ukośne, kolejne cztery proste
+DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL_DIRECTIONS = (0, 1, 2, 3)
+STRAIGHT_DIRECTIONS = (4, 5, 6, 7)
+KNIGHT_OFFSETS = ((2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2))
+
+
+def _on_board(y: int, x: int) -> bool:
+    """
+    Sprawdza, czy współrzędne leżą na szachownicy.
+    """
+    return 0 <= y < 8 and 0 <= x < 8
+
+
+def _build_square_tables():
+    """
+    Buduje tablice ataków w postaci krotek współrzędnych (y, x), indeksowane [y][x].
+
+    Returns:
+        tuple: (pola skoczka, pola króla, pola pionków bijących {kolor obrońcy: [y][x]},
+            promienie ukośne, promienie proste)
+    """
+    knight = [[() for _ in range(8)] for _ in range(8)]
+    king = [[() for _ in range(8)] for _ in range(8)]
+    # Pionek bijący pole białej figury stoi wiersz wyżej, czarnej - wiersz niżej
+    pawn = {'w': [[() for _ in range(8)] for _ in range(8)], 'b': [[() for _ in range(8)] for _ in range(8)]}
+    diagonal = [[() for _ in range(8)] for _ in range(8)]
+    straight = [[() for _ in range(8)] for _ in range(8)]
+    for y in range(8):
+        for x in range(8):
+            knight[y][x] = tuple((y + dy, x + dx) for dy, dx in KNIGHT_OFFSETS if _on_board(y + dy, x + dx))
+            king[y][x] = tuple((y + dy, x + dx) for dy, dx in DIRECTIONS if _on_board(y + dy, x + dx))
+            for color, dy in (('w', 1), ('b', -1)):
+                pawn[color][y][x] = tuple((y + dy, x + dx) for dx in (-1, 1) if _on_board(y + dy, x + dx))
+            rays = []
+            for dy, dx in DIRECTIONS:
+                ray = []
+                distance = 1
+                while _on_board(y + dy * distance, x + dx * distance):
+                    ray.append((y + dy * distance, x + dx * distance))
+                    distance += 1
+                rays.append(tuple(ray))
+            # Puste promienie (przy krawędzi) są pomijane, żeby pętle ich nie odwiedzały
+            diagonal[y][x] = tuple(ray for ray in rays[:4] if ray)
+            straight[y][x] = tuple(ray for ray in rays[4:] if ray)
+    return knight, king, pawn, diagonal, straight
+
+
+def _build_bit_tables():
+    """
+    Buduje tablice ataków skoczka, króla i pionków oraz promienie dla figur dalekobieżnych jako maski bitowe.
+
+    Returns:
+        tuple: (ataki skoczka, ataki króla, ataki pionków [kolor][pole], promienie [kierunek][pole])
+    """
+    knight = [0] * 64
+    king = [0] * 64
+    pawn = [[0] * 64, [0] * 64]
+    rays = [[0] * 64 for _ in DIRECTIONS]
+    for y in range(8):
+        for x in range(8):
+            sq = y * 8 + x
+            for dy, dx in KNIGHT_OFFSETS:
+                if _on_board(y + dy, x + dx):
+                    knight[sq] |= 1 << ((y + dy) * 8 + x + dx)
+            for d, (dy, dx) in enumerate(DIRECTIONS):
+                if _on_board(y + dy, x + dx):
+                    king[sq] |= 1 << ((y + dy) * 8 + x + dx)
+                distance = 1
+                while _on_board(y + dy * distance, x + dx * distance):
+                    rays[d][sq] |= 1 << ((y + dy * distance) * 8 + x + dx * distance)
+                    distance += 1
+            for color, dy in ((WHITE, 1), (BLACK, -1)):
+                for dx in (-1, 1):
+                    if _on_board(y + dy, x + dx):
+                        pawn[color][sq] |= 1 << ((y + dy) * 8 + x + dx)
+    return knight, king, pawn, rays
+
+
+KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACKER_SQUARES, DIAGONAL_RAYS, STRAIGHT_RAYS = _build_square_tables()
+KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, RAYS = _build_bit_tables()
+# Czy kierunek zwiększa numer pola (wtedy najbliższy bloker to najmłodszy bit)
+POSITIVE_DIRECTION = tuple(dy * 8 + dx > 0 for dy, dx in DIRECTIONS)
@@ -0,0 +1,790 @@
+"""
+Moduł zawiera reprezentację pozycji opartą na bitboardach.
+
+Pozycja jest przechowywana jako 12 liczb całkowitych (po jednej na każdy typ i kolor figury),
+w których bit o numerze y*8 + x oznacza zajęte pole. Układ współrzędnych jest taki sam jak w
+Board: y = 0 to pierwsza linia białych, a x = 0 to kolumna h. Klasa zachowuje kontrakt metod
+get_all_moves, get_move_list, get_legal_moves, is_attacked oraz get_piece z Board, więc może
+ją zastąpić (np. w engine.perft).
+
+Przez wspólne API (get_move_list i push/pop ze spakowanymi ruchami) generowanie ruchów nie jest
+wyraźnie szybsze niż w Board, które wyznacza legalność z szachów i związań, a generate_legal
+sprawdza każdy ruch pseudolegalny przez _make/_unmake. Z klasy korzystają symulacje MCTS
+(algorithms.playout), które losują jeden ruch pseudolegalny i sprawdzają tylko jego. Minimax
+zostaje przy Board: ocena pozycji, SEE i sortowanie ruchów czytają figury z board_state.
+"""
+from engine.attack_tables import (WHITE, BLACK, DIAGONAL_DIRECTIONS, STRAIGHT_DIRECTIONS,
+                                  KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, RAYS, POSITIVE_DIRECTION)
+from engine.zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
+
+COLORS = ('w', 'b')
+
+# Kolejność typów figur, indeks figury to kolor * 6 + typ
+PIECE_TYPES = ('p', 'N', 'B', 'R', 'Q', 'K')
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Flagi ruchów
+NORMAL = 0
+DOUBLE_PUSH = 1
+EN_PASSANT = 2
+CASTLING = 3
+
+# Prawa do roszady: K - krótka białych, Q - długa białych, k i q - analogicznie dla czarnych
+CASTLE_WK = 1
+CASTLE_WQ = 2
+CASTLE_BK = 4
+CASTLE_BQ = 8
+CASTLING_LETTERS = ((CASTLE_WK, 'K'), (CASTLE_WQ, 'Q'), (CASTLE_BK, 'k'), (CASTLE_BQ, 'q'))
+
+# Maski praw do roszady, które pozostają po ruchu z danego pola lub na dane pole
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[3] &= ~(CASTLE_WK | CASTLE_WQ)
+CASTLING_MASK[0] &= ~CASTLE_WK
+CASTLING_MASK[7] &= ~CASTLE_WQ
+CASTLING_MASK[59] &= ~(CASTLE_BK | CASTLE_BQ)
+CASTLING_MASK[56] &= ~CASTLE_BK
+CASTLING_MASK[63] &= ~CASTLE_BQ
+
+# prawo: (pole króla, pole wieży, cel króla, cel wieży, pola do opróżnienia, pola nieatakowane)
+CASTLING_RULES = {
+    CASTLE_WK: (3, 0, 1, 2, (1 << 1) | (1 << 2), (3, 2, 1)),
+    CASTLE_WQ: (3, 7, 5, 4, (1 << 4) | (1 << 5) | (1 << 6), (3, 4, 5)),
+    CASTLE_BK: (59, 56, 57, 58, (1 << 57) | (1 << 58), (59, 58, 57)),
+    CASTLE_BQ: (59, 63, 61, 60, (1 << 60) | (1 << 61) | (1 << 62), (59, 60, 61)),
+}
+
+
+def _sliding_attacks(sq: int, occupied: int, directions: tuple) -> int:
+    """
+    Zwraca pola atakowane przez figurę dalekobieżną z uwzględnieniem blokujących figur.
+
+    Args:
+        sq (int): Numer pola figury.
+        occupied (int): Bitboard wszystkich figur.
+        directions (tuple): Indeksy kierunków z engine.attack_tables.DIRECTIONS.
+
+    Returns:
+        int: Bitboard atakowanych pól.
+    """
+    attacks = 0
+    for d in directions:
+        ray = RAYS[d][sq]
+        blockers = ray & occupied
+        if blockers:
+            if POSITIVE_DIRECTION[d]:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= RAYS[d][blocker]
+        attacks |= ray
+    return attacks
+
+
+def square_name(sq: int) -> str:
+    """
+    Zwraca nazwę pola w notacji szachowej (np. "e4").
+
+    Args:
+        sq (int): Numer pola.
+
+    Returns:
+        str: Nazwa pola.
+    """
+    return chr(104 - sq % 8) + str(sq // 8 + 1)
+
+
+def _cords(field) -> tuple:
+    """
+    Zwraca współrzędne (y, x) z obiektu pola lub krotki.
+    """
+    if isinstance(field, tuple):
+        return field
+    return field.y, field.x
+
+
+class BitBoard:
+    """
+    Klasa reprezentująca pozycję szachową zapisaną w bitboardach.
+
+    Args:
+        fen (str, opcjonalnie): Pozycja w notacji FEN (domyślnie pozycja początkowa).
+    """
+    def __init__(self, fen: str = START_FEN):
+        """
+        Inicjalizuje pozycję na podstawie FEN.
+
+        Args:
+            fen (str, opcjonalnie): Pozycja w notacji FEN.
+        """
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.squares = [-1] * 64
+        self.turn = 'w'
+        self.castling = 0
+        self.ep_square = -1
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.incheck = False
+        self.history = []
+        self.hash = 0
+        self.set_fen(fen)
+
+    @classmethod
+    def from_board(cls, board, turn: str):
+        """
+        Tworzy pozycję na podstawie obiektu Board.
+
+        Prawa do roszady są odczytywane z flag has_moved, a pole en passant z flag can_enpassant pionków.
+
+        Args:
+            board (Board): Obiekt planszy szachowej.
+            turn (str): Kolor strony wykonującej ruch ('w' lub 'b').
+
+        Returns:
+            BitBoard: Nowa pozycja.
+        """
+        position = cls.__new__(cls)
+        position.pieces = [0] * 12
+        position.occupancy = [0, 0]
+        position.squares = [-1] * 64
+        position.turn = turn
+        position.castling = 0
+        position.ep_square = -1
+        position.halfmove_clock = board.halfmove_clock
+        position.fullmove_number = len(board.moves_algebraic) // 2 + 1
+        position.incheck = False
+        position.history = []
+        for y in range(8):
+            for x in range(8):
+                figure = board.board_state[y][x].figure
+                if figure is None:
+                    continue
+                color = WHITE if figure.color == 'w' else BLACK
+                position._put(color * 6 + PIECE_TYPES.index(figure.type), y * 8 + x)
+                if figure.type == 'p' and figure.color == turn and getattr(figure, 'can_enpassant', 0):
+                    direction = 1 if turn == 'w' else -1
+                    position.ep_square = (y + direction) * 8 + x + figure.can_enpassant
+        for right, (king_sq, rook_sq, _, _, _, _) in CASTLING_RULES.items():
+            king = board.board_state[king_sq // 8][king_sq % 8].figure
+            rook = board.board_state[rook_sq // 8][rook_sq % 8].figure
+            color = 'w' if king_sq < 8 else 'b'
+            if (king and king.type == 'K' and king.color == color and not king.has_moved
+                    and rook and rook.type == 'R' and rook.color == color and not rook.has_moved):
+                position.castling |= right
+        position.hash = position._compute_hash()
+        return position
+
+    def set_fen(self, fen: str) -> None:
+        """
+        Ustawia pozycję na podstawie FEN.
+
+        Args:
+            fen (str): Pozycja w notacji FEN.
+
+        Raises:
+            ValueError: Jeśli FEN jest niepoprawny.
+        """
+        parts = fen.split()
+        if not parts:
+            raise ValueError("Pusty FEN.")
+        rows = parts[0].split("/")
+        if len(rows) != 8:
+            raise ValueError(f"Niepoprawny FEN: {fen}")
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.squares = [-1] * 64
+        for r, row in enumerate(rows):
+            y = 7 - r
+            x = 7
+            for char in row:
+                if char.isdigit():
+                    x -= int(char)
+                    continue
+                color = WHITE if char.isupper() else BLACK
+                piece_type = 'p' if char in 'pP' else char.upper()
+                if piece_type not in PIECE_TYPES or x < 0:
+                    raise ValueError(f"Niepoprawny FEN: {fen}")
+                self._put(color * 6 + PIECE_TYPES.index(piece_type), y * 8 + x)
+                x -= 1
+        self.turn = parts[1] if len(parts) > 1 and parts[1] in COLORS else 'w'
+        self.castling = 0
+        if len(parts) > 2:
+            for right, letter in CASTLING_LETTERS:
+                if letter in parts[2]:
+                    self.castling |= right
+        self.ep_square = -1
+        if len(parts) > 3 and parts[3] != '-':
+            self.ep_square = (int(parts[3][1]) - 1) * 8 + 104 - ord(parts[3][0])
+        self.halfmove_clock = int(parts[4]) if len(parts) > 4 else 0
+        self.fullmove_number = int(parts[5]) if len(parts) > 5 else 1
+        self.history = []
+        self.hash = self._compute_hash()
+
+    def _hashed_ep_file(self) -> int:
+        """
+        Zwraca kolumnę pola en passant uwzględnianą w odcisku albo -1.
+
+        Kolumna liczy się tylko wtedy, gdy pionek strony na ruchu może bić na to pole.
+        """
+        if self.ep_square < 0:
+            return -1
+        side = WHITE if self.turn == 'w' else BLACK
+        if PAWN_ATTACKS[side ^ 1][self.ep_square] & self.pieces[side * 6 + PAWN]:
+            return self.ep_square % 8
+        return -1
+
+    def _compute_hash(self) -> int:
+        """
+        Liczy od zera odcisk Zobrista pozycji.
+
+        Returns:
+            int: 64-bitowy klucz, zgodny z engine.zobrist.hash_from_fen.
+        """
+        key = 0
+        for sq, piece in enumerate(self.squares):
+            if piece >= 0:
+                key ^= PIECE_KEYS[piece][sq]
+        key ^= CASTLING_KEYS[self.castling] ^ EN_PASSANT_KEYS[self._hashed_ep_file()]
+        if self.turn == 'b':
+            key ^= SIDE_KEY
+        return key
+
+    def to_fen(self) -> str:
+        """
+        Zwraca pozycję w standardowej notacji FEN.
+
+        Returns:
+            str: FEN
+        """
+        rows = []
+        for y in range(7, -1, -1):
+            row = ""
+            empty_count = 0
+            for x in range(7, -1, -1):
+                piece = self.squares[y * 8 + x]
+                if piece < 0:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    row += str(empty_count)
+                    empty_count = 0
+                char = PIECE_TYPES[piece % 6].upper()
+                row += char if piece < 6 else char.lower()
+            if empty_count:
+                row += str(empty_count)
+            rows.append(row)
+        castling = "".join(letter for right, letter in CASTLING_LETTERS if self.castling & right) or "-"
+        ep = square_name(self.ep_square) if self.ep_square >= 0 else "-"
+        return f"{'/'.join(rows)} {self.turn} {castling} {ep} {self.halfmove_clock} {self.fullmove_number}"
+
+    def _put(self, piece: int, sq: int) -> None:
+        """
+        Stawia figurę na pustym polu.
+        """
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occupancy[piece // 6] |= bit
+        self.squares[sq] = piece
+
+    def _remove(self, piece: int, sq: int) -> None:
+        """
+        Zdejmuje figurę z pola.
+        """
+        bit = 1 << sq
+        self.pieces[piece] ^= bit
+        self.occupancy[piece // 6] ^= bit
+        self.squares[sq] = -1
+
+    def _move(self, piece: int, from_sq: int, to_sq: int) -> None:
+        """
+        Przesuwa figurę na puste pole.
+        """
+        bits = (1 << from_sq) | (1 << to_sq)
+        self.pieces[piece] ^= bits
+        self.occupancy[piece // 6] ^= bits
+        self.squares[from_sq] = -1
+        self.squares[to_sq] = piece
+
+    def get_piece(self, row: int, col: int) -> str:
+        """
+        Zwraca figurę znajdującą się na danym polu.
+
+        Args:
+            row (int): Wiersz pola.
+            col (int): Kolumna pola.
+
+        Returns:
+            str: Reprezentacja figury lub "--", jeśli pole jest puste.
+        """
+        if not (0 <= row < 8 and 0 <= col < 8):
+            return "--"
+        piece = self.squares[row * 8 + col]
+        if piece < 0:
+            return "--"
+        return COLORS[piece // 6] + PIECE_TYPES[piece % 6]
+
+    @property
+    def piece_cords(self) -> list[tuple[int, int]]:
+        """
+        Lista współrzędnych wszystkich figur, posortowana tak jak w Board.
+        """
+        cords = []
+        occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        while occupied:
+            bit = occupied & -occupied
+            sq = bit.bit_length() - 1
+            cords.append((sq // 8, sq % 8))
+            occupied ^= bit
+        return cords
+
+    def king_square(self, color: int) -> int:
+        """
+        Zwraca numer pola króla danego koloru lub -1, jeśli go nie ma.
+        """
+        return self.pieces[color * 6 + KING].bit_length() - 1
+
+    def attackers_of(self, sq: int, by: int, occupied: int = None) -> int:
+        """
+        Zwraca bitboard figur koloru `by` atakujących dane pole.
+
+        Args:
+            sq (int): Numer pola.
+            by (int): Kolor atakującego (WHITE lub BLACK).
+            occupied (int, opcjonalnie): Bitboard zajętych pól (domyślnie aktualny).
+
+        Returns:
+            int: Bitboard atakujących figur.
+        """
+        if occupied is None:
+            occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        base = by * 6
+        pieces = self.pieces
+        attackers = PAWN_ATTACKS[by ^ 1][sq] & pieces[base + PAWN]
+        attackers |= KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]
+        attackers |= KING_ATTACKS[sq] & pieces[base + KING]
+        diagonal = pieces[base + BISHOP] | pieces[base + QUEEN]
+        if diagonal:
+            attackers |= _sliding_attacks(sq, occupied, DIAGONAL_DIRECTIONS) & diagonal
+        straight = pieces[base + ROOK] | pieces[base + QUEEN]
+        if straight:
+            attackers |= _sliding_attacks(sq, occupied, STRAIGHT_DIRECTIONS) & straight
+        return attackers
+
+    def square_attacked(self, sq: int, by: int) -> bool:
+        """
+        Sprawdza, czy pole jest atakowane przez figury koloru `by`.
+        """
+        base = by * 6
+        pieces = self.pieces
+        if PAWN_ATTACKS[by ^ 1][sq] & pieces[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq] & pieces[base + KING]:
+            return True
+        occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        diagonal = pieces[base + BISHOP] | pieces[base + QUEEN]
+        if diagonal and _sliding_attacks(sq, occupied, DIAGONAL_DIRECTIONS) & diagonal:
+            return True
+        straight = pieces[base + ROOK] | pieces[base + QUEEN]
+        if straight and _sliding_attacks(sq, occupied, STRAIGHT_DIRECTIONS) & straight:
+            return True
+        return False
+
+    def is_attacked(self, field, color: str = None) -> bool:
+        """
+        Sprawdza, czy dane pole jest atakowane przez przeciwnika.
+
+        Args:
+            field (Field | tuple): Pole do sprawdzenia lub jego współrzędne (y, x).
+            color (str, opcjonalnie): Kolor strony broniącej pola (domyślnie kolor stojącej na nim figury).
+
+        Returns:
+            bool: True, jeśli pole jest atakowane, False w przeciwnym razie.
+        """
+        if color not in {'w', 'b', None}:
+            return False
+        y, x = _cords(field)
+        sq = y * 8 + x
+        if color is None:
+            piece = self.squares[sq]
+            if piece < 0:
+                return False
+            color = COLORS[piece // 6]
+        return self.square_attacked(sq, BLACK if color == 'w' else WHITE)
+
+    def is_in_check(self, color: str) -> None:
+        """
+        Sprawdza, czy król danego koloru jest szachowany i zapisuje wynik w self.incheck.
+
+        Args:
+            color (str): Kolor króla do sprawdzenia ('w' lub 'b').
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        if color not in {'w', 'b'}:
+            return
+        self.incheck = self.is_in_check_minimax(color)
+
+    def is_in_check_minimax(self, color: str) -> bool:
+        """
+        Sprawdza, czy król danego koloru jest szachowany.
+
+        Args:
+            color (str): Kolor króla do sprawdzenia ('w' lub 'b').
+
+        Returns:
+            bool: True, jeśli król jest szachowany, False w przeciwnym razie.
+        """
+        side = WHITE if color == 'w' else BLACK
+        king_sq = self.king_square(side)
+        if king_sq < 0:
+            return False
+        return self.square_attacked(king_sq, side ^ 1)
+
+    def generate_pseudo_legal(self, side: int, from_mask: int = -1) -> list[tuple]:
+        """
+        Generuje ruchy pseudolegalne (bez sprawdzania szacha) dla danego koloru.
+
+        Args:
+            side (int): Kolor (WHITE lub BLACK).
+            from_mask (int, opcjonalnie): Bitboard pól, z których generowane są ruchy.
+
+        Returns:
+            list[tuple]: Lista ruchów (pole startowe, pole docelowe, promocja, flaga).
+        """
+        moves = []
+        append = moves.append
+        pieces = self.pieces
+        own = self.occupancy[side]
+        enemy = self.occupancy[side ^ 1]
+        occupied = own | enemy
+        empty = ~occupied
+        base = side * 6
+
+        # Pionki
+        forward = 8 if side == WHITE else -8
+        start_row = 1 if side == WHITE else 6
+        last_row = 7 if side == WHITE else 0
+        ep_square = self.ep_square if COLORS[side] == self.turn else -1
+        pawns = pieces[base + PAWN] & from_mask
+        while pawns:
+            bit = pawns & -pawns
+            pawns ^= bit
+            sq = bit.bit_length() - 1
+            targets = PAWN_ATTACKS[side][sq] & enemy
+            to_sq = sq + forward
+            if (empty >> to_sq) & 1:
+                targets |= 1 << to_sq
+                if sq // 8 == start_row and (empty >> (to_sq + forward)) & 1:
+                    append((sq, to_sq + forward, 0, DOUBLE_PUSH))
+            while targets:
+                target_bit = targets & -targets
+                targets ^= target_bit
+                to_sq = target_bit.bit_length() - 1
+                if to_sq // 8 == last_row:
+                    for promotion in (QUEEN, ROOK, BISHOP, KNIGHT):
+                        append((sq, to_sq, promotion, NORMAL))
+                else:
+                    append((sq, to_sq, 0, NORMAL))
+            if ep_square >= 0 and (PAWN_ATTACKS[side][sq] >> ep_square) & 1:
+                append((sq, ep_square, 0, EN_PASSANT))
+
+        # Figury
+        not_own = ~own
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bb = pieces[base + piece_type] & from_mask
+            while bb:
+                bit = bb & -bb
+                bb ^= bit
+                sq = bit.bit_length() - 1
+                if piece_type == KNIGHT:
+                    targets = KNIGHT_ATTACKS[sq]
+                elif piece_type == BISHOP:
+                    targets = _sliding_attacks(sq, occupied, DIAGONAL_DIRECTIONS)
+                elif piece_type == ROOK:
+                    targets = _sliding_attacks(sq, occupied, STRAIGHT_DIRECTIONS)
+                elif piece_type == QUEEN:
+                    targets = _sliding_attacks(sq, occupied, DIAGONAL_DIRECTIONS + STRAIGHT_DIRECTIONS)
+                else:
+                    targets = KING_ATTACKS[sq]
+                targets &= not_own
+                while targets:
+                    target_bit = targets & -targets
+                    targets ^= target_bit
+                    append((sq, target_bit.bit_length() - 1, 0, NORMAL))
+
+        # Roszady
+        rights = self.castling & ((CASTLE_WK | CASTLE_WQ) if side == WHITE else (CASTLE_BK | CASTLE_BQ))
+        if rights:
+            for right, (king_sq, rook_sq, _, _, empty_mask, safe_squares) in CASTLING_RULES.items():
+                if not rights & right or not (from_mask >> king_sq) & 1:
+                    continue
+                if occupied & empty_mask or self.squares[king_sq] != base + KING or self.squares[rook_sq] != base + ROOK:
+                    continue
+                if any(self.square_attacked(sq, side ^ 1) for sq in safe_squares):
+                    continue
+                append((king_sq, rook_sq, 0, CASTLING))
+        return moves
+
+    def generate_legal(self, side: int = None, from_mask: int = -1) -> list[tuple]:
+        """
+        Generuje legalne ruchy dla danego koloru.
+
+        Args:
+            side (int, opcjonalnie): Kolor (domyślnie strona na ruchu).
+            from_mask (int, opcjonalnie): Bitboard pól, z których generowane są ruchy.
+
+        Returns:
+            list[tuple]: Lista ruchów (pole startowe, pole docelowe, promocja, flaga).
+        """
+        if side is None:
+            side = WHITE if self.turn == 'w' else BLACK
+        legal = []
+        for move in self.generate_pseudo_legal(side, from_mask):
+            self._make(move)
+            king_sq = self.king_square(side)
+            if king_sq < 0 or not self.square_attacked(king_sq, side ^ 1):
+                legal.append(move)
+            self._unmake()
+        return legal
+
+    def has_any_legal_move(self, turn: str) -> bool:
+        """
+        Sprawdza, czy strona ma jakikolwiek legalny ruch, przerywając na pierwszym znalezionym.
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            bool: True, jeśli istnieje legalny ruch.
+        """
+        if turn not in {'w', 'b'}:
+            return False
+        side = WHITE if turn == 'w' else BLACK
+        for move in self.generate_pseudo_legal(side):
+            self._make(move)
+            king_sq = self.king_square(side)
+            legal = king_sq < 0 or not self.square_attacked(king_sq, side ^ 1)
+            self._unmake()
+            if legal:
+                return True
+        return False
+
+    def get_legal_moves(self, field, turn: str) -> list[tuple[int, int]]:
+        """
+        Generuje legalne ruchy dla figury na danym polu.
+
+        Args:
+            field (Field | tuple): Pole figury lub jego współrzędne (y, x).
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            list[tuple[int, int]]: Lista legalnych ruchów.
+        """
+        if turn not in {'w', 'b'}:
+            return []
+        y, x = _cords(field)
+        sq = y * 8 + x
+        piece = self.squares[sq]
+        if piece < 0 or COLORS[piece // 6] != turn:
+            return []
+        legal_cords = []
+        for move in self.generate_legal(piece // 6, 1 << sq):
+            cord = (move[1] // 8, move[1] % 8)
+            if cord not in legal_cords:
+                legal_cords.append(cord)
+        return legal_cords
+
+    def get_all_moves(self, turn: str) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Generuje wszystkie możliwe ruchy dla danego koloru.
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            dict[tuple[int, int], list[tuple[int, int]]]: Słownik z możliwymi ruchami.
+        """
+        if turn not in {'w', 'b'}:
+            return {}
+        all_moves = {}
+        for from_sq, to_sq, _, _ in self.generate_legal(WHITE if turn == 'w' else BLACK):
+            cords = all_moves.setdefault((from_sq // 8, from_sq % 8), [])
+            cord = (to_sq // 8, to_sq % 8)
+            if cord not in cords:
+                cords.append(cord)
+        return all_moves
+
+    def get_move_list(self, turn: str) -> list[int]:
+        """
+        Generuje legalne ruchy jako płaską listę ruchów spakowanych (engine.moves).
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            list[int]: Lista ruchów; promocje występują osobno dla każdej figury.
+        """
+        if turn not in {'w', 'b'}:
+            return []
+        # Flagi wewnętrzne mają te same numery co w engine.moves, promocja na figurę p to flaga p + 3
+        return [from_sq | (to_sq << 6) | ((promotion + 3 if promotion else flag) << 12)
+                for from_sq, to_sq, promotion, flag in self.generate_legal(WHITE if turn == 'w' else BLACK)]
+
+    def _to_internal(self, move) -> tuple:
+        """
+        Zamienia ruch (y1, x1, y2, x2[, promocja]) na ruch wewnętrzny.
+
+        Promocja jest podawana jako typ figury ('N', 'B', 'R', 'Q'), domyślnie hetman.
+        Roszada jest zapisywana tak jak w Board: jako ruch króla na pole wieży.
+        Przyjmuje też ruch spakowany do liczby (engine.moves).
+        """
+        if isinstance(move, int):
+            flag = move >> 12
+            if flag >= 4:
+                return move & 63, (move >> 6) & 63, flag - 3, NORMAL
+            return move & 63, (move >> 6) & 63, 0, flag
+        y1, x1, y2, x2 = move[:4]
+        from_sq = y1 * 8 + x1
+        to_sq = y2 * 8 + x2
+        piece = self.squares[from_sq]
+        if piece < 0:
+            raise ValueError("Na tym polu nie ma figury!")
+        piece_type = piece % 6
+        target = self.squares[to_sq]
+        if piece_type == KING and target == piece - KING + ROOK:
+            return from_sq, to_sq, 0, CASTLING
+        if piece_type == PAWN:
+            if to_sq // 8 in (0, 7):
+                promotion = move[4] if len(move) > 4 and move[4] else 'Q'
+                return from_sq, to_sq, PIECE_TYPES.index(promotion), NORMAL
+            if to_sq == self.ep_square and x1 != x2 and target < 0:
+                return from_sq, to_sq, 0, EN_PASSANT
+            if abs(y2 - y1) == 2:
+                return from_sq, to_sq, 0, DOUBLE_PUSH
+        return from_sq, to_sq, 0, NORMAL
+
+    def push(self, move) -> None:
+        """
+        Wykonuje ruch i zapamiętuje dane potrzebne do jego cofnięcia.
+
+        Args:
+            move (tuple | int): Ruch (y1, x1, y2, x2), (y1, x1, y2, x2, promocja) lub ruch spakowany (engine.moves).
+        """
+        self._make(self._to_internal(move))
+
+    def pop(self) -> tuple:
+        """
+        Cofa ostatni ruch wykonany przez push.
+
+        Returns:
+            tuple: Cofnięty ruch w postaci (y1, x1, y2, x2).
+        """
+        move = self._unmake()
+        return move[0] // 8, move[0] % 8, move[1] // 8, move[1] % 8
+
+    def _make(self, move: tuple) -> None:
+        """
+        Wykonuje ruch wewnętrzny bez sprawdzania legalności i aktualizuje odcisk pozycji.
+        """
+        from_sq, to_sq, promotion, flag = move
+        piece = self.squares[from_sq]
+        side = piece // 6
+        captured = self.squares[to_sq] if flag != CASTLING else -1
+        self.history.append((move, captured, self.castling, self.ep_square, self.halfmove_clock, self.hash))
+        key = self.hash ^ CASTLING_KEYS[self.castling] ^ EN_PASSANT_KEYS[self._hashed_ep_file()] ^ SIDE_KEY
+
+        if flag == CASTLING:
+            _, _, king_to, rook_to, _, _ = CASTLING_RULES[self._castling_right(from_sq, to_sq)]
+            rook = side * 6 + ROOK
+            self._move(piece, from_sq, king_to)
+            self._move(rook, to_sq, rook_to)
+            key ^= PIECE_KEYS[piece][from_sq] ^ PIECE_KEYS[piece][king_to] ^ PIECE_KEYS[rook][to_sq] ^ PIECE_KEYS[rook][rook_to]
+        else:
+            if flag == EN_PASSANT:
+                captured_sq = to_sq - 8 if side == WHITE else to_sq + 8
+                captured_pawn = self.squares[captured_sq]
+                self._remove(captured_pawn, captured_sq)
+                key ^= PIECE_KEYS[captured_pawn][captured_sq]
+            elif captured >= 0:
+                self._remove(captured, to_sq)
+                key ^= PIECE_KEYS[captured][to_sq]
+            if promotion:
+                self._remove(piece, from_sq)
+                self._put(side * 6 + promotion, to_sq)
+                key ^= PIECE_KEYS[piece][from_sq] ^ PIECE_KEYS[side * 6 + promotion][to_sq]
+            else:
+                self._move(piece, from_sq, to_sq)
+                key ^= PIECE_KEYS[piece][from_sq] ^ PIECE_KEYS[piece][to_sq]
+
+        self.castling &= CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        self.ep_square = (from_sq + to_sq) // 2 if flag == DOUBLE_PUSH else -1
+        if piece % 6 == PAWN or captured >= 0 or flag == EN_PASSANT:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if side == BLACK:
+            self.fullmove_number += 1
+        self.turn = 'b' if side == WHITE else 'w'
+        self.hash = key ^ CASTLING_KEYS[self.castling] ^ EN_PASSANT_KEYS[self._hashed_ep_file()]
+
+    def _unmake(self) -> tuple:
+        """
+        Cofa ostatni ruch wewnętrzny.
+        """
+        move, captured, self.castling, self.ep_square, self.halfmove_clock, self.hash = self.history.pop()
+        from_sq, to_sq, promotion, flag = move
+        if flag == CASTLING:
+            _, _, king_to, rook_to, _, _ = CASTLING_RULES[self._castling_right(from_sq, to_sq)]
+            piece = self.squares[king_to]
+            side = piece // 6
+            self._move(piece, king_to, from_sq)
+            self._move(side * 6 + ROOK, rook_to, to_sq)
+        else:
+            piece = self.squares[to_sq]
+            side = piece // 6
+            if promotion:
+                self._remove(piece, to_sq)
+                self._put(side * 6 + PAWN, from_sq)
+            else:
+                self._move(piece, to_sq, from_sq)
+            if flag == EN_PASSANT:
+                captured_sq = to_sq - 8 if side == WHITE else to_sq + 8
+                self._put((side ^ 1) * 6 + PAWN, captured_sq)
+            elif captured >= 0:
+                self._put(captured, to_sq)
+        if side == BLACK:
+            self.fullmove_number -= 1
+        self.turn = COLORS[side]
+        return move
+
+    @staticmethod
+    def _castling_right(king_sq: int, rook_sq: int) -> int:
+        """
+        Zwraca prawo do roszady odpowiadające ruchowi króla na pole wieży.
+        """
+        if king_sq == 3:
+            return CASTLE_WK if rook_sq == 0 else CASTLE_WQ
+        return CASTLE_BK if rook_sq == 56 else CASTLE_BQ
+
+    def print_board(self) -> None:
+        """
+        Wyświetla aktualny stan planszy w terminalu.
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        print("+" + "----+" * 8)
+        for y in range(7, -1, -1):
+            print("| ", end="")
+            for x in range(7, -1, -1):
+                piece = self.get_piece(y, x)
+                print("  " if piece == "--" else piece, end="")
+                print(" | ", end="")
+            print(y)
+            print("+" + "----+" * 8)
+        print("  7    6    5    4    3    2    1    0")
@@ -3,7 +3,21 @@ Moduł zawiera klasy reprezentujące pola i planszę szachową.
 """
 import engine.figures as figures
 import engine.fen_operations as fen_operations
-import copy
+import engine.zobrist as zobrist
+import engine.moves as moves
+from engine.attack_tables import KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACKER_SQUARES, DIAGONAL_RAYS, STRAIGHT_RAYS
+
+# Figury, na które może zostać wypromowany pionek
+PROMOTION_PIECES = {
+    'N': figures.Knight,
+    'B': figures.Bishop,
+    'R': figures.Rook,
+    'Q': figures.Queen,
+}
+
+# Typy figur w kolejności, w jakiej przeglądane są listy figur
+PIECE_TYPES = ('p', 'N', 'B', 'R', 'Q', 'K')
+
 class Field:
     """
     Klasa reprezentująca pojedyncze pole na planszy szachowej.
@@ -60,15 +74,71 @@ class Board:
         self.moves_algebraic_long = []
         self.halfmove_clock = 0
         self.fen_history = [fen_operations.board_to_fen_inverted(self,"w")]
-        self.piece_cords = []
+        self.move_stack = []
+        self.rebuild_piece_lists()
+        self.king_cords = {'w': None, 'b': None}
+        self.locate_kings()
+        self.hash = zobrist.hash_board(self, 'w')
+        self.hash_history = [self.hash]
+
+    def rebuild_piece_lists(self) -> None:
+        """
+        Buduje listy figur od zera na podstawie board_state.
+
+        piece_lists[kolor][typ] to lista współrzędnych (y, x) figur danego koloru i typu,
+        a piece_index mapuje współrzędne figury na jej indeks w tej liście. Dzięki temu
+        dodanie, usunięcie i przesunięcie figury kosztuje O(1), a generator ruchów przegląda
+        tylko figury strony na ruchu. Wywoływana przy budowaniu pozycji od zera, np. w konstruktorze
+        i fen_to_board; później listy są aktualizowane przy każdym ruchu.
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        self.piece_lists = {color: {piece_type: [] for piece_type in PIECE_TYPES} for color in ('w', 'b')}
+        self.piece_index = {}
         for row in range(0,8):
             for col in range(0,8):
-                if self.board_state[row][col].figure:
-                    self.piece_cords.append((row, col))
+                figure = self.board_state[row][col].figure
+                if figure:
+                    self.add_piece(figure, (row, col))
+
+    @property
+    def piece_cords(self) -> list[tuple[int, int]]:
+        """
+        Współrzędne wszystkich figur na planszy (obu kolorów), zbudowane z list figur.
+        """
+        return [cord for lists in self.piece_lists.values() for cords in lists.values() for cord in cords]
+
+    def add_piece(self, figure, cord: tuple[int, int]) -> None:
+        """
+        Dopisuje figurę stojącą na polu cord do list figur.
+        """
+        cords = self.piece_lists[figure.color][figure.type]
+        self.piece_index[cord] = len(cords)
+        cords.append(cord)
+
+    def remove_piece(self, figure, cord: tuple[int, int]) -> None:
+        """
+        Usuwa figurę z pola cord z list figur; na jej miejsce trafia ostatni element listy.
+        """
+        cords = self.piece_lists[figure.color][figure.type]
+        index = self.piece_index.pop(cord)
+        last = cords.pop()
+        if last != cord:
+            cords[index] = last
+            self.piece_index[last] = index
+
+    def move_piece(self, figure, from_cord: tuple[int, int], to_cord: tuple[int, int]) -> None:
+        """
+        Przenosi figurę w listach figur z pola from_cord na pole to_cord (pole docelowe musi być wolne).
+        """
+        index = self.piece_index.pop(from_cord)
+        self.piece_lists[figure.color][figure.type][index] = to_cord
+        self.piece_index[to_cord] = index
 
     def make_move(self, y1: int, x1: int, y2: int, x2: int) -> None:
         """
-        Wykonuje ruch na planszy.
+        Wykonuje ruch na planszy. Figura stojąca na polu docelowym jest zbijana.
 
         Args:
             y1 (int): Współrzędna wiersza początkowego.
@@ -84,9 +154,203 @@ class Board:
         """
         if not (0 <= y1 < 8 and 0 <= x1 < 8 and 0 <= y2 < 8 and 0 <= x2 < 8):
             raise ValueError("Współrzędne muszą być w zakresie od 0 do 7.")
-        self.board_state[y2][x2].figure = self.board_state[y1][x1].figure
+        figure = self.board_state[y1][x1].figure
+        captured = self.board_state[y2][x2].figure
+        self.board_state[y2][x2].figure = figure
         self.board_state[y1][x1].figure = None
-        
+        if figure:
+            if captured:
+                self.remove_piece(captured, (y2, x2))
+            self.move_piece(figure, (y1, x1), (y2, x2))
+            if figure.type == 'K':
+                self.king_cords[figure.color] = (y2, x2)
+
+    def locate_kings(self) -> None:
+        """
+        Wyszukuje oba króle na planszy i zapisuje ich współrzędne w king_cords.
+
+        Wywoływana tylko przy budowaniu pozycji od zera, np. w konstruktorze i fen_to_board.
+        Później pozycje królów są aktualizowane przy każdym ruchu.
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        self.king_cords = {'w': None, 'b': None}
+        for color in ('w', 'b'):
+            kings = self.piece_lists[color]['K']
+            if kings:
+                self.king_cords[color] = kings[0]
+
+    def push(self, move) -> None:
+        """
+        Wykonuje legalny ruch na potrzeby przeszukiwania i zapisuje rekord pozwalający go cofnąć.
+
+        W przeciwieństwie do engine.tryMove nie sprawdza legalności ruchu i pomija notację
+        oraz historię FEN, które są potrzebne tylko interfejsowi. Obsługuje roszadę, bicie w przelocie
+        i promocję (domyślnie na hetmana). Odcisk pozycji jest aktualizowany przyrostowo.
+
+        Args:
+            move (tuple | int): Ruch (y1, x1, y2, x2) lub (y1, x1, y2, x2, promocja), gdzie promocja to 'N', 'B', 'R' lub 'Q',
+                albo ruch spakowany do liczby (engine.moves).
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        if isinstance(move, int):
+            move = moves.to_tuple(move)
+        y1, x1, y2, x2 = move[:4]
+        figure = self.board_state[y1][x1].figure
+        captured = self.board_state[y2][x2].figure
+        captured_cords = (y2, x2)
+        color = figure.color
+        key = self.hash
+        old_rights = zobrist.castling_rights(self)
+        old_ep = -1
+        new_ep = -1
+        # Flagi has_moved i can_enpassant zmienione przez ruch, w kolejności (figura, atrybut, stara wartość)
+        flags = []
+        enpassant_row = 4 if color == 'w' else 3
+        for tile in self.board_state[enpassant_row]:
+            if tile.figure and tile.figure.type == 'p' and tile.figure.can_enpassant:
+                if tile.figure.color == color:
+                    old_ep = tile.x + tile.figure.can_enpassant
+                flags.append((tile.figure, 'can_enpassant', tile.figure.can_enpassant))
+                tile.figure.can_enpassant = 0
+        promoted = None
+        if figure.type == 'K' and captured and captured.type == 'R' and captured.color == color:
+            #Wykonanie roszady
+            direction = -1 if x2 - x1 < 0 else 1
+            flags.append((figure, 'has_moved', figure.has_moved))
+            flags.append((captured, 'has_moved', captured.has_moved))
+            figure.has_moved = True
+            captured.has_moved = True
+            self.board_state[y1][x1].figure = None
+            self.board_state[y2][x2].figure = None
+            self.board_state[y1][x1 + 2 * direction].figure = figure
+            self.board_state[y1][x1 + direction].figure = captured
+            self.move_piece(figure, (y1, x1), (y1, x1 + 2 * direction))
+            self.move_piece(captured, (y2, x2), (y1, x1 + direction))
+            self.king_cords[color] = (y1, x1 + 2 * direction)
+            key ^= (zobrist.piece_key(figure, y1, x1) ^ zobrist.piece_key(figure, y1, x1 + 2 * direction)
+                    ^ zobrist.piece_key(captured, y2, x2) ^ zobrist.piece_key(captured, y1, x1 + direction))
+            captured = None
+        else:
+            if figure.type == 'p' and captured is None and x1 != x2:
+                #Bicie w przelocie
+                captured_cords = (y1, x2)
+                captured = self.board_state[y1][x2].figure
+                self.board_state[y1][x2].figure = None
+            if captured:
+                self.remove_piece(captured, captured_cords)
+                key ^= zobrist.piece_key(captured, *captured_cords)
+            if figure.type in ('p', 'K', 'R'):
+                flags.append((figure, 'has_moved', figure.has_moved))
+                figure.has_moved = True
+            self.board_state[y2][x2].figure = figure
+            self.board_state[y1][x1].figure = None
+            self.move_piece(figure, (y1, x1), (y2, x2))
+            if figure.type == 'K':
+                self.king_cords[color] = (y2, x2)
+            key ^= zobrist.piece_key(figure, y1, x1)
+            if figure.type == 'p' and y2 in (0, 7):
+                promoted = figure
+                choice = move[4] if len(move) > 4 and move[4] else 'Q'
+                self.board_state[y2][x2].figure = PROMOTION_PIECES[choice](color)
+                self.remove_piece(figure, (y2, x2))
+                self.add_piece(self.board_state[y2][x2].figure, (y2, x2))
+            elif figure.type == 'p' and y2 - y1 in (2, -2):
+                #Ustawienie flag en passant dla sąsiednich pionków przeciwnika
+                for direction_x in (-1, 1):
+                    if 0 <= x2 + direction_x <= 7:
+                        neighbour = self.board_state[y2][x2 + direction_x].figure
+                        if neighbour and neighbour.type == 'p' and neighbour.color != color:
+                            flags.append((neighbour, 'can_enpassant', neighbour.can_enpassant))
+                            neighbour.can_enpassant = -direction_x
+                            new_ep = x2
+            key ^= zobrist.piece_key(self.board_state[y2][x2].figure, y2, x2)
+        self.move_stack.append((move, figure, captured, captured_cords, promoted, flags, self.incheck, self.halfmove_clock, self.hash))
+        if figure.type == 'p' or captured:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        self.hash = (key ^ zobrist.CASTLING_KEYS[old_rights] ^ zobrist.CASTLING_KEYS[zobrist.castling_rights(self)]
+                     ^ zobrist.EN_PASSANT_KEYS[old_ep] ^ zobrist.EN_PASSANT_KEYS[new_ep] ^ zobrist.SIDE_KEY)
+        self.hash_history.append(self.hash)
+
+    def pop(self) -> tuple:
+        """
+        Cofa ostatni ruch wykonany przez push.
+
+        Returns:
+            tuple: Cofnięty ruch.
+        """
+        move, figure, captured, captured_cords, promoted, flags, self.incheck, self.halfmove_clock, self.hash = self.move_stack.pop()
+        self.hash_history.pop()
+        y1, x1, y2, x2 = move[:4]
+        if figure.type == 'K' and x2 - x1 not in (-1, 0, 1):
+            #Cofnięcie roszady
+            direction = -1 if x2 - x1 < 0 else 1
+            rook = self.board_state[y1][x1 + direction].figure
+            self.board_state[y1][x1 + 2 * direction].figure = None
+            self.board_state[y1][x1 + direction].figure = None
+            self.board_state[y1][x1].figure = figure
+            self.board_state[y2][x2].figure = rook
+            self.move_piece(figure, (y1, x1 + 2 * direction), (y1, x1))
+            self.move_piece(rook, (y1, x1 + direction), (y2, x2))
+            self.king_cords[figure.color] = (y1, x1)
+        else:
+            if promoted:
+                self.remove_piece(self.board_state[y2][x2].figure, (y2, x2))
+                self.add_piece(promoted, (y1, x1))
+            else:
+                self.move_piece(figure, (y2, x2), (y1, x1))
+            self.board_state[y1][x1].figure = promoted if promoted else figure
+            self.board_state[y2][x2].figure = None
+            if figure.type == 'K':
+                self.king_cords[figure.color] = (y1, x1)
+            if captured:
+                self.board_state[captured_cords[0]][captured_cords[1]].figure = captured
+                self.add_piece(captured, captured_cords)
+        for flagged_figure, attribute, value in reversed(flags):
+            setattr(flagged_figure, attribute, value)
+        return move
+
+    def push_null(self, color: str) -> None:
+        """
+        Wykonuje ruch zerowy: strona na ruchu oddaje ruch bez przestawiania figur.
+
+        Używany tylko w przeszukiwaniu (przycinanie ruchem zerowym). Kasuje możliwość bicia
+        w przelocie i zmienia stronę na ruchu w odcisku pozycji. Cofany przez pop_null.
+
+        Args:
+            color (str): Strona na ruchu, która oddaje ruch ('w' lub 'b').
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        old_ep = zobrist.enpassant_file(self, color)
+        flags = []
+        for tile in self.board_state[4 if color == 'w' else 3]:
+            if tile.figure and tile.figure.type == 'p' and tile.figure.can_enpassant:
+                flags.append((tile.figure, 'can_enpassant', tile.figure.can_enpassant))
+                tile.figure.can_enpassant = 0
+        self.move_stack.append((None, None, None, None, None, flags, self.incheck, self.halfmove_clock, self.hash))
+        self.halfmove_clock += 1
+        self.hash ^= zobrist.EN_PASSANT_KEYS[old_ep] ^ zobrist.SIDE_KEY
+        self.hash_history.append(self.hash)
+
+    def pop_null(self) -> None:
+        """
+        Cofa ruch zerowy wykonany przez push_null.
+
+        Returns:
+            None: Funkcja nie zwraca wartości.
+        """
+        flags, self.incheck, self.halfmove_clock, self.hash = self.move_stack.pop()[5:]
+        self.hash_history.pop()
+        for flagged_figure, attribute, value in reversed(flags):
+            setattr(flagged_figure, attribute, value)
+
     def get_regular_moves(self, field: Field) -> list[tuple[int, int]]:
         """
         Generuje możliwe ruchy dla figury na danym polu (bez uwzględnienia ataków).
@@ -103,13 +367,11 @@ class Board:
         if field.figure == None:
             print("Na tym polu nie ma figury!",end=" ")
             return []
-        movescheme =copy.deepcopy(field.figure.move_scheme)
-        if field.figure.type == 'p':
-            if field.figure.has_moved == False:
-                if field.figure.color == 'w':
-                    movescheme.append((0,1,2))
-                else:
-                    movescheme.append((0,-1,2))            
+        #Pionek, który się nie ruszał, może przejść o dwa pola
+        if field.figure.type == 'p' and field.figure.has_moved == False:
+            movescheme = field.figure.descriptor.first_move_scheme
+        else:
+            movescheme = field.figure.descriptor.move_scheme
         for direction in movescheme:
             for distance in range(1,direction[2]+1):
                 field_to_check_x = field.x + direction[0] * distance
@@ -138,10 +400,7 @@ class Board:
         if not isinstance(field, Field):
             return []
         possible_cords = [] 
-        try:
-            attackscheme = field.figure.attack_scheme 
-        except AttributeError:
-            attackscheme = field.figure.move_scheme
+        attackscheme = field.figure.descriptor.attack_scheme
         for direction in attackscheme:
             for distance in range(1,direction[2]+1):
                 field_to_check_x = field.x + direction[0] * distance
@@ -176,34 +435,29 @@ class Board:
             return False
         if color==None:
             color = field.figure.color
-        attackschemes = {
-            'N':[(2,1,1),(-2,1,1),(2,-1,1),(-2,-1,1),(1,2,1),(1,-2,1),(-1,2,1),(-1,-2,1)],
-            'B':[(1,1,8),(1,-1,8),(-1,1,8),(-1,-1,8),],
-            'R':[(0, 1 ,8), (0, -1 ,8), (1, 0 ,8), (-1, 0 ,8)],
-            'Q':[(1,1,8),(1,-1,8),(-1,1,8),(-1,-1,8),(0, 1 ,8), (0, -1 ,8), (1, 0 ,8), (-1, 0 ,8)],
-            'K':[(1,1,1),(1,-1,1),(-1,1,1),(-1,-1,1),(0, 1 ,1), (0, -1 ,1), (1, 0 ,1), (-1, 0 ,1)],
-        }
-        if color == 'w':
-            attackschemes['p'] = [(-1, 1, 1),(1, 1, 1)]
-        else:
-            attackschemes['p'] = [(-1, -1, 1),(1, -1, 1)]
-        for figure_type in attackschemes:
-            attackscheme = attackschemes[figure_type]
-            for direction in attackscheme:
-                for distance in range(1,direction[2]+1):
-                    field_to_check_x = field.x + direction[0] * distance
-                    field_to_check_y= field.y + direction[1] * distance
-                    #Sprawdzanie, czy koordynaty pola nie wyszły poza szachownicę
-                    if field_to_check_y > 7 or field_to_check_y < 0 or field_to_check_x > 7 or field_to_check_x < 0:
-                        break 
-                    field_to_check = self.board_state[field_to_check_y][field_to_check_x]
-                    if field_to_check.figure:
-                        if field_to_check.figure.color == color:
-                            break
-                        else:
-                            if field_to_check.figure.type == figure_type:
-                                return True
-                            break
+        state = self.board_state
+        y, x = field.y, field.x
+        for cord_y, cord_x in PAWN_ATTACKER_SQUARES[color][y][x]:
+            figure = state[cord_y][cord_x].figure
+            if figure and figure.type == 'p' and figure.color != color:
+                return True
+        for cord_y, cord_x in KNIGHT_SQUARES[y][x]:
+            figure = state[cord_y][cord_x].figure
+            if figure and figure.type == 'N' and figure.color != color:
+                return True
+        for cord_y, cord_x in KING_SQUARES[y][x]:
+            figure = state[cord_y][cord_x].figure
+            if figure and figure.type == 'K' and figure.color != color:
+                return True
+        # Promienie figur dalekobieżnych, przerywane na pierwszej napotkanej figurze
+        for rays, attackers in ((DIAGONAL_RAYS[y][x], 'BQ'), (STRAIGHT_RAYS[y][x], 'RQ')):
+            for ray in rays:
+                for cord_y, cord_x in ray:
+                    figure = state[cord_y][cord_x].figure
+                    if figure:
+                        if figure.color != color and figure.type in attackers:
+                            return True
+                        break
         return False
 
     def is_in_check(self, color: str) -> None:
@@ -218,11 +472,8 @@ class Board:
         """
         if color not in {'w', 'b'}:
             return
-        for cord in self.piece_cords:
-            tile = self.board_state[cord[0]][cord[1]]
-            if tile.figure.type == 'K' and tile.figure.color == color:
-                    king_position = tile
-        if self.is_attacked(king_position):
+        king_y, king_x = self.king_cords[color]
+        if self.is_attacked(self.board_state[king_y][king_x]):
             if self.incheck == False:
                 self.incheck = True
         else:
@@ -237,12 +488,52 @@ class Board:
         Returns:
             bool: True, jeśli król jest szachowany, False w przeciwnym razie.
         """
-        for i in range(8):
-            for j in range(8):
-                tile = self.board_state[i][j]
-                if tile.figure and tile.figure.type == 'K' and tile.figure.color == color:
-                    king_position = tile
-        return self.is_attacked(king_position)
+        king_y, king_x = self.king_cords[color]
+        return self.is_attacked(self.board_state[king_y][king_x])
+    def get_checks_and_pins(self, turn: str) -> tuple[list[set], dict[tuple[int, int], set]]:
+        """
+        Wyznacza figury szachujące króla danego koloru oraz związane figury tego koloru.
+
+        Args:
+            turn (str): Kolor króla ('w' lub 'b').
+
+        Returns:
+            tuple: (lista szachów, słownik związań). Każdy szach to zbiór pól, na które można
+                przestawić figurę, żeby go zatrzymać (pole szachującej figury i pola pomiędzy nią
+                a królem). Związanie mapuje pole związanej figury na zbiór pól linii związania,
+                po których figura może się poruszać.
+        """
+        state = self.board_state
+        king_y, king_x = self.king_cords[turn]
+        checkers = []
+        pins = {}
+        for squares, attacker in ((PAWN_ATTACKER_SQUARES[turn][king_y][king_x], 'p'), (KNIGHT_SQUARES[king_y][king_x], 'N')):
+            for cord_y, cord_x in squares:
+                figure = state[cord_y][cord_x].figure
+                if figure and figure.type == attacker and figure.color != turn:
+                    checkers.append({(cord_y, cord_x)})
+        for rays, attackers in ((DIAGONAL_RAYS[king_y][king_x], 'BQ'), (STRAIGHT_RAYS[king_y][king_x], 'RQ')):
+            for ray in rays:
+                line = set()
+                pinned = None
+                for cord in ray:
+                    line.add(cord)
+                    figure = state[cord[0]][cord[1]].figure
+                    if figure is None:
+                        continue
+                    if figure.color == turn:
+                        if pinned:
+                            break
+                        pinned = cord
+                        continue
+                    if figure.type in attackers:
+                        if pinned:
+                            pins[pinned] = line
+                        else:
+                            checkers.append(line)
+                    break
+        return checkers, pins
+
     def get_all_moves(self, turn: str) -> dict[tuple[int, int], list[tuple[int, int]]]:
         """
         Generuje wszystkie możliwe ruchy dla danego koloru.
@@ -256,21 +547,85 @@ class Board:
         if turn not in {'w', 'b'}:
             return {}
         all_moves = {}
-        for i in range(len(self.piece_cords)):
-                cord = self.piece_cords[i]
-                field = self.board_state[cord[0]][cord[1]]
-                # self.print_board()
-                if field.figure.color == turn:
-                        all_moves[(cord[0],cord[1])] = self.get_legal_moves(field,turn)
-                self.piece_cords.sort() 
-        return {k: v for k, v in all_moves.items() if v}
-    def get_legal_moves(self, field: Field, turn: str) -> list[tuple[int, int]]:
+        check_info = self.get_checks_and_pins(turn)
+        for cords in self.piece_lists[turn].values():
+            for cord in cords:
+                legal_moves = self.get_legal_moves(self.board_state[cord[0]][cord[1]], turn, check_info)
+                if legal_moves:
+                    all_moves[cord] = legal_moves
+        return all_moves
+
+    def get_move_list(self, turn: str) -> list[int]:
+        """
+        Generuje wszystkie legalne ruchy jako płaską listę ruchów spakowanych (engine.moves).
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            list[int]: Lista ruchów; promocje występują osobno dla każdej figury.
+        """
+        return moves.from_move_dict(self, self.get_all_moves(turn))
+
+    def get_capture_list(self, turn: str) -> list[int]:
+        """
+        Generuje legalne bicia (także w przelocie) i promocje jako ruchy spakowane (engine.moves),
+        bez cichych ruchów i roszad (do przeszukiwania stabilizującego).
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            list[int]: Lista ruchów; promocje występują osobno dla każdej figury.
+        """
+        if turn not in {'w', 'b'}:
+            return []
+        all_captures = {}
+        check_info = self.get_checks_and_pins(turn)
+        for cords in self.piece_lists[turn].values():
+            for cord in cords:
+                captures = self.get_legal_moves(self.board_state[cord[0]][cord[1]], turn, check_info, True)
+                if captures:
+                    all_captures[cord] = captures
+        return moves.from_move_dict(self, all_captures)
+
+    def has_any_legal_move(self, turn: str) -> bool:
+        """
+        Sprawdza, czy strona ma jakikolwiek legalny ruch (do wykrywania matu i pata).
+
+        Przerywa generowanie na pierwszej figurze, która ma legalny ruch, więc zwykle jest
+        dużo tańsze niż get_all_moves.
+
+        Args:
+            turn (str): Aktualna tura ('w' lub 'b').
+
+        Returns:
+            bool: True, jeśli istnieje legalny ruch.
+        """
+        if turn not in {'w', 'b'}:
+            return False
+        check_info = self.get_checks_and_pins(turn)
+        for cords in self.piece_lists[turn].values():
+            for cord in cords:
+                if self.get_legal_moves(self.board_state[cord[0]][cord[1]], turn, check_info):
+                    return True
+        return False
+
+    def get_legal_moves(self, field: Field, turn: str, check_info: tuple = None,
+                        captures_only: bool = False) -> list[tuple[int, int]]:
         """
         Generuje legalne ruchy dla figury na danym polu.
 
+        Ruchy są filtrowane na podstawie szachów i związań wyznaczonych przez get_checks_and_pins,
+        bez wykonywania ich na planszy. Wyjątkiem są ruchy króla i bicie w przelocie, które są
+        sprawdzane na chwilowo zmienionej planszy. Ustawia self.incheck zgodnie z tym, czy król
+        strony na ruchu jest szachowany.
+
         Args:
             field (Field): Pole figury, dla której generowane są ruchy.
             turn (str): Aktualna tura ('w' lub 'b').
+            check_info (tuple, opcjonalnie): Wynik get_checks_and_pins(turn), jeśli został już policzony.
+            captures_only (bool, opcjonalnie): Tylko bicia i promocje pionka (bez cichych ruchów i roszady).
 
         Returns:
             list[tuple[int, int]]: Lista legalnych ruchów.
@@ -283,46 +638,88 @@ class Board:
         elif field.figure.color != turn:
             print("To nie twój ruch!", end=" ")
             return []
+        checkers, pins = check_info if check_info else self.get_checks_and_pins(turn)
+        self.incheck = bool(checkers)
+        state = self.board_state
+        figure = field.figure
+        if captures_only:
+            possible_moves = set(self.get_attack_moves(field))
+            if figure.type == 'p':
+                possible_moves.update(move for move in self.get_regular_moves(field) if move[0] in (0, 7))
         else:
             possible_moves = set(self.get_regular_moves(field) + self.get_attack_moves(field))
-            legal_cords = []
+        legal_cords = []
+        if figure.type == 'K':
+            # Król nie może wejść na pole atakowane, również wzdłuż linii szachu za sobą
+            field.figure = None
             for move in possible_moves:
-                        figure1 = self.board_state[field.y][field.x].figure
-                        figure2 = self.board_state[move[0]][move[1]].figure
-                        if figure2:
-                            if figure2.type == 'K':
-                                self.incheck = True
-                                continue
-                        self.piece_cords.remove((field.y,field.x))
-                        self.piece_cords.append((move[0],move[1]))
-                        self.make_move(field.y,field.x,move[0],move[1])
-                        self.is_in_check(turn)
-                        if not self.incheck:
-                            legal_cords.append(move)
-                        self.board_state[field.y][field.x].figure = figure1
-                        self.board_state[move[0]][move[1]].figure = figure2
-                        self.piece_cords.remove((move[0],move[1]))
-                        self.piece_cords.append((field.y,field.x))
+                target = state[move[0]][move[1]]
+                if target.figure and target.figure.type == 'K':
+                    continue
+                if not self.is_attacked(target, turn):
+                    legal_cords.append(move)
+            field.figure = figure
             # Sprawdzanie roszady
-            if field.figure.type == "K":
-                self.is_in_check(turn)
-                if not self.incheck:
-                    j =-1
-                    for x_to_check in [0,7]:
-                        if self.board_state[field.y][x_to_check].figure:
-                            if self.board_state[field.y][x_to_check].figure.type == 'R' and self.board_state[field.y][x_to_check].figure.color == field.figure.color:
-                                if field.figure.has_moved == False and self.board_state[field.y][x_to_check].figure.has_moved == False:
-                                    space_free = True
-                                    tile_to_check_y = field.y
-                                    for i in range(1,(field.x - x_to_check)*(-j)):
-                                        tile_to_check_x = field.x + i * j
-                                        if self.board_state[tile_to_check_y][tile_to_check_x].figure or self.is_attacked(self.board_state[tile_to_check_y][tile_to_check_x],turn):
-                                            space_free = False
-                                    if space_free:
-                                        legal_cords.append((field.y,x_to_check))
-                        j = 1 
+            if not checkers and not figure.has_moved and not captures_only:
+                for rook_x in (0, 7):
+                    rook = state[field.y][rook_x].figure
+                    if not rook or rook.type != 'R' or rook.color != turn or rook.has_moved or abs(rook_x - field.x) < 3:
+                        continue
+                    direction = -1 if rook_x < field.x else 1
+                    between = range(field.x + direction, rook_x, direction)
+                    if any(state[field.y][x].figure for x in between):
+                        continue
+                    # Król nie może przejść przez pole atakowane ani na nim stanąć
+                    if any(self.is_attacked(state[field.y][field.x + i * direction], turn) for i in (1, 2)):
+                        continue
+                    legal_cords.append((field.y, rook_x))
             return legal_cords
-        
+        if len(checkers) > 1:
+            return []
+        allowed = checkers[0] if checkers else None
+        pin = pins.get((field.y, field.x))
+        if pin is not None:
+            allowed = pin if allowed is None else allowed & pin
+        for move in possible_moves:
+            target = state[move[0]][move[1]].figure
+            if target is None and figure.type == 'p' and move[1] != field.x:
+                if self.is_enpassant_legal(field, move, turn):
+                    legal_cords.append(move)
+            elif target and target.type == 'K':
+                continue
+            elif allowed is None or move in allowed:
+                legal_cords.append(move)
+        return legal_cords
+
+    def is_enpassant_legal(self, field: Field, move: tuple[int, int], turn: str) -> bool:
+        """
+        Sprawdza bicie w przelocie, wykonując je chwilowo na planszy.
+
+        Bicie zdejmuje z linii dwa pionki naraz, więc nie wystarczy sprawdzić związań
+        (np. król i wieża przeciwnika na tym samym rzędzie co oba pionki).
+
+        Args:
+            field (Field): Pole bijącego pionka.
+            move (tuple[int, int]): Pole docelowe bicia.
+            turn (str): Kolor bijącego pionka.
+
+        Returns:
+            bool: True, jeśli po biciu król nie jest szachowany.
+        """
+        state = self.board_state
+        captured_field = state[field.y][move[1]]
+        pawn = field.figure
+        captured = captured_field.figure
+        field.figure = None
+        captured_field.figure = None
+        state[move[0]][move[1]].figure = pawn
+        king_y, king_x = self.king_cords[turn]
+        legal = not self.is_attacked(state[king_y][king_x], turn)
+        state[move[0]][move[1]].figure = None
+        captured_field.figure = captured
+        field.figure = pawn
+        return legal
+
     def print_board(self) -> None:
         """
         Wyświetla aktualny stan planszy w terminalu.
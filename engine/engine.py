@@ -1,6 +1,7 @@
 import engine.figures as figures
 import engine.board_and_fields as board_and_fields
 import engine.fen_operations as fen_operations
+import engine.zobrist as zobrist
 import copy
 def notation_to_cords(board, notation: str, turn: str):
     """
@@ -51,41 +52,40 @@ def notation_to_cords(board, notation: str, turn: str):
             break
     #Szukanie figur określonych w notacji
     candidate_figures = []
-    for cord in board.piece_cords:
-                figure = board.board_state[cord[0]][cord[1]].figure 
-                if figure.color == turn and figure.type == notation[0]:
-                    #Dostosowanie pól do sprawdzenia dla pionków
-                    directions_to_check = copy.copy(movescheme)
-                    if notation[0] == 'p':
-                        if figure.has_moved:
-                            directions_to_check[1] = (0,0,0) #zamiast usuwać ten kierunek, ustawiamy go na (0,0,0), aby zachować spójność indeksów
-                        if "x" in notation:
-                            directions_to_check[0] = (0,0,0)
-                            directions_to_check[1] = (0,0,0)
-                        elif not figure.can_enpassant:
-                            directions_to_check[2] = (0,0,0)
-                            directions_to_check[3] = (0,0,0)
-                    #Sprawdzanie, czy pole docelowe jest w ruchach danej figury
-                    for direction in directions_to_check:
-                        for distance in range(1,direction[2]+1):
-                            field_to_check_x = cord[1] + direction[1] * distance
-                            field_to_check_y= cord[0] + direction[0] * distance
-                            #Sprawdzanie, czy koordynaty pola nie wyszły poza szachownicę
-                            if field_to_check_y > 7 or field_to_check_y < 0 or field_to_check_x > 7 or field_to_check_x < 0:
-                                break
-                            field_to_check = board.board_state[field_to_check_y][field_to_check_x]
-                            #Sprawdzanie czy na docelowym polu jest jakaś figura i czy zgadza się z notacją
-                            if field_to_check == target_field:
-                                if notation[2] == "x" and notation[0] == "p":
-                                    #sprawdzamy specjalny przypadek - en passant
-                                    if not target_field.figure and figure.can_enpassant:
-                                        candidate_figures.append((cord[0],cord[1]))
-                                if field_to_check.figure and "x" in notation:
-                                    candidate_figures.append((cord[0],cord[1]))
-                                elif field_to_check.figure == None and "x" not in notation:
-                                    candidate_figures.append((cord[0],cord[1]))
-                            if field_to_check.figure:
-                                break
+    for cord in board.piece_lists[turn].get(notation[0], ()):
+        figure = board.board_state[cord[0]][cord[1]].figure
+        #Dostosowanie pól do sprawdzenia dla pionków
+        directions_to_check = copy.copy(movescheme)
+        if notation[0] == 'p':
+            if figure.has_moved:
+                directions_to_check[1] = (0,0,0) #zamiast usuwać ten kierunek, ustawiamy go na (0,0,0), aby zachować spójność indeksów
+            if "x" in notation:
+                directions_to_check[0] = (0,0,0)
+                directions_to_check[1] = (0,0,0)
+            elif not figure.can_enpassant:
+                directions_to_check[2] = (0,0,0)
+                directions_to_check[3] = (0,0,0)
+        #Sprawdzanie, czy pole docelowe jest w ruchach danej figury
+        for direction in directions_to_check:
+            for distance in range(1,direction[2]+1):
+                field_to_check_x = cord[1] + direction[1] * distance
+                field_to_check_y= cord[0] + direction[0] * distance
+                #Sprawdzanie, czy koordynaty pola nie wyszły poza szachownicę
+                if field_to_check_y > 7 or field_to_check_y < 0 or field_to_check_x > 7 or field_to_check_x < 0:
+                    break
+                field_to_check = board.board_state[field_to_check_y][field_to_check_x]
+                #Sprawdzanie czy na docelowym polu jest jakaś figura i czy zgadza się z notacją
+                if field_to_check == target_field:
+                    if notation[2] == "x" and notation[0] == "p":
+                        #sprawdzamy specjalny przypadek - en passant
+                        if not target_field.figure and figure.can_enpassant:
+                            candidate_figures.append((cord[0],cord[1]))
+                    if field_to_check.figure and "x" in notation:
+                        candidate_figures.append((cord[0],cord[1]))
+                    elif field_to_check.figure == None and "x" not in notation:
+                        candidate_figures.append((cord[0],cord[1]))
+                if field_to_check.figure:
+                    break
     if len(candidate_figures) > 1:
         if notation[1].isdigit():
             spec = notation[1] -1
@@ -131,6 +131,11 @@ Returns:
         halfmove_reset = False
     if(y2,x2) in main_board.get_legal_moves(start_tile,turn):
         color_to_check = 'b' if start_tile.figure.color == 'w' else 'b'
+        #Dane do przyrostowej aktualizacji odcisku pozycji
+        key = main_board.hash
+        old_rights = zobrist.castling_rights(main_board)
+        old_ep = zobrist.enpassant_file(main_board, turn)
+        new_ep = -1
         main_board.moves_algebraic += [chr(104 - x2) + str(y2+1)]
         if destination_tile.figure:
             main_board.moves_algebraic[-1] = chr(104 - x1) +  'x' + main_board.moves_algebraic[-1]
@@ -148,15 +153,16 @@ Returns:
                 destination_tile.figure.has_moved = True
                 #Zmiana pozycji króla
                 direction =  -1 if destination_tile.x - start_tile.x < 0 else 1
+                key ^= (zobrist.piece_key(start_tile.figure, y1, x1) ^ zobrist.piece_key(start_tile.figure, y1, x1 + 2*direction)
+                        ^ zobrist.piece_key(destination_tile.figure, y2, x2) ^ zobrist.piece_key(destination_tile.figure, y1, x1 + direction))
                 main_board.board_state[start_tile.y][start_tile.x + 2*direction].figure = start_tile.figure
                 #Zmiana pozycji wieży
                 main_board.board_state[start_tile.y][start_tile.x + direction].figure = destination_tile.figure
+                main_board.move_piece(start_tile.figure, (start_tile.y, start_tile.x), (start_tile.y, start_tile.x + 2*direction))
+                main_board.move_piece(destination_tile.figure, (destination_tile.y, destination_tile.x), (start_tile.y, start_tile.x + direction))
                 destination_tile.figure = None
                 start_tile.figure = None
-                main_board.piece_cords.remove((start_tile.y, start_tile.x))
-                main_board.piece_cords.remove((destination_tile.y,destination_tile.x))
-                main_board.piece_cords.append((start_tile.y,start_tile.x + 2*direction))
-                main_board.piece_cords.append((start_tile.y,start_tile.x + direction))
+                main_board.king_cords[turn] = (start_tile.y, start_tile.x + 2*direction)
                 if start_tile.y - destination_tile.y == 3:
                     main_board.moves_algebraic[-1] = "O-O"
                     main_board.moves_algebraic_long[-1] = "O-O"
@@ -164,6 +170,9 @@ Returns:
                     main_board.moves_algebraic[-1] = "O-O-O"
                     main_board.moves_algebraic_long[-1] = "O-O-O"
 
+                main_board.hash = (key ^ zobrist.CASTLING_KEYS[old_rights] ^ zobrist.CASTLING_KEYS[zobrist.castling_rights(main_board)]
+                                   ^ zobrist.EN_PASSANT_KEYS[old_ep] ^ zobrist.SIDE_KEY)
+                main_board.hash_history.append(main_board.hash)
                 main_board.fen_history.append(fen_operations.board_to_fen_inverted(main_board, "b" if turn == 'w' else "w", halfmove_reset, passed_over_tile))
                 return True
         #Wykonanie enpassant
@@ -172,14 +181,22 @@ Returns:
                 if main_board.board_state[start_tile.y][destination_tile.x].figure.type == 'p':
                         if start_tile.figure.can_enpassant:
                             start_tile.figure.can_enpassant = 0
+                            key ^= zobrist.piece_key(main_board.board_state[start_tile.y][destination_tile.x].figure, start_tile.y, destination_tile.x)
+                            main_board.remove_piece(main_board.board_state[start_tile.y][destination_tile.x].figure, (start_tile.y, destination_tile.x))
                             main_board.board_state[start_tile.y][destination_tile.x].figure = None
                             main_board.moves_algebraic[-1] = chr(104 - x1) + main_board.moves_algebraic[-1]
                             main_board.moves_algebraic_long[-1] = chr(104-x1)+str(y1+1)+'x'+chr(104-x2)+str(y2+1)
-                            main_board.piece_cords.remove((start_tile.y, destination_tile.x))
+        if destination_tile.figure:
+            key ^= zobrist.piece_key(destination_tile.figure, y2, x2)
+        key ^= zobrist.piece_key(start_tile.figure, y1, x1) ^ zobrist.piece_key(start_tile.figure, y2, x2)
+        if passed_over_tile != (-1,-1):
+            #Bicie w przelocie będzie możliwe, jeśli obok stoi pionek przeciwnika (flagi ustawia afterMove)
+            for neighbour_x in (x2 - 1, x2 + 1):
+                if 0 <= neighbour_x <= 7:
+                    neighbour = main_board.board_state[y2][neighbour_x].figure
+                    if neighbour and neighbour.type == 'p' and neighbour.color != start_tile.figure.color:
+                        new_ep = x2
         main_board.make_move(y1, x1, y2, x2)
-        main_board.piece_cords.remove((y1,x1))
-        if (y2,x2) not in main_board.piece_cords:
-            main_board.piece_cords.append((y2,x2))
         if destination_tile.figure:
             if destination_tile.figure.type in ['p','K','R']:
                 destination_tile.figure.has_moved = True
@@ -190,6 +207,9 @@ Returns:
         if main_board.incheck:
             main_board.moves_algebraic[-1] += '+'
             main_board.moves_algebraic_long[-1] += '+'
+        main_board.hash = (key ^ zobrist.CASTLING_KEYS[old_rights] ^ zobrist.CASTLING_KEYS[zobrist.castling_rights(main_board)]
+                           ^ zobrist.EN_PASSANT_KEYS[old_ep] ^ zobrist.EN_PASSANT_KEYS[new_ep] ^ zobrist.SIDE_KEY)
+        main_board.hash_history.append(main_board.hash)
         main_board.fen_history.append(fen_operations.board_to_fen_inverted(main_board, "b" if turn == 'w' else "w", halfmove_reset, passed_over_tile))
         return True
     else: 
@@ -203,6 +223,7 @@ def undoMove(main_board: board_and_fields.Board) -> bool:
     if len(main_board.fen_history) > 1:
         fen_operations.fen_to_board(main_board.fen_history[-2],main_board)
         main_board.fen_history.pop()
+        main_board.hash_history.pop()
         main_board.print_board()
         main_board.moves_algebraic.pop()
         return True
@@ -226,22 +247,16 @@ def afterMove(turn: str, board, y1: int, x1: int, y2: int, x2: int) -> str:
     """
     start_tile = board.board_state[y1][x1]
     destination_tile = board.board_state[y2][x2]
+    #Flagi enpassant są ważne tylko przez jeden ruch, więc kasujemy je przed liczeniem ruchów
+    for color in ('w', 'b'):
+        for cord in board.piece_lists[color]['p']:
+            board.board_state[cord[0]][cord[1]].figure.can_enpassant = 0
+    only_kings = not any(cords for color in ('w', 'b') for piece_type, cords in board.piece_lists[color].items() if piece_type != 'K')
     available_moves = []
-    only_kings = True 
-    i=0
-    while i < len(board.piece_cords):
-        cord = board.piece_cords[i]
-        field = board.board_state[cord[0]][cord[1]]
-        if field.figure.color == turn:
-            available_moves+=board.get_legal_moves(field,turn)
-        if field.figure.type == 'p':
-            #Sprawdzanie flag enpassant
-            if field.figure.can_enpassant:
-                field.figure.can_enpassant = 0
-        if field.figure.type != 'K':
-            only_kings = False
-        i +=1 
-        board.piece_cords.sort()
+    check_info = board.get_checks_and_pins(turn)
+    for cords in board.piece_lists[turn].values():
+        for cord in cords:
+            available_moves += board.get_legal_moves(board.board_state[cord[0]][cord[1]], turn, check_info)
     if only_kings:
         return ("stalemate",0,0)
     if available_moves == []:
@@ -291,7 +306,8 @@ def promotion(y: int, x: int, main_board: board_and_fields.Board, choice: str) -
     Raises:
         ValueError: If the choice is invalid.
     """
-    color = main_board.board_state[y][x].figure.color
+    pawn = main_board.board_state[y][x].figure
+    color = pawn.color
     if choice == "1":
         main_board.board_state[y][x].figure = figures.Knight(color)
     elif choice == "2":
@@ -302,6 +318,10 @@ def promotion(y: int, x: int, main_board: board_and_fields.Board, choice: str) -
         main_board.board_state[y][x].figure = figures.Queen(color)
     else:
         raise ValueError("Invalid promotion choice. Please select '1', '2', '3', or '4'.")
+    main_board.remove_piece(pawn, (y, x))
+    main_board.add_piece(main_board.board_state[y][x].figure, (y, x))
+    main_board.hash ^= zobrist.piece_key(pawn, y, x) ^ zobrist.piece_key(main_board.board_state[y][x].figure, y, x)
+    main_board.hash_history[-1] = main_board.hash
     
 def save_in_short_algebraic(board, winner, result):
     """
@@ -1,5 +1,6 @@
 import engine.figures as figures
 import engine.board_and_fields as board_and_fields
+import engine.zobrist as zobrist
 def fen_to_board(fen:str, board):
     """Z fena zwraca listę obiektów. Należy zastosować tak:
 
@@ -56,6 +57,8 @@ main_board = board_and_fields.Board(board_state)
         char += -1
     turn = fen[char - 1]
     rook_positions = {(0,0):"K", (0,7):"Q",(7,0):"k",(7,7):"q"}
+    #Flagi są ustawiane dla figur z nowej pozycji, więc listy figur budujemy przed pętlą
+    board.rebuild_piece_lists()
     for cord in board.piece_cords:
         field = board.board_state[cord[0]][cord[1]]
         if field.figure:
@@ -67,22 +70,19 @@ main_board = board_and_fields.Board(board_state)
             elif field.figure.type == "K":
                 if field.figure.color == "w" and ("K" not in castling_str and "Q" not in castling_str):
                     field.figure.has_moved = True
-                elif ("k" not in castling_str and "k" not in castling_str):
+                elif field.figure.color == "b" and ("k" not in castling_str and "q" not in castling_str):
                     field.figure.has_moved = True
             elif field.figure.type == "p":
                 if field.figure.color == turn:
                     direction = 1 if turn == "w" else -1
-                    if passed_over_tile[0] - cord[0] == direction:
+                    if passed_over_tile[0] - cord[0] == direction and passed_over_tile[1] - cord[1] in (-1, 1):
                         field.figure.can_enpassant = passed_over_tile[1] - (cord[1])
                 if field.figure.color == "w" and field.y != 1:
                     field.figure.has_moved = True
                 elif field.figure.color == "b" and field.y != 6:
                     field.figure.has_moved = True
-    board.piece_cords = []
-    for row in range(0,8):
-        for col in range(0,8):
-            if board.board_state[row][col].figure:
-                board.piece_cords.append((row, col))
+    board.locate_kings()
+    board.hash = zobrist.hash_board(board, fen.split()[1])
 
 def board_to_fen(board_state:list)->str:
     """Z listy obiektów zwraca fena. Zastosowanie: tylko dla board_makera, nie dla czegokolwiek innego, bo:
@@ -1,183 +1,202 @@
 """
 This module contains classes representing chess pieces.
 
-Each piece has unique properties such as type, color, movement scheme, 
+Each piece has unique properties such as type, color, movement scheme,
 and additional attributes (e.g., castling rights or en passant capability).
+
+Type and color data (movement schemes, string representation) live in shared, immutable
+descriptors created once at import. Piece objects only keep their own state in __slots__,
+so creating, copying and pickling them is cheap.
 """
+from typing import NamedTuple
+
 
-class Pawn:
+class PieceDescriptor(NamedTuple):
     """
-    Represents a pawn in chess.
+    Immutable data shared by all pieces of the same type and color.
+
+    Attributes:
+        type (str): Piece type ('p', 'R', 'N', 'B', 'Q', 'K').
+        color (str): Piece color ('w' or 'b').
+        name (str): String representation (e.g., "wp").
+        move_scheme (tuple): Movement directions as (dx, dy, max_distance).
+        attack_scheme (tuple): Capture directions as (dx, dy, max_distance).
+        first_move_scheme (tuple): Movement directions for a piece that has not moved yet.
     """
-    def __init__(self, color):
-        """
-        Initializes a pawn.
+    type: str
+    color: str
+    name: str
+    move_scheme: tuple
+    attack_scheme: tuple
+    first_move_scheme: tuple
 
-        Args:
-            color (str): The color of the pawn ('w' for white, 'b' for black).
-        """
-        self.type = 'p'
-        self.color = color
-        self.has_moved = False
-        self.can_enpassant = 0  # Direction of possible en passant on the x-axis; 0 means no en passant possible.
-        if color == 'w': 
-            self.move_scheme = [(0, 1, 1)]
-            self.attack_scheme = [(1, 1, 1), (-1, 1, 1)]
-        elif color == 'b':
-            self.move_scheme = [(0, -1, 1)]
-            self.attack_scheme = [(-1, -1, 1), (1, -1, 1)]
+    def __copy__(self):
+        return self
 
-    def return_figure(self):
-        """
-        Returns the string representation of the pawn.
+    def __deepcopy__(self, memo):
+        return self
 
-        Returns:
-            str: Representation of the pawn (e.g., "wp" for a white pawn).
-        """
-        return self.color + self.type
+    def __reduce__(self):
+        # Unpickled pieces (e.g. in the Minimax process) point to the same shared descriptor
+        return get_descriptor, (self.type, self.color)
 
-    def print_figure(self):
-        """
-        Prints the string representation of the pawn to the terminal.
-        """
-        print(self.color + self.type, end="")
+
+_STRAIGHT = ((0, 1, 8), (0, -1, 8), (1, 0, 8), (-1, 0, 8))
+_DIAGONAL = ((1, 1, 8), (1, -1, 8), (-1, 1, 8), (-1, -1, 8))
+_KNIGHT = ((2, 1, 1), (-2, 1, 1), (2, -1, 1), (-2, -1, 1), (1, 2, 1), (1, -2, 1), (-1, 2, 1), (-1, -2, 1))
+_KING = ((1, 1, 1), (1, -1, 1), (-1, 1, 1), (-1, -1, 1), (0, 1, 1), (0, -1, 1), (1, 0, 1), (-1, 0, 1))
 
 
-class Rook:
+def _descriptor(piece_type: str, color: str, move_scheme: tuple, attack_scheme: tuple = None,
+                first_move_scheme: tuple = None) -> PieceDescriptor:
     """
-    Represents a rook in chess.
+    Creates a descriptor; the attack and first move schemes default to the move scheme.
     """
-    def __init__(self, color):
-        """
-        Initializes a rook.
+    return PieceDescriptor(piece_type, color, color + piece_type, move_scheme,
+                           attack_scheme or move_scheme, first_move_scheme or move_scheme)
 
-        Args:
-            color (str): The color of the rook ('w' for white, 'b' for black).
-        """
-        self.has_moved = False  
-        self.type = 'R'
-        self.color = color
-        self.move_scheme = [(0, 1, 8), (0, -1, 8), (1, 0, 8), (-1, 0, 8)]
 
-    def return_figure(self):
-        """
-        Returns the string representation of the rook.
+# DESCRIPTORS[(type, color)]
+DESCRIPTORS = {}
+for _color in ('w', 'b'):
+    _dy = 1 if _color == 'w' else -1
+    DESCRIPTORS[('p', _color)] = _descriptor('p', _color, ((0, _dy, 1),), ((1, _dy, 1), (-1, _dy, 1)), ((0, _dy, 2),))
+    DESCRIPTORS[('R', _color)] = _descriptor('R', _color, _STRAIGHT)
+    DESCRIPTORS[('N', _color)] = _descriptor('N', _color, _KNIGHT)
+    DESCRIPTORS[('B', _color)] = _descriptor('B', _color, _DIAGONAL)
+    DESCRIPTORS[('Q', _color)] = _descriptor('Q', _color, _DIAGONAL + _STRAIGHT)
+    DESCRIPTORS[('K', _color)] = _descriptor('K', _color, _KING)
 
-        Returns:
-            str: Representation of the rook (e.g., "wR" for a white rook).
-        """
-        return self.color + self.type
 
-    def print_figure(self):
-        """
-        Prints the string representation of the rook to the terminal.
-        """
-        print(self.color + self.type, end="")
+def get_descriptor(piece_type: str, color: str) -> PieceDescriptor:
+    """
+    Returns the shared descriptor for a piece type and color.
 
+    Args:
+        piece_type (str): Piece type ('p', 'R', 'N', 'B', 'Q', 'K').
+        color (str): Piece color ('w' or 'b').
 
-class Knight:
+    Returns:
+        PieceDescriptor: The shared descriptor.
     """
-    Represents a knight in chess.
+    return DESCRIPTORS[(piece_type, color)]
+
+
+class Figure:
     """
+    Base class of all pieces. Keeps the color and a reference to the shared descriptor.
+    """
+    __slots__ = ('color', 'descriptor')
+    type = None
+
     def __init__(self, color):
         """
-        Initializes a knight.
+        Initializes a piece.
 
         Args:
-            color (str): The color of the knight ('w' for white, 'b' for black).
+            color (str): The color of the piece ('w' for white, 'b' for black).
         """
-        self.type = 'N'
         self.color = color
-        self.move_scheme = [
-            (2, 1, 1), (-2, 1, 1), (2, -1, 1), (-2, -1, 1),
-            (1, 2, 1), (1, -2, 1), (-1, 2, 1), (-1, -2, 1)
-        ]
+        self.descriptor = DESCRIPTORS[(self.type, color)]
+
+    @property
+    def move_scheme(self):
+        """
+        Movement directions of the piece, shared with other pieces of the same type and color.
+        """
+        return self.descriptor.move_scheme
+
+    @property
+    def attack_scheme(self):
+        """
+        Capture directions of the piece, shared with other pieces of the same type and color.
+        """
+        return self.descriptor.attack_scheme
 
     def return_figure(self):
         """
-        Returns the string representation of the knight.
+        Returns the string representation of the piece.
 
         Returns:
-            str: Representation of the knight (e.g., "wN" for a white knight).
+            str: Representation of the piece (e.g., "wp" for a white pawn).
         """
-        return self.color + self.type
+        return self.descriptor.name
 
     def print_figure(self):
         """
-        Prints the string representation of the knight to the terminal.
+        Prints the string representation of the piece to the terminal.
         """
-        print(self.color + self.type, end="")
+        print(self.descriptor.name, end="")
 
 
-class Bishop:
+class Pawn(Figure):
     """
-    Represents a bishop in chess.
+    Represents a pawn in chess.
     """
+    __slots__ = ('has_moved', 'can_enpassant')
+    type = 'p'
+
     def __init__(self, color):
         """
-        Initializes a bishop.
+        Initializes a pawn.
 
         Args:
-            color (str): The color of the bishop ('w' for white, 'b' for black).
+            color (str): The color of the pawn ('w' for white, 'b' for black).
         """
-        self.type = 'B'
-        self.color = color
-        self.move_scheme = [(1, 1, 8), (1, -1, 8), (-1, 1, 8), (-1, -1, 8)]
+        super().__init__(color)
+        self.has_moved = False
+        self.can_enpassant = 0  # Direction of possible en passant on the x-axis; 0 means no en passant possible.
 
-    def return_figure(self):
-        """
-        Returns the string representation of the bishop.
 
-        Returns:
-            str: Representation of the bishop (e.g., "wB" for a white bishop).
-        """
-        return self.color + self.type
+class Rook(Figure):
+    """
+    Represents a rook in chess.
+    """
+    __slots__ = ('has_moved',)
+    type = 'R'
 
-    def print_figure(self):
+    def __init__(self, color):
         """
-        Prints the string representation of the bishop to the terminal.
+        Initializes a rook.
+
+        Args:
+            color (str): The color of the rook ('w' for white, 'b' for black).
         """
-        print(self.color + self.type, end="")
+        super().__init__(color)
+        self.has_moved = False
 
 
-class Queen:
+class Knight(Figure):
     """
-    Represents a queen in chess.
+    Represents a knight in chess.
     """
-    def __init__(self, color):
-        """
-        Initializes a queen.
+    __slots__ = ()
+    type = 'N'
 
-        Args:
-            color (str): The color of the queen ('w' for white, 'b' for black).
-        """
-        self.type = 'Q'
-        self.color = color
-        self.move_scheme = [
-            (1, 1, 8), (1, -1, 8), (-1, 1, 8), (-1, -1, 8),
-            (0, 1, 8), (0, -1, 8), (1, 0, 8), (-1, 0, 8)
-        ]
 
-    def return_figure(self):
-        """
-        Returns the string representation of the queen.
+class Bishop(Figure):
+    """
+    Represents a bishop in chess.
+    """
+    __slots__ = ()
+    type = 'B'
 
-        Returns:
-            str: Representation of the queen (e.g., "wQ" for a white queen).
-        """
-        return self.color + self.type
 
-    def print_figure(self):
-        """
-        Prints the string representation of the queen to the terminal.
-        """
-        print(self.color + self.type, end="")
+class Queen(Figure):
+    """
+    Represents a queen in chess.
+    """
+    __slots__ = ()
+    type = 'Q'
 
 
-class King:
+class King(Figure):
     """
     Represents a king in chess.
     """
+    __slots__ = ('has_moved',)
+    type = 'K'
+
     def __init__(self, color):
         """
         Initializes a king.
@@ -185,25 +204,5 @@ class King:
         Args:
             color (str): The color of the king ('w' for white, 'b' for black).
         """
+        super().__init__(color)
         self.has_moved = False
-        self.type = 'K'
-        self.color = color
-        self.move_scheme = [
-            (1, 1, 1), (1, -1, 1), (-1, 1, 1), (-1, -1, 1),
-            (0, 1, 1), (0, -1, 1), (1, 0, 1), (-1, 0, 1)
-        ]
-
-    def return_figure(self):
-        """
-        Returns the string representation of the king.
-
-        Returns:
-            str: Representation of the king (e.g., "wK" for a white king).
-        """
-        return self.color + self.type
-
-    def print_figure(self):
-        """
-        Prints the string representation of the king to the terminal.
-        """
-        print(self.color + self.type, end="")
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+Moduł zawiera zwarty zapis ruchu jako 16-bitowej liczby całkowitej oraz konwersje do innych notacji.
+
+Układ bitów:
+    0-5   pole startowe (y*8 + x)
+    6-11  pole docelowe (y*8 + x)
+    12-15 flaga: NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLING albo promocja (PROMOTION + figura)
+
+Roszada jest zapisywana tak jak w Board: ruch króla na pole własnej wieży. Numery flag są takie
+same jak w engine.bitboard, a promocje zajmują flagi 4-7 (skoczek, goniec, wieża, hetman).
+Ruch 0 (NULL_MOVE) nie jest poprawnym ruchem i oznacza jego brak.
+
+Funkcje, które potrzebują pozycji, korzystają tylko z get_piece, get_all_moves, push i pop,
+więc działają zarówno z Board, jak i z BitBoard.
+"""
+import re
+
+NULL_MOVE = 0
+
+NORMAL = 0
+DOUBLE_PUSH = 1
+EN_PASSANT = 2
+CASTLING = 3
+PROMOTION = 4
+
+# Figury promocji w kolejności flag (PROMOTION + indeks)
+PROMOTION_PIECES = ('N', 'B', 'R', 'Q')
+# Wybór promocji w engine.promotion: '1' - skoczek, '2' - goniec, '3' - wieża, '4' - hetman
+PROMOTION_CHOICES = ('1', '2', '3', '4')
+
+FILES = 'hgfedcba'
+
+
+def encode(y1: int, x1: int, y2: int, x2: int, flag: int = NORMAL) -> int:
+    """
+    Pakuje ruch do liczby całkowitej.
+
+    Args:
+        y1 (int): Wiersz pola startowego.
+        x1 (int): Kolumna pola startowego.
+        y2 (int): Wiersz pola docelowego.
+        x2 (int): Kolumna pola docelowego.
+        flag (int, opcjonalnie): Flaga ruchu.
+
+    Returns:
+        int: Ruch zapisany na 16 bitach.
+    """
+    return (y1 * 8 + x1) | ((y2 * 8 + x2) << 6) | (flag << 12)
+
+
+def encode_with_choice(y1: int, x1: int, y2: int, x2: int, choice: str = None) -> int:
+    """
+    Pakuje ruch z wyborem promocji z engine.promotion ('1'-'4').
+
+    Nie korzysta z pozycji, więc działa także dla ruchu, który został już wykonany. Flagi
+    roszady, bicia w przelocie i podwójnego ruchu pionka nie są ustawiane; tryMove rozpoznaje
+    je sam na podstawie współrzędnych.
+    """
+    flag = PROMOTION + PROMOTION_CHOICES.index(choice) if choice else NORMAL
+    return encode(y1, x1, y2, x2, flag)
+
+
+def decode(move: int) -> tuple[int, int, int, int, int]:
+    """
+    Rozpakowuje ruch.
+
+    Returns:
+        tuple: (y1, x1, y2, x2, flaga)
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    return from_sq >> 3, from_sq & 7, to_sq >> 3, to_sq & 7, move >> 12
+
+
+def to_cords(move: int) -> tuple[int, int, int, int]:
+    """
+    Zwraca współrzędne ruchu (y1, x1, y2, x2), w formacie używanym przez tryMove.
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    return from_sq >> 3, from_sq & 7, to_sq >> 3, to_sq & 7
+
+
+def flag_of(move: int) -> int:
+    """
+    Zwraca flagę ruchu.
+    """
+    return move >> 12
+
+
+def promotion_piece(move: int) -> str:
+    """
+    Zwraca typ figury promocji ('N', 'B', 'R', 'Q') albo None, jeśli ruch nie jest promocją.
+    """
+    flag = move >> 12
+    return PROMOTION_PIECES[flag - PROMOTION] if flag >= PROMOTION else None
+
+
+def promotion_choice(move: int) -> str:
+    """
+    Zwraca wybór promocji dla engine.promotion ('1'-'4'); dla ruchów bez promocji hetmana ('4').
+    """
+    flag = move >> 12
+    return PROMOTION_CHOICES[flag - PROMOTION] if flag >= PROMOTION else '4'
+
+
+def to_tuple(move: int) -> tuple:
+    """
+    Zamienia ruch na krotkę przyjmowaną przez Board.push.
+
+    Returns:
+        tuple: (y1, x1, y2, x2) lub (y1, x1, y2, x2, promocja) dla promocji.
+    """
+    y1, x1, y2, x2, flag = decode(move)
+    if flag >= PROMOTION:
+        return y1, x1, y2, x2, PROMOTION_PIECES[flag - PROMOTION]
+    return y1, x1, y2, x2
+
+
+def from_tuple(position, move: tuple) -> int:
+    """
+    Pakuje ruch podany jako krotka, odczytując flagę z pozycji przed ruchem.
+
+    Args:
+        position: Pozycja (Board lub BitBoard).
+        move (tuple): (y1, x1, y2, x2) lub (y1, x1, y2, x2, promocja); domyślna promocja to hetman.
+
+    Returns:
+        int: Spakowany ruch.
+    """
+    y1, x1, y2, x2 = move[:4]
+    piece = position.get_piece(y1, x1)
+    target = position.get_piece(y2, x2)
+    flag = NORMAL
+    if piece[1] == 'K' and target == piece[0] + 'R':
+        flag = CASTLING
+    elif piece[1] == 'p':
+        if y2 in (0, 7):
+            choice = move[4] if len(move) > 4 and move[4] else 'Q'
+            flag = PROMOTION + PROMOTION_PIECES.index(choice)
+        elif x1 != x2 and target == "--":
+            flag = EN_PASSANT
+        elif y2 - y1 in (2, -2):
+            flag = DOUBLE_PUSH
+    return encode(y1, x1, y2, x2, flag)
+
+
+def from_move_dict(position, all_moves: dict) -> list[int]:
+    """
+    Zamienia słownik ruchów z get_all_moves na płaską listę spakowanych ruchów.
+
+    Każda promocja jest rozwijana na cztery ruchy (skoczek, goniec, wieża, hetman).
+
+    Args:
+        position: Pozycja (Board lub BitBoard), z której pochodzą ruchy.
+        all_moves (dict): {(y1, x1): [(y2, x2), ...]}
+
+    Returns:
+        list[int]: Lista spakowanych ruchów.
+    """
+    move_list = []
+    for (y1, x1), destinations in all_moves.items():
+        piece = position.get_piece(y1, x1)
+        from_sq = y1 * 8 + x1
+        for y2, x2 in destinations:
+            base = from_sq | ((y2 * 8 + x2) << 6)
+            if piece[1] == 'p':
+                if y2 in (0, 7):
+                    move_list.extend(base | ((PROMOTION + i) << 12) for i in range(4))
+                    continue
+                if x1 != x2 and position.get_piece(y2, x2) == "--":
+                    base |= EN_PASSANT << 12
+                elif y2 - y1 in (2, -2):
+                    base |= DOUBLE_PUSH << 12
+            elif piece[1] == 'K' and position.get_piece(y2, x2) == piece[0] + 'R':
+                base |= CASTLING << 12
+            move_list.append(base)
+    return move_list
+
+
+def square_name(y: int, x: int) -> str:
+    """
+    Zwraca nazwę pola (np. "e4").
+    """
+    return FILES[x] + str(y + 1)
+
+
+def to_uci(move: int) -> str:
+    """
+    Zapisuje ruch w notacji UCI (np. "e2e4", "e7e8q", roszada jako "e1g1").
+    """
+    y1, x1, y2, x2, flag = decode(move)
+    if flag == CASTLING:
+        x2 = x1 + (2 if x2 > x1 else -2)
+    uci = square_name(y1, x1) + square_name(y2, x2)
+    if flag >= PROMOTION:
+        uci += PROMOTION_PIECES[flag - PROMOTION].lower()
+    return uci
+
+
+def from_uci(position, uci: str) -> int:
+    """
+    Pakuje ruch zapisany w notacji UCI.
+
+    Args:
+        position: Pozycja (Board lub BitBoard) przed ruchem.
+        uci (str): Ruch, np. "g1f3", "e7e8q" albo "e1g1" dla roszady.
+
+    Returns:
+        int: Spakowany ruch.
+    """
+    x1, y1 = FILES.index(uci[0]), int(uci[1]) - 1
+    x2, y2 = FILES.index(uci[2]), int(uci[3]) - 1
+    if position.get_piece(y1, x1)[1] == 'K' and x2 - x1 in (2, -2):
+        # Roszada: król idzie o dwa pola, w Board zapisujemy ją jako ruch na pole wieży
+        x2 = 7 if x2 > x1 else 0
+    if len(uci) > 4:
+        return from_tuple(position, (y1, x1, y2, x2, uci[4].upper()))
+    return from_tuple(position, (y1, x1, y2, x2))
+
+
+def _san_without_check(position, move: int, turn: str, legal_moves: dict = None) -> str:
+    """
+    Zapisuje ruch w notacji SAN bez oznaczenia szachu i mata.
+    """
+    y1, x1, y2, x2, flag = decode(move)
+    piece = position.get_piece(y1, x1)[1]
+    if flag == CASTLING:
+        san = "O-O" if x2 < x1 else "O-O-O"
+    else:
+        capture = flag == EN_PASSANT or position.get_piece(y2, x2) != "--"
+        if piece == 'p':
+            san = (FILES[x1] + 'x' if capture else '') + square_name(y2, x2)
+            if flag >= PROMOTION:
+                san += '=' + PROMOTION_PIECES[flag - PROMOTION]
+        else:
+            if legal_moves is None:
+                legal_moves = position.get_all_moves(turn)
+            # Inne figury tego samego typu, które też mogą stanąć na polu docelowym
+            rivals = [cord for cord, destinations in legal_moves.items()
+                      if cord != (y1, x1) and position.get_piece(*cord)[1] == piece and (y2, x2) in destinations]
+            disambiguation = ''
+            if rivals:
+                if all(cord[1] != x1 for cord in rivals):
+                    disambiguation = FILES[x1]
+                elif all(cord[0] != y1 for cord in rivals):
+                    disambiguation = str(y1 + 1)
+                else:
+                    disambiguation = square_name(y1, x1)
+            san = piece + disambiguation + ('x' if capture else '') + square_name(y2, x2)
+    return san
+
+
+def to_san(position, move: int, turn: str, legal_moves: dict = None) -> str:
+    """
+    Zapisuje ruch w standardowej notacji algebraicznej (np. "Nbd2", "exd5", "e8=Q+", "O-O").
+
+    Args:
+        position: Pozycja (Board lub BitBoard) przed ruchem.
+        move (int): Spakowany ruch.
+        turn (str): Strona wykonująca ruch ('w' lub 'b').
+        legal_moves (dict, opcjonalnie): Wynik position.get_all_moves(turn), jeśli jest już policzony.
+
+    Returns:
+        str: Ruch w notacji SAN.
+    """
+    san = _san_without_check(position, move, turn, legal_moves)
+    opponent = 'b' if turn == 'w' else 'w'
+    position.push(to_tuple(move))
+    if position.is_in_check_minimax(opponent):
+        san += '#' if not position.get_all_moves(opponent) else '+'
+    position.pop()
+    return san
+
+
+def from_san(position, san: str, turn: str) -> int:
+    """
+    Wyszukuje ruch zapisany w notacji SAN wśród legalnych ruchów pozycji.
+
+    Args:
+        position: Pozycja (Board lub BitBoard).
+        san (str): Ruch w notacji SAN; znaki szachu, mata i komentarza (+, #, !, ?) są pomijane,
+            a promocja może być zapisana bez '=' (np. "bxa8Q", jak w książkach arcymistrzów).
+        turn (str): Strona wykonująca ruch ('w' lub 'b').
+
+    Returns:
+        int: Spakowany ruch albo NULL_MOVE, jeśli żaden legalny ruch nie pasuje.
+    """
+    wanted = san.rstrip('+#!?').replace('0', 'O')
+    wanted = re.sub(r'([a-h][18])([QRBN])$', r'\1=\2', wanted)
+    legal_moves = position.get_all_moves(turn)
+    for move in from_move_dict(position, legal_moves):
+        y1, x1, y2, x2, flag = decode(move)
+        # Szybkie odrzucenie ruchów na inne pole (nie dotyczy roszady)
+        if flag != CASTLING and not wanted.endswith(square_name(y2, x2)) and '=' not in wanted:
+            continue
+        if _san_without_check(position, move, turn, legal_moves) == wanted:
+            return move
+    return NULL_MOVE
@@ -0,0 +1,192 @@
+"""
+Moduł zawiera narzędzie perft do sprawdzania poprawności i szybkości generatora ruchów.
+
+Perft liczy wszystkie pozycje osiągalne z danej pozycji w zadanej liczbie półruchów.
+Wynik porównuje się ze znanymi wartościami dla standardowych pozycji testowych, a liczba
+węzłów na sekundę służy do śledzenia regresji wydajności. Narzędzie działa bez interfejsu
+graficznego i obsługuje każdy backend z metodami get_move_list, push i pop (ruchy spakowane, engine.moves).
+
+Użycie:
+    python -m engine.perft                              # zestaw standardowych pozycji
+    python -m engine.perft --fen "<FEN>" --depth 4      # podział (divide) dla jednej pozycji
+    python -m engine.perft --backend all                # porównanie Board i BitBoard
+"""
+import argparse
+import sys
+import time
+
+from engine.board_and_fields import Board
+from engine.bitboard import BitBoard, START_FEN
+from engine.fen_operations import fen_to_board
+import engine.moves as moves
+
+# (nazwa, FEN, {głębokość: liczba węzłów}) - wartości referencyjne z chessprogramming.org
+PERFT_SUITE = [
+    ("startpos", START_FEN,
+     {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    ("position 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    ("position 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    ("position 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+]
+
+def board_from_fen(fen: str) -> Board:
+    """
+    Tworzy obiekt Board z pozycji zapisanej w FEN.
+
+    Args:
+        fen (str): Pozycja w notacji FEN.
+
+    Returns:
+        Board: Plansza z ustawioną pozycją.
+    """
+    board = Board()
+    fen_to_board(fen, board)
+    return board
+
+
+# Nazwa backendu: funkcja tworząca pozycję z FEN
+BACKENDS = {
+    'board': board_from_fen,
+    'bitboard': BitBoard,
+}
+
+
+def perft(position, turn: str, depth: int) -> int:
+    """
+    Liczy liście drzewa ruchów o zadanej głębokości.
+
+    Args:
+        position: Pozycja (Board lub BitBoard), po zakończeniu w niezmienionym stanie.
+        turn (str): Strona na ruchu ('w' lub 'b').
+        depth (int): Liczba półruchów.
+
+    Returns:
+        int: Liczba węzłów na głębokości depth.
+    """
+    if depth == 0:
+        return 1
+    move_list = position.get_move_list(turn)
+    if depth == 1:
+        return len(move_list)
+    next_turn = 'b' if turn == 'w' else 'w'
+    nodes = 0
+    for move in move_list:
+        position.push(move)
+        nodes += perft(position, next_turn, depth - 1)
+        position.pop()
+    return nodes
+
+
+def divide(position, turn: str, depth: int) -> dict[str, int]:
+    """
+    Liczy perft osobno dla każdego ruchu z pozycji początkowej.
+
+    Args:
+        position: Pozycja (Board lub BitBoard).
+        turn (str): Strona na ruchu ('w' lub 'b').
+        depth (int): Liczba półruchów (co najmniej 1).
+
+    Returns:
+        dict[str, int]: Ruch w notacji UCI: liczba węzłów w jego poddrzewie.
+    """
+    next_turn = 'b' if turn == 'w' else 'w'
+    result = {}
+    for move in position.get_move_list(turn):
+        position.push(move)
+        result[moves.to_uci(move)] = perft(position, next_turn, depth - 1)
+        position.pop()
+    return result
+
+
+def timed_perft(position, turn: str, depth: int) -> tuple[int, float]:
+    """
+    Liczy perft i mierzy czas.
+
+    Returns:
+        tuple[int, float]: (liczba węzłów, czas w sekundach)
+    """
+    start = time.perf_counter()
+    nodes = perft(position, turn, depth)
+    return nodes, time.perf_counter() - start
+
+
+def run_divide(fen: str, depth: int, backend: str) -> int:
+    """
+    Wypisuje podział perft dla jednej pozycji, liczbę węzłów i węzły na sekundę.
+
+    Returns:
+        int: Liczba węzłów.
+    """
+    position = BACKENDS[backend](fen)
+    turn = fen.split()[1]
+    start = time.perf_counter()
+    result = divide(position, turn, depth)
+    elapsed = time.perf_counter() - start
+    for uci in sorted(result):
+        print(f"{uci}: {result[uci]}")
+    nodes = sum(result.values())
+    print(f"\n[{backend}] moves: {len(result)}  nodes: {nodes}  time: {elapsed:.3f}s  nps: {nodes / max(elapsed, 1e-9):.0f}")
+    return nodes
+
+
+def run_suite(backend: str, max_nodes: int) -> bool:
+    """
+    Uruchamia zestaw standardowych pozycji do największej głębokości nie przekraczającej max_nodes.
+
+    Args:
+        backend (str): Nazwa backendu z BACKENDS.
+        max_nodes (int): Limit liczby węzłów dla jednej pozycji.
+
+    Returns:
+        bool: True, jeśli wszystkie wyniki zgadzają się z wartościami referencyjnymi.
+    """
+    passed = True
+    total_nodes = 0
+    total_time = 0.0
+    print(f"=== perft suite: {backend} ===")
+    for name, fen, expected in PERFT_SUITE:
+        depths = [depth for depth, count in expected.items() if count <= max_nodes] or [1]
+        depth = max(depths)
+        position = BACKENDS[backend](fen)
+        nodes, elapsed = timed_perft(position, fen.split()[1], depth)
+        ok = nodes == expected[depth]
+        passed = passed and ok
+        total_nodes += nodes
+        total_time += elapsed
+        status = "OK" if ok else f"FAIL (expected {expected[depth]})"
+        print(f"{name:<12} depth {depth}  nodes {nodes:>9}  time {elapsed:7.3f}s  nps {nodes / max(elapsed, 1e-9):>9.0f}  {status}")
+    print(f"total nodes {total_nodes}  time {total_time:.3f}s  nps {total_nodes / max(total_time, 1e-9):.0f}\n")
+    return passed
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Punkt wejścia wiersza poleceń.
+
+    Returns:
+        int: Kod wyjścia (0 - wszystkie wyniki poprawne, 1 - błąd).
+    """
+    parser = argparse.ArgumentParser(description="Perft: test poprawności i szybkości generatora ruchów.")
+    parser.add_argument("--fen", help="pozycja w notacji FEN (bez tego uruchamiany jest zestaw standardowych pozycji)")
+    parser.add_argument("--depth", type=int, default=3, help="głębokość dla --fen (domyślnie 3)")
+    parser.add_argument("--backend", choices=[*BACKENDS, 'all'], default='board', help="generator ruchów (domyślnie board)")
+    parser.add_argument("--max-nodes", type=int, default=200000,
+                        help="limit węzłów na pozycję w zestawie (domyślnie 200000)")
+    args = parser.parse_args(argv)
+    backends = list(BACKENDS) if args.backend == 'all' else [args.backend]
+    if args.fen:
+        counts = {backend: run_divide(args.fen, args.depth, backend) for backend in backends}
+        return 0 if len(set(counts.values())) == 1 else 1
+    passed = all([run_suite(backend, args.max_nodes) for backend in backends])
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Moduł zawiera klucze Zobrista i funkcje liczące 64-bitowy odcisk pozycji.
+
+Odcisk składa się z kluczy figur na polach, praw do roszady, kolumny bicia w przelocie
+oraz strony na ruchu. Klucze są losowane ze stałym ziarnem, więc ta sama pozycja ma ten sam
+odcisk w każdym procesie i może służyć jako klucz w książkach debiutów i tablicach transpozycji.
+Kolumna bicia w przelocie jest uwzględniana tylko wtedy, gdy pionek strony na ruchu faktycznie
+może bić w przelocie.
+"""
+import random
+
+# Kolejność typów figur, taka sama jak w engine.bitboard
+PIECE_TYPES = ('p', 'N', 'B', 'R', 'Q', 'K')
+
+_random = random.Random(0x5A0B21)
+
+# PIECE_KEYS[kolor * 6 + typ][y * 8 + x]
+PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+_CASTLING_RIGHT_KEYS = [_random.getrandbits(64) for _ in range(4)]
+# CASTLING_KEYS[prawa], gdzie prawa to suma bitów: 1 - K, 2 - Q, 4 - k, 8 - q
+CASTLING_KEYS = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights & (1 << _bit):
+            CASTLING_KEYS[_rights] ^= _CASTLING_RIGHT_KEYS[_bit]
+# EN_PASSANT_KEYS[x], ostatni element (indeks -1) to brak bicia w przelocie
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)] + [0]
+SIDE_KEY = _random.getrandbits(64)
+
+# Pola króla i wież dla poszczególnych praw do roszady: (bit, kolor, pole króla, pole wieży)
+CASTLING_SQUARES = ((1, 'w', (0, 3), (0, 0)), (2, 'w', (0, 3), (0, 7)),
+                    (4, 'b', (7, 3), (7, 0)), (8, 'b', (7, 3), (7, 7)))
+
+
+def piece_key(figure, y: int, x: int) -> int:
+    """
+    Zwraca klucz figury stojącej na danym polu.
+
+    Args:
+        figure: Figura z engine.figures.
+        y (int): Wiersz pola.
+        x (int): Kolumna pola.
+
+    Returns:
+        int: Klucz Zobrista.
+    """
+    return PIECE_KEYS[(0 if figure.color == 'w' else 6) + PIECE_TYPES.index(figure.type)][y * 8 + x]
+
+
+def castling_rights(board) -> int:
+    """
+    Odczytuje prawa do roszady z flag has_moved króli i wież na planszy.
+
+    Args:
+        board (Board): Obiekt planszy szachowej.
+
+    Returns:
+        int: Prawa do roszady jako suma bitów (1 - K, 2 - Q, 4 - k, 8 - q).
+    """
+    rights = 0
+    for bit, color, (king_y, king_x), (rook_y, rook_x) in CASTLING_SQUARES:
+        king = board.board_state[king_y][king_x].figure
+        rook = board.board_state[rook_y][rook_x].figure
+        if (king and king.type == 'K' and king.color == color and not king.has_moved
+                and rook and rook.type == 'R' and rook.color == color and not rook.has_moved):
+            rights |= bit
+    return rights
+
+
+def enpassant_file(board, color: str) -> int:
+    """
+    Zwraca kolumnę, na której pionek danego koloru może bić w przelocie.
+
+    Args:
+        board (Board): Obiekt planszy szachowej.
+        color (str): Kolor strony na ruchu ('w' lub 'b').
+
+    Returns:
+        int: Kolumna x pola bicia albo -1, jeśli bicie w przelocie nie jest możliwe.
+    """
+    for tile in board.board_state[4 if color == 'w' else 3]:
+        figure = tile.figure
+        if figure and figure.type == 'p' and figure.color == color and figure.can_enpassant:
+            return tile.x + figure.can_enpassant
+    return -1
+
+
+def hash_board(board, turn: str) -> int:
+    """
+    Liczy od zera odcisk pozycji zapisanej w obiekcie Board.
+
+    Args:
+        board (Board): Obiekt planszy szachowej.
+        turn (str): Strona na ruchu ('w' lub 'b').
+
+    Returns:
+        int: 64-bitowy klucz Zobrista.
+    """
+    key = 0
+    for row in board.board_state:
+        for tile in row:
+            if tile.figure:
+                key ^= piece_key(tile.figure, tile.y, tile.x)
+    key ^= CASTLING_KEYS[castling_rights(board)]
+    key ^= EN_PASSANT_KEYS[enpassant_file(board, turn)]
+    if turn == 'b':
+        key ^= SIDE_KEY
+    return key
+
+
+def hash_from_fen(fen: str, include_state: bool = True) -> int:
+    """
+    Liczy odcisk pozycji zapisanej w notacji FEN.
+
+    Args:
+        fen (str): FEN; wystarczy ustawienie figur i strona na ruchu.
+        include_state (bool, opcjonalnie): Czy uwzględnić prawa do roszady i bicie w przelocie.
+            Książki debiutów zapisują tylko ustawienie figur i stronę na ruchu, więc dla nich należy podać False.
+
+    Returns:
+        int: 64-bitowy klucz Zobrista.
+    """
+    parts = fen.split()
+    key = 0
+    pawn_squares = set()
+    for r, row in enumerate(parts[0].split("/")):
+        y = 7 - r
+        x = 7
+        for char in row:
+            if char.isdigit():
+                x -= int(char)
+                continue
+            color = 0 if char.isupper() else 6
+            piece_type = 'p' if char in 'pP' else char.upper()
+            key ^= PIECE_KEYS[color + PIECE_TYPES.index(piece_type)][y * 8 + x]
+            if piece_type == 'p':
+                pawn_squares.add((char, y, x))
+            x -= 1
+    turn = parts[1] if len(parts) > 1 else 'w'
+    if turn == 'b':
+        key ^= SIDE_KEY
+    if include_state:
+        rights = 0
+        if len(parts) > 2:
+            for bit, letter in ((1, 'K'), (2, 'Q'), (4, 'k'), (8, 'q')):
+                if letter in parts[2]:
+                    rights |= bit
+        key ^= CASTLING_KEYS[rights]
+        if len(parts) > 3 and parts[3] != '-':
+            ep_x = 104 - ord(parts[3][0])
+            # Pionek, który może bić, stoi obok pola bicia, o jeden wiersz bliżej strony przeciwnika
+            pawn_char, pawn_y = ('P', 4) if turn == 'w' else ('p', 3)
+            if (pawn_char, pawn_y, ep_x - 1) in pawn_squares or (pawn_char, pawn_y, ep_x + 1) in pawn_squares:
+                key ^= EN_PASSANT_KEYS[ep_x]
+    return key
+
+
+def book_key(board, turn: str) -> int:
+    """
+    Zwraca odcisk pozycji bez praw do roszady i bicia w przelocie, zgodny z kluczami książek debiutów.
+
+    Args:
+        board (Board): Obiekt planszy szachowej z aktualnym odciskiem w board.hash.
+        turn (str): Strona na ruchu ('w' lub 'b').
+
+    Returns:
+        int: Klucz pozycji (ustawienie figur i strona na ruchu).
+    """
+    key = board.hash ^ CASTLING_KEYS[castling_rights(board)]
+    return key ^ EN_PASSANT_KEYS[enpassant_file(board, turn)]
@@ -11,32 +11,43 @@ from engine.board_and_fields import *
 from engine.engine import *
 from engine.figures import *
 from engine.fen_operations import *
+import engine.zobrist as zobrist
+import engine.moves as moves
 from interface.graphics import *
 from algorithms.evaluation import *
 from algorithms.minimax import *
+from algorithms.time_manager import TimeManager
 from interface.nerd_view import *
 
-def calculate_minimax(board: Board, color: str, result_queue: multiQueue) -> None:
+# Górna granica czasu na ruch komputera i minimalny czas do pokazania ruchu (w sekundach)
+MAX_MOVE_TIME = 6
+MIN_MOVE_TIME = 2
+
+def calculate_minimax(board: Board, color: str, result_queue: multiQueue, remaining_time: float) -> None:
     """
     Oblicza najlepszy ruch dla podanej planszy przy użyciu algorytmu minimax.
 
-    Wykonuje kopię planszy, inicjuje obiekt minimax z głębokością wyszukiwania równą 6,
-    a następnie zwraca najlepszy ruch, dodatkowe informacje oraz listę ruchów. Aby zagwarantować
-    minimalny czas obliczeń (2 sekundy), funkcja w razie potrzeby uśpiewa wątek przed umieszczeniem
-    wyniku w kolejce.
+    Wykonuje kopię planszy, inicjuje obiekt minimax z głębokością wyszukiwania równą 6 i czasem
+    przydzielonym przez TimeManager z pozostałego czasu na zegarze (najwyżej MAX_MOVE_TIME), a następnie
+    zwraca najlepszy ruch, dodatkowe informacje oraz listę ruchów. Aby ruch nie pojawił się od razu,
+    funkcja w razie potrzeby usypia proces do MIN_MOVE_TIME (najwyżej do miękkiego limitu przydziału)
+    przed umieszczeniem wyniku w kolejce.
 
     :param board: Aktualny stan planszy (obiekt typu Board).
     :param color: Kolor gracza wykonującego ruch ('w' dla białych, 'b' dla czarnych).
     :param result_queue: Kolejka multiprocessing.Queue, do której zostanie wrzucony wynik obliczeń.
+    :param remaining_time: Czas pozostały na zegarze strony na ruchu (w sekundach).
     :return: None
     """
     minimax_start_time = time.time()
     board_copy = copy.deepcopy(board)
-    minimax_obj = Minimax(board_copy, 2, color, 6)
-    best_move, additional_info, moves_list = minimax_obj.get_best_move()
-    full_info = best_move, additional_info, moves_list
-    if time.time() - minimax_start_time < 2:
-        time.sleep(2 - (time.time() - minimax_start_time))
+    time_manager = TimeManager(remaining_time, len(board.moves_algebraic) // 2 + 1, max_time=MAX_MOVE_TIME)
+    minimax_obj = Minimax(board_copy, 6, color, MAX_MOVE_TIME, time_manager=time_manager)
+    best_move, additional_info, moves_list, stats = minimax_obj.get_best_move()
+    full_info = best_move, additional_info, moves_list, stats
+    min_time = min(MIN_MOVE_TIME, time_manager.soft_limit)
+    if time.time() - minimax_start_time < min_time:
+        time.sleep(min_time - (time.time() - minimax_start_time))
     result_queue.put(full_info)
 
 
@@ -45,15 +56,17 @@ def load_grandmaster_moves(grandmaster_name: str) -> dict:
     Wczytuje ruchy arcymistrza z pliku JSON.
 
     Plik powinien znajdować się w katalogu "grandmaster/json/" i być nazwany zgodnie z
-    podaną nazwą arcymistrza. W przypadku braku pliku zwracany jest pusty słownik.
+    podaną nazwą arcymistrza. Klucze FEN z pliku są zamieniane na odciski Zobrista pozycji.
+    W przypadku braku pliku zwracany jest pusty słownik.
 
     :param grandmaster_name: Nazwa arcymistrza (np. "Nakamura").
-    :return: Słownik zawierający ruchy arcymistrza.
+    :return: Słownik zawierający ruchy arcymistrza, indeksowany odciskiem pozycji.
     """
     json_path = Path(f"grandmaster/json/{grandmaster_name}.json")
     try:
         with open(json_path, "r") as f:
-            return json.load(f)
+            return {zobrist.hash_from_fen(position, include_state=False): book_moves
+                    for position, book_moves in json.load(f).items()}
     except FileNotFoundError:
         print(f"Nie znaleziono pliku z ruchami arcymistrza: {json_path}")
         return {}
@@ -63,23 +76,22 @@ def get_grandmaster_move(board: Board, turn: str, grandmaster_moves: dict) -> tu
     """
     Wybiera ruch arcymistrza na podstawie aktualnej pozycji.
 
-    Funkcja konwertuje bieżący stan planszy do notacji FEN (odwróconej) i wyszukuje odpowiadający
-    klucz w słowniku ruchów arcymistrza. Jeśli pozycja zostanie znaleziona, wybiera losowy ruch z
-    dostępnej listy ruchów.
+    Funkcja wyszukuje odcisk Zobrista bieżącej pozycji (bez praw do roszady i bicia w przelocie)
+    w słowniku ruchów arcymistrza. Jeśli pozycja zostanie znaleziona, wybiera losowy ruch z
+    dostępnej listy ruchów i zamienia go z notacji SAN na ruch spakowany (engine.moves).
 
     :param board: Aktualny stan planszy (obiekt typu Board).
     :param turn: Aktualna tura ('w' lub 'b').
     :param grandmaster_moves: Słownik ruchów arcymistrza wczytany z pliku JSON.
-    :return: Krotka zawierająca wybrany ruch (jako krotkę czterech wartości) oraz listę ruchów.
-             Jeśli ruch nie został znaleziony, zwraca ((0, 0, 0, 0), []).
+    :return: Krotka zawierająca wybrany ruch (spakowany) oraz listę ruchów.
+             Jeśli ruch nie został znaleziony, zwraca (moves.NULL_MOVE, []).
     """
-    current_fen = board_to_fen_inverted(board, turn)
-    fen_parts = current_fen.split(' ')
-    position_fen = f"{fen_parts[0]} {fen_parts[1]}"
-    if position_fen in grandmaster_moves:
-        moves_list = grandmaster_moves[position_fen]
-        return moves_list[randint(1, len(moves_list)) - 1], moves_list  # Bierzemy losowy ruch
-    return (0, 0, 0, 0), []
+    position_key = zobrist.book_key(board, turn)
+    if position_key in grandmaster_moves:
+        moves_list = grandmaster_moves[position_key]
+        move_notation = moves_list[randint(1, len(moves_list)) - 1]  # Bierzemy losowy ruch
+        return moves.from_san(board, move_notation, turn), moves_list
+    return moves.NULL_MOVE, []
 
 
 def update_times_display(
@@ -204,10 +216,10 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
         moves_number = sum(len(value) for value in main_board.get_all_moves(turn))
 
         algo_root = tk.Toplevel()
-        moves = []
+        opening_moves = []
         info_window = AlgorithmInfoWindow(
             algo_root,
-            moves_list=moves,
+            moves_list=opening_moves,
             algorithm_name=grandmaster_name,
             search_depth=2,
             additional_info="...",
@@ -324,17 +336,13 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
             draw_pieces(screen, main_board, SQUARE_SIZE, pieces, is_reversed)
             pygame.display.flip()
             grandmaster_move, moves_from_json_list = get_grandmaster_move(main_board, grandmaster_color, grandmaster_moves)
-            try: 
-                cords = notation_to_cords(main_board, grandmaster_move, turn)
-                y1, x1, y2, x2 = cords
-            except Exception:
-                cords = False
-            if cords and tryMove(turn, main_board, y1, x1, y2, x2):
+            y1, x1, y2, x2 = moves.to_cords(grandmaster_move)
+            if grandmaster_move != moves.NULL_MOVE and tryMove(turn, main_board, y1, x1, y2, x2):
                 if nerd_view:
                     info_window.update_algorithm(grandmaster_name)
                     info_window.update_moves(moves_from_json_list)
                     info_window.update_additional_info(" ")
-                    info_window.update_best_move(cords)
+                    info_window.update_best_move(grandmaster_move)
                 try:
                     minimax_process.terminate()
                 except Exception:
@@ -349,8 +357,8 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
                 turn = 'w' if turn == 'b' else 'b'
                 whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, y1, x1, y2, x2)
                 if whatAfter == "promotion":
-                    choiceOfPromotion = "4"
-                    whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, x1, y1, x2, y2)
+                    promotion(yForPromotion, xForPromotion, main_board, moves.promotion_choice(grandmaster_move))
+                    whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, y1, x1, y2, x2)
                 if whatAfter == "checkmate":
                     result = global_translations.get("checkmate")
                     winner = global_translations.get("white") if turn == 'b' else global_translations.get("black")
@@ -376,18 +384,20 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
                     calculating = True
                     minimax_process = Process(
                         target=calculate_minimax,
-                        args=(main_board, turn, minimax_queue),
+                        args=(main_board, turn, minimax_queue,
+                              (white_time if turn == 'w' else black_time) - (time.time() - start_time)),
                         daemon=True
                     )
                     minimax_process.start()
                 if calculating and not minimax_queue.empty():
                     all_info = minimax_queue.get(timeout=0.01)
-                    move, additional_info, moves_from_json_list = all_info
+                    move, additional_info, moves_from_json_list, stats = all_info
                     if nerd_view:
                         info_window.update_moves(moves_from_json_list)
                         info_window.update_additional_info(additional_info)
                         info_window.update_best_move(move)
-                    y1, x1, y2, x2 = move
+                        info_window.update_stats(stats)
+                    y1, x1, y2, x2 = moves.to_cords(move)
                     if tryMove(turn, main_board, y1, x1, y2, x2):
                         # Obsługa poprawnego wykonania ruchu
                         move_time = time.time() - start_time
@@ -400,7 +410,7 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
                         # Obsługa promocji i stanu gry
                         whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, y1, x1, y2, x2)
                         if whatAfter == "promotion":
-                            promotion(yForPromotion, xForPromotion, main_board, '4')  # Zawsze na hetmana
+                            promotion(yForPromotion, xForPromotion, main_board, moves.promotion_choice(move))
                             whatAfter, _, _ = afterMove(turn, main_board, y1, x1, y2, x2)
                         
                         # Aktualizacja stanu gry
@@ -449,7 +459,8 @@ def main(player_color: str, grandmaster_name: str, game_time: float) -> None:
         )
         screen.fill(BLACK)
         draw_board(screen, SQUARE_SIZE, main_board, in_check, is_reversed)
-        evaluation = get_evaluation(main_board, turn)[0] - get_evaluation(main_board, turn)[1]  # Calculate evaluation
+        white_eval, black_eval = get_evaluation(main_board, turn)
+        evaluation = white_eval - black_eval  # Calculate evaluation
         draw_interface(screen, turn, SQUARE_SIZE, BLACK, texts, player_times_font, in_check, check_text)
         try:
             if config["highlight_enemy"] or main_board.get_piece(selected_piece[0], selected_piece[1])[0] == player_color:
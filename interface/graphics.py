@@ -6,6 +6,7 @@ Funkcje te obejmują rysowanie szachownicy, figur, podświetlanie możliwych ruc
 
 import pygame
 import json
+import os
 import sys
 import tkinter as tk
 from tkinter import filedialog
@@ -31,7 +32,10 @@ def load_config():
             "resolution": "1260x960", 
             "icons": "classic", 
             "highlight": 0,
-            "nerd_view": False  # Domyślne ustawienie trybu nerd_view
+            "nerd_view": False,  # Domyślne ustawienie trybu nerd_view
+            "search_workers": 1,  # Liczba procesów wyszukiwania (Minimax i MCTS)
+            "ponder": False,  # Myślenie komputera w czasie gracza
+            "mcts_tree_parallel": False  # Wspólne drzewo procesów MCTS zamiast osobnych drzew
         }
 
 def draw_board(screen, SQUARE_SIZE, main_board, in_check, is_reversed=False):
@@ -790,7 +794,7 @@ def choose_pgn_file_dialog(screen, SQUARE_SIZE: int) -> str:
             
     return None
 
-def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5) -> tuple:
+def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5, show_pruning=True) -> tuple:
     """
     Shows a dialog with sliders to configure AI settings.
     
@@ -799,9 +803,14 @@ def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5
         SQUARE_SIZE (int): Size of a board square
         min_depth (int): Minimum depth value
         max_depth (int): Maximum depth value
+        show_pruning (bool): Whether to show the Minimax-only options (transposition table size
+            and pruning switches)
         
     Returns:
-        tuple: (depth, min_time, max_time) or None if canceled
+        tuple: (depth, min_time, max_time, tt_size_mb, pruning, workers) or None if canceled,
+            where tt_size_mb is the default size when the Minimax options are hidden,
+            pruning is a dict {'null_move', 'late_move_reductions', 'futility': bool}
+            and workers is the number of search processes (1 - search in a single process)
     """
     font = pygame.font.Font(None, 48)
     small_font = pygame.font.Font(None, 36)
@@ -828,6 +837,30 @@ def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5
             "step": 0.5
         }
     }
+    # Only Minimax has a transposition table
+    tt_size_mb = 16
+    if show_pruning:
+        settings["Tablica transpozycji (MB)"] = {
+            "value": tt_size_mb,
+            "min": 1,
+            "max": 256,
+            "step": 1
+        }
+    # Minimax splits root moves and MCTS runs its playouts in these processes, at most one per CPU core
+    max_workers = max(2, os.cpu_count() or 1)
+    settings["Procesy wyszukiwania"] = {
+        "value": min(max(1, int(load_config().get("search_workers", 1))), max_workers),
+        "min": 1,
+        "max": max_workers,
+        "step": 1
+    }
+
+    # Pruning switches: label -> key in the pruning dict
+    toggles = {
+        "Ruch zerowy": {"key": "null_move", "value": True},
+        "Redukcje LMR": {"key": "late_move_reductions", "value": True},
+        "Futility/razoring": {"key": "futility", "value": True},
+    } if show_pruning else {}
 
     # Slider properties
     SLIDER_WIDTH = 400
@@ -855,13 +888,22 @@ def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5
             )
         }
 
+    # Switches in one row below the sliders
+    TOGGLE_WIDTH = 320
+    TOGGLE_HEIGHT = 50
+    toggles_y = start_y + len(settings) * SPACING - 20
+    toggles_x = (screen.get_width() - len(toggles) * TOGGLE_WIDTH - (len(toggles) - 1) * 20) // 2
+    for i, toggle in enumerate(toggles.values()):
+        toggle["rect"] = pygame.Rect(toggles_x + i * (TOGGLE_WIDTH + 20), toggles_y, TOGGLE_WIDTH, TOGGLE_HEIGHT)
+    buttons_y = start_y + len(settings) * SPACING + (TOGGLE_HEIGHT + 30 if toggles else 0) + 50
+
     # Create buttons
     buttons = {
         "Zatwierdź": pygame.Rect((screen.get_width() - BUTTON_WIDTH*2 - 20)//2, 
-                                start_y + len(settings) * SPACING + 50,
+                                buttons_y,
                                 BUTTON_WIDTH, BUTTON_HEIGHT),
         "Anuluj": pygame.Rect((screen.get_width() + 20)//2, 
-                             start_y + len(settings) * SPACING + 50,
+                             buttons_y,
                              BUTTON_WIDTH, BUTTON_HEIGHT)
     }
 
@@ -899,6 +941,13 @@ def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5
             value_text = small_font.render(f"{value:.1f}", True, pygame.Color("white"))
             screen.blit(value_text, (slider["rect"].right + 20, slider["rect"].y - 5))
 
+        # Draw switches (gold when enabled)
+        for text, toggle in toggles.items():
+            color = pygame.Color("gold") if toggle["value"] else pygame.Color("gray60")
+            pygame.draw.rect(screen, color, toggle["rect"], 3)
+            toggle_text = small_font.render(f"{text}: {'tak' if toggle['value'] else 'nie'}", True, color)
+            screen.blit(toggle_text, toggle_text.get_rect(center=toggle["rect"].center))
+
         # Draw buttons
         for text, rect in buttons.items():
             color = pygame.Color("gold") if rect.collidepoint(mouse_pos) else pygame.Color("white")
@@ -920,13 +969,21 @@ def choose_ai_settings_dialog(screen, SQUARE_SIZE: int, min_depth=1, max_depth=5
                     if slider["handle"].collidepoint(event.pos):
                         active_slider = slider
                         break
+
+                # Check switches
+                for toggle in toggles.values():
+                    if toggle["rect"].collidepoint(event.pos):
+                        toggle["value"] = not toggle["value"]
                 
                 # Check buttons
                 if buttons["Zatwierdź"].collidepoint(event.pos):
                     return (
                         int(settings["Głębokość przeszukiwania"]["value"]),
                         settings["Minimalny czas (s)"]["value"],
-                        settings["Maksymalny czas (s)"]["value"]
+                        settings["Maksymalny czas (s)"]["value"],
+                        int(settings["Tablica transpozycji (MB)"]["value"]) if show_pruning else tt_size_mb,
+                        {toggle["key"]: toggle["value"] for toggle in toggles.values()},
+                        int(settings["Procesy wyszukiwania"]["value"])
                     )
                 elif buttons["Anuluj"].collidepoint(event.pos):
                     return None
@@ -5,6 +5,8 @@ import matplotlib.dates as mdates
 import matplotlib.ticker as ticker
 from datetime import datetime, timedelta
 
+import engine.moves as moves
+
 class NormalStatsWindow:
     """
     Klasa odpowiedzialna za wyświetlanie statystyk gry w czasie rzeczywistym.
@@ -328,8 +330,22 @@ class AlgorithmInfoWindow:
         scrollbar.grid(row=1, column=1, sticky="ns")
         self.moves_text.configure(yscrollcommand=scrollbar.set)
 
+        # Statystyki przeszukiwania: tekst i wykresy (NPS kolejnych ruchów, EBF ostatniego przeszukiwania)
+        self._create_info_section("Statystyki przeszukiwania:", row=8)
+        self.stats_var = tk.StringVar(value="Brak danych")
+        tk.Label(self.frame, textvariable=self.stats_var, justify="left",
+                 font=('Courier', 9)).grid(row=9, column=0, sticky="w", padx=5, pady=2)
+        self.nps_history = []
+        self.stats_figure = Figure(figsize=(4, 3), dpi=100)
+        self.ax_nps = self.stats_figure.add_subplot(211)
+        self.ax_ebf = self.stats_figure.add_subplot(212)
+        self.stats_figure.subplots_adjust(hspace=0.8)
+        self.stats_canvas = FigureCanvasTkAgg(self.stats_figure, master=self.frame)
+        self.stats_canvas.get_tk_widget().grid(row=10, column=0, columnspan=2, sticky="nsew", padx=5, pady=2)
+
         # Konfiguracja grid
         self.frame.grid_rowconfigure(1, weight=1)
+        self.frame.grid_rowconfigure(10, weight=1)
         self.frame.grid_columnconfigure(0, weight=1)
 
     def _create_info_section(self, title, row):
@@ -361,15 +377,41 @@ class AlgorithmInfoWindow:
         """Format best move for display"""
         if not move:
             return "Brak ruchu"
+        if isinstance(move, int):
+            move = moves.to_tuple(move)
         if isinstance(move, (list, tuple)) and len(move) >= 4:
             letters = 'hgfedcba'
             numbers = '12345678'
             from_pos = f"{letters[move[1]]}{numbers[move[0]]}"
             to_pos = f"{letters[move[3]]}{numbers[move[2]]}"
-            return f"Z: {from_pos} → Na: {to_pos}"
+            promotion = f" ={move[4]}" if len(move) > 4 else ""
+            return f"Z: {from_pos} → Na: {to_pos}{promotion}"
         return str(move)
 
     def update_best_move(self, new_move):
         """Update the displayed best move"""
         self.best_move = new_move
-        self.best_move_var.set(self._format_best_move(new_move))
\ No newline at end of file
+        self.best_move_var.set(self._format_best_move(new_move))
+
+    def update_stats(self, stats):
+        """Update the search statistics text and plots (SearchStats from algorithms.search_stats)"""
+        if stats is None:
+            return
+        self.stats_var.set(stats.summary())
+        if stats.total_nodes():
+            self.nps_history.append(stats.nps)
+
+        self.ax_nps.clear()
+        self.ax_nps.plot(range(1, len(self.nps_history) + 1), self.nps_history, 'b-o', markersize=3)
+        self.ax_nps.set_title("Węzły na sekundę", fontsize=9)
+        self.ax_nps.set_xlabel("Ruch komputera", fontsize=8)
+        self.ax_nps.grid(True, alpha=0.3)
+
+        self.ax_ebf.clear()
+        factors = stats.branching_factors()
+        if factors:
+            self.ax_ebf.bar([depth for depth, _ in factors], [factor for _, factor in factors], color='purple', alpha=0.7)
+        self.ax_ebf.set_title("EBF wg głębokości (ostatni ruch)", fontsize=9)
+        self.ax_ebf.set_xlabel("Głębokość", fontsize=8)
+        self.ax_ebf.grid(True, alpha=0.3)
+        self.stats_canvas.draw()
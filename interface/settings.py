@@ -22,7 +22,10 @@ def load_config():
             "resolution": "1260x960",
             "icons": "classic",
             "highlight_enemy": 0,
-            "nerd_view": 0
+            "nerd_view": 0,
+            "search_workers": 1,
+            "ponder": 0,
+            "mcts_tree_parallel": 0
         }
 
 def save_config(config):
@@ -89,6 +92,26 @@ def main():
         offvalue=0
     ).grid(row=4, column=1, padx=10, pady=10)
 
+    # Opcja myślenia komputera w czasie gracza
+    ponder = tk.BooleanVar(value=config.get("ponder", False))
+    tk.Checkbutton(
+        root,
+        variable=ponder,
+        text=global_translations.get('ponder'),
+        onvalue=1,
+        offvalue=0
+    ).grid(row=5, column=1, padx=10, pady=10)
+
+    # Opcja wspólnego drzewa procesów MCTS (zrównoleglenie drzewa zamiast korzenia)
+    mcts_tree_parallel = tk.BooleanVar(value=config.get("mcts_tree_parallel", False))
+    tk.Checkbutton(
+        root,
+        variable=mcts_tree_parallel,
+        text=global_translations.get('mcts_tree_parallel'),
+        onvalue=1,
+        offvalue=0
+    ).grid(row=6, column=1, padx=10, pady=10)
+
     # Funkcja zapisu i zastosowania ustawień
     def save_and_apply():
         """
@@ -99,6 +122,8 @@ def main():
         config["icons"] = icons.get()
         config["highlight_enemy"] = highlight_enemy.get()
         config["nerd_view"] = nerd_view.get()
+        config["ponder"] = ponder.get()
+        config["mcts_tree_parallel"] = mcts_tree_parallel.get()
         save_config(config)
         root.destroy()
 
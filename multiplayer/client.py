@@ -7,6 +7,7 @@ from engine.engine import *
 from engine.figures import *
 from interface.graphics import *
 from algorithms.evaluation import get_evaluation  # Import evaluation function
+import engine.moves as moves
 from interface.nerd_view import *
 
 def get_ip() -> str:
@@ -390,12 +391,13 @@ def main() -> None:
                             # Check after move
                             if selected_piece!=None:
                                 whatAfter, yForPromotion, xForPromotion = afterMove(turn,main_board, selected_piece[0], selected_piece[1], row, col)
-                                message = str(selected_piece[0])+" "+str(selected_piece[1])+" "+str(row)+" "+str(col)
+                                choiceOfPromotion = None
                                 if whatAfter == "promotion":
                                     choiceOfPromotion = promotion_dialog(screen, SQUARE_SIZE, turn)
                                     promotion(yForPromotion, xForPromotion, main_board, choiceOfPromotion)
-                                    message = message + " " + choiceOfPromotion
                                     whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, selected_piece[0], selected_piece[1], row, col)
+                                # Ruch jest wysyłany jako liczba (engine.moves), promocja jest zapisana w jego fladze
+                                message = str(moves.encode_with_choice(selected_piece[0], selected_piece[1], row, col, choiceOfPromotion))
                                 client.sendall(message.encode('utf-8'))
                                 if whatAfter == "checkmate":
                                     result = "Szach Mat!"
@@ -471,10 +473,9 @@ def main() -> None:
                     client.sendall(("ptime " + str(ping_time)).encode('utf-8'))
                 else:
                     print(f"📩 Received move: {data}")
-                    data = data.split()
-                    selected_piece = (int(data[0]), int(data[1]))
-                    row = int(data[2])
-                    col = int(data[3])
+                    move = int(data.split()[0])
+                    y1, x1, row, col = moves.to_cords(move)
+                    selected_piece = (y1, x1)
                     if tryMove(turn, main_board, selected_piece[0], selected_piece[1], row, col):
                         draw_board(screen,SQUARE_SIZE,main_board,main_board.incheck)
                         draw_pieces(screen, main_board, SQUARE_SIZE, pieces)
@@ -489,7 +490,7 @@ def main() -> None:
                         if selected_piece!=None:
                             whatAfter, yForPromotion, xForPromotion = afterMove(turn,main_board, selected_piece[0], selected_piece[1], row, col)
                             if whatAfter == "promotion":
-                                choiceOfPromotion = data[4]
+                                choiceOfPromotion = moves.promotion_choice(move)
                                 promotion(yForPromotion, xForPromotion, main_board, choiceOfPromotion)
                                 whatAfter, yForPromotion, xForPromotion = afterMove(turn, main_board, selected_piece[0], selected_piece[1], row, col)
                             if whatAfter == "checkmate":